@@ -13,4 +13,6 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
+# uvicorn config.asgi:application --workers 2
+# async 뷰는 homework/urls.py 의 async/ 경로에 있습니다. (manage.py benchmark_asgi 로 WSGI 와 비교)
 application = get_asgi_application()
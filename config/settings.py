@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import json
+import os
 from pathlib import Path
 
 from django.conf import settings
@@ -56,11 +57,14 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    'utils.perf.PerformanceMiddleware',
+    'utils.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'utils.db_routing.ReplicaPinMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -92,9 +96,43 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 요청마다 연결을 새로 만들지 않고 재사용
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # 쓰기 트랜잭션은 BEGIN IMMEDIATE 로 시작해 중간에 "database is locked" 가 나지 않게 함
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# 읽기 전용 복제본 (utils/db_routing.py)
+# DATABASE_REPLICA_NAME 환경 변수로 복제 DB 파일을 지정할 때만 'replica' alias 를 만들고 사용합니다.
+# 복제본은 primary 를 복제해서 스키마를 받으므로 마이그레이션하지 않고(PrimaryReplicaRouter.allow_migrate),
+# 테스트에서는 따로 DB 를 만들지 않고 primary 의 테스트 DB 를 그대로 씁니다(MIRROR).
+# 테스트는 이 환경 변수 없이 실행합니다. 라우팅 테스트(ReplicaRoutingTest)는 임시 replica 를 직접 엽니다.
+DATABASE_REPLICAS = []
+if os.environ.get('DATABASE_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DATABASE_REPLICA_NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append('replica')
+DATABASE_ROUTERS = ['utils.db_routing.PrimaryReplicaRouter']
+# 쓰기 요청 후 이 시간(초) 동안은 그 사용자의 읽기를 primary 로 보냄
+REPLICA_PIN_SECONDS = 5
+
+# 연결 생성 시 적용되는 SQLite PRAGMA (utils/sqlite.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -152,6 +190,62 @@ LOGOUT_REDIRECT_URL = '/'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+#pagination
+# 'offset' : 페이지 번호 방식 (COUNT + OFFSET), 'cursor' : (created_at, id) 키 기반 커서 방식
+PAGINATION_MODE = 'offset'
+
+#cache
+# 기본은 프로세스 메모리(locmem). 여러 워커가 캐시를 공유하려면 BACKEND 를
+# django.core.cache.backends.redis.RedisCache / memcached 등으로 바꾸면 됩니다.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'todo',
+    }
+}
+TODO_LIST_CACHE_ALIAS = 'default'
+TODO_LIST_CACHE_TIMEOUT = 60 * 5
+# 목록 ETag 가 유지되는 최대 시간(초). locmem 처럼 워커끼리 공유되지 않는 캐시에서는
+# 다른 워커의 쓰기가 이 시간만큼 늦게 반영됩니다. (Redis/Memcached 같은 공용 캐시면 바로 반영)
+TODO_LIST_ETAG_SECONDS = 60
+
+#async
+# async 뷰에서 템플릿 렌더링 등 블로킹 작업을 실행하는 스레드 풀 크기 (utils.executors)
+ASYNC_BLOCKING_WORKERS = 8
+
+#performance
+# 요청별 DB/템플릿/캐시/이미지 시간 계측 (utils.perf.PerformanceMiddleware)
+PERF_SERVER_TIMING = DEBUG  # 응답에 Server-Timing 헤더를 붙일지
+PERF_SLOW_REQUEST_MS = 500
+PERF_SLOW_REQUEST_BUFFER = 100  # 관리자 화면(/admin/perf/slow-requests/)에서 볼 최근 느린 요청 수 (프로세스별)
+PERF_SLOW_REQUEST_SAMPLE_RATE = 1.0
+# 요청마다 남기는 JSON 로그(utils.perf)의 수준. WARNING 이면 느린 요청만 남깁니다.
+PERF_REQUEST_LOG_LEVEL = os.environ.get('PERF_REQUEST_LOG_LEVEL', 'INFO')
+
+# 요청 프로파일링 (utils.profiling.ProfilingMiddleware), 결과는 /admin/perf/profiles/ 에서 내려받기
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_PROFILER = 'cprofile'  # 'cprofile' 또는 'sample'
+PROFILING_SAMPLE_RATE = 0.0  # 토큰 없이 무작위로 프로파일링할 요청 비율
+PROFILING_SAMPLE_INTERVAL = 0.005  # sample 프로파일러의 스택 수집 간격 (초)
+PROFILING_TOKEN_MAX_AGE = 600  # ?_profile=<토큰> 유효 시간 (초)
+PROFILING_MAX_FILES = 50
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # 요청마다 JSON 한 줄 (느린 요청은 WARNING). 테스트와 벤치마크 명령은 perf.request_log_silenced() 로 끕니다.
+        'utils.perf': {
+            'handlers': ['console'],
+            'level': PERF_REQUEST_LOG_LEVEL,
+            'propagate': False,
+        },
+    },
+}
+
 #auth
 AUTH_USER_MODEL = 'users.User'
 
@@ -202,3 +296,5 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = SECRET["email"]["user"]
 EMAIL_HOST_PASSWORD = SECRET["email"]["password"]
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+# 인증 링크 유효 시간(초). 메일은 대기열에서 재시도되므로 users.outbox.retry_window() 보다 길어야 합니다.
+EMAIL_VERIFICATION_MAX_AGE = 60 * 60 * 24
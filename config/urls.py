@@ -19,8 +19,12 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from users import views as users_views
+from utils import perf, profiling
 
 urlpatterns = [
+    path('admin/perf/slow-requests/', perf.slow_requests_view, name='perf_slow_requests'),
+    path('admin/perf/profiles/', profiling.profile_list_view, name='perf_profiles'),
+    path('admin/perf/profiles/<str:name>/', profiling.profile_download_view, name='perf_profile_download'),
     path('admin/', admin.site.urls),
     #FBV
     # path('',views.todo_list,name='todo_list'),
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from homework.models import Todo, Comment
+from homework.models import Todo, Comment, ThumbnailJob, MediaBlob, ImportCheckpoint
 
 
 # Register your models here.
@@ -9,7 +9,7 @@ class CommentInline(admin.TabularInline):
 
 @admin.register(Todo)
 class HomeworkAdmin(admin.ModelAdmin):
-    list_display = ('title','description','is_completed','start_date','end_date')
+    list_display = ('title','description','is_completed','start_date','end_date','comment_count','last_commented_at')
     list_filter = ('is_completed',)
     search_fields = ('title',)
     ordering = ('-start_date',)
@@ -33,4 +33,27 @@ class CommentAdmin(admin.ModelAdmin):
         ('Comment Info', {
             'fields': ('todo', 'user', 'message')
         }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(ThumbnailJob)
+class ThumbnailJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'todo', 'image_name', 'status', 'attempts', 'updated_at')
+    list_filter = ('status',)
+    ordering = ('-created_at',)
+    readonly_fields = ('todo', 'image_name', 'attempts', 'error')
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'size', 'refcount', 'created_at')
+    search_fields = ('name',)
+    ordering = ('-created_at',)
+    readonly_fields = ('name', 'size', 'refcount')
+
+
+@admin.register(ImportCheckpoint)
+class ImportCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('id', 'source', 'position', 'imported', 'skipped', 'finished', 'updated_at')
+    list_filter = ('finished',)
+    ordering = ('-updated_at',)
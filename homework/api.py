@@ -0,0 +1,173 @@
+import json
+
+from django.db import transaction
+from django.forms.models import model_to_dict
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_POST, require_safe
+
+from homework import caching, exports, search
+from homework.forms import TodoForm, TodoUpdateForm
+from homework.models import Todo
+from homework.rich_text import render_description
+
+# 여러 todo 를 한 번의 요청으로 생성/수정/삭제하는 JSON API
+# 요청 본문:
+#   {"operations": [
+#       {"op": "create", "data": {"title": ..., "description": ..., "start_date": "2025-08-01", "end_date": ...}},
+#       {"op": "update", "id": 3, "data": {"is_completed": true}},
+#       {"op": "delete", "id": 4}
+#   ]}
+# 모든 항목을 TodoForm/TodoUpdateForm 으로 먼저 검증하고, 하나라도 실패하면 아무것도 반영하지 않습니다(400).
+# 통과하면 한 트랜잭션 안에서 bulk_create / bulk_update / delete 로 반영하고 항목별 결과를 돌려줍니다.
+# 이미지(completed_image)는 JSON 으로 받지 않습니다.
+
+MAX_OPERATIONS = 500
+CREATE = 'create'
+UPDATE = 'update'
+DELETE = 'delete'
+UPDATE_FIELDS = ('title', 'description', 'description_html', 'description_text', 'start_date', 'end_date', 'is_completed', 'updated_at')
+
+
+def error_response(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def parse_operations(request):
+    try:
+        operations = json.loads(request.body).get('operations')
+    except (ValueError, AttributeError):
+        return None
+    if not isinstance(operations, list):
+        return None
+    return operations
+
+
+def is_todo_id(value):
+    # JSON 의 true/false 는 bool(int 의 하위 타입)로 들어오므로 따로 거릅니다.
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def target_ids(operations):
+    ids = set()
+    for operation in operations:
+        if isinstance(operation, dict) and operation.get('op') in (UPDATE, DELETE) and is_todo_id(operation.get('id')):
+            ids.add(operation['id'])
+    return ids
+
+
+def validate(operation, user, todos):
+    # (결과, 반영할 객체) 를 돌려줍니다. 검증에 실패하면 객체는 None 입니다.
+    if not isinstance(operation, dict) or operation.get('op') not in (CREATE, UPDATE, DELETE):
+        return {'status': 'invalid', 'errors': {'op': ['create, update, delete 중 하나여야 합니다.']}}, None
+    op = operation['op']
+    data = operation.get('data') or {}
+    if not isinstance(data, dict):
+        return {'op': op, 'status': 'invalid', 'errors': {'data': ['객체여야 합니다.']}}, None
+
+    if op == CREATE:
+        form = TodoForm(data=data)
+        if not form.is_valid():
+            return {'op': op, 'status': 'invalid', 'errors': form.errors.get_json_data()}, None
+        todo = form.save(commit=False)
+        todo.user = user
+        return {'op': op, 'status': 'created'}, todo
+
+    if not is_todo_id(operation.get('id')):
+        return {'op': op, 'id': operation.get('id'), 'status': 'invalid', 'errors': {'id': ['정수여야 합니다.']}}, None
+    todo = todos.get(operation['id'])
+    # 수정은 작성자 또는 관리자, 삭제는 작성자만 (TodoUpdateView / TodoDeleteView 와 같음)
+    if todo is None or (todo.user_id != user.pk and (op == DELETE or not user.is_superuser)):
+        return {'op': op, 'id': operation.get('id'), 'status': 'not_found'}, None
+    if op == DELETE:
+        return {'op': op, 'id': todo.pk, 'status': 'deleted'}, todo
+
+    # 보내지 않은 필드는 기존 값을 유지합니다.
+    fields = [name for name in TodoUpdateForm._meta.fields if name != 'completed_image']
+    form = TodoUpdateForm(data={**model_to_dict(todo, fields), **data}, instance=todo)
+    if not form.is_valid():
+        return {'op': op, 'id': todo.pk, 'status': 'invalid', 'errors': form.errors.get_json_data()}, None
+    return {'op': op, 'id': todo.pk, 'status': 'updated'}, form.save(commit=False)
+
+
+def apply(plan):
+    now = timezone.now()
+    created = [todo for op, todo in plan if op == CREATE]
+    updated = [todo for op, todo in plan if op == UPDATE]
+    deleted = [todo.pk for op, todo in plan if op == DELETE]
+    for todo in created + updated:
+        todo.description_html, todo.description_text = render_description(todo.description)
+        todo.updated_at = now
+
+    with transaction.atomic():
+        Todo.objects.bulk_create(created)
+        Todo.objects.bulk_update(updated, UPDATE_FIELDS)
+        if deleted:
+            # 삭제는 post_delete 시그널(색인/썸네일/캐시 정리)을 그대로 탑니다.
+            Todo.objects.filter(pk__in=deleted).delete()
+        search.index_todos(created + updated)
+        for owner_id in {todo.user_id for todo in created + updated}:
+            caching.invalidate_todo_owner(owner_id)
+
+
+def stream_results(results):
+    # 결과가 많아도 한 번에 큰 문자열을 만들지 않도록 항목 단위로 내보냅니다.
+    yield '{"results": ['
+    for index, result in enumerate(results):
+        yield (',' if index else '') + json.dumps(result, ensure_ascii=False)
+    yield ']}'
+
+
+@require_POST
+def todo_bulk(request):
+    if not request.user.is_authenticated:
+        return error_response('로그인이 필요합니다.', status=401)
+    operations = parse_operations(request)
+    if operations is None:
+        return error_response('{"operations": [...]} 형식의 JSON 이어야 합니다.')
+    if len(operations) > MAX_OPERATIONS:
+        return error_response(f'한 번에 {MAX_OPERATIONS}개까지 처리할 수 있습니다.', status=413)
+
+    todos = Todo.objects.in_bulk(target_ids(operations))
+    results, plan, seen = [], [], set()
+    for index, operation in enumerate(operations):
+        result, todo = validate(operation, request.user, todos)
+        if todo is not None and todo.pk is not None:
+            # 같은 todo 를 한 요청에서 두 번 바꾸면 순서에 따라 결과가 달라지므로 받지 않습니다.
+            if todo.pk in seen:
+                result = {'op': result['op'], 'id': todo.pk, 'status': 'invalid', 'errors': {'id': ['중복된 id 입니다.']}}
+                todo = None
+            else:
+                seen.add(todo.pk)
+        results.append({'index': index, **result})
+        if todo is not None:
+            plan.append((operation['op'], todo))
+
+    if len(plan) != len(operations):
+        return StreamingHttpResponse(stream_results(results), status=400, content_type='application/json')
+
+    apply(plan)
+    for result, (op, todo) in zip(results, plan):
+        if op == CREATE:
+            result['id'] = todo.pk
+    return StreamingHttpResponse(stream_results(results), content_type='application/json')
+
+
+@require_safe
+def todo_export(request):
+    # ?format=csv|ndjson, 관리자는 ?user=<id> 로 다른 사용자의 데이터를 내보낼 수 있습니다.
+    if not request.user.is_authenticated:
+        return error_response('로그인이 필요합니다.', status=401)
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in exports.FORMATS:
+        return error_response(f'format 은 {", ".join(exports.FORMATS)} 중 하나여야 합니다.')
+    user_id = request.user.pk
+    if request.GET.get('user') and request.user.is_staff:
+        if not request.GET['user'].isdigit():
+            return error_response('user 는 사용자 id 여야 합니다.')
+        user_id = int(request.GET['user'])
+
+    todos = Todo.objects.filter(user_id=user_id)
+    response = StreamingHttpResponse(exports.export_chunks(todos, export_format), content_type=exports.CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="todos-{user_id}.{export_format}"'
+    return response
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class HomeworkConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'homework'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from homework import signals  # noqa: F401
+        from utils.perf import instrument_connection
+        from utils.sqlite import configure_connection
+
+        connection_created.connect(configure_connection, dispatch_uid='utils.sqlite.configure_connection')
+        connection_created.connect(instrument_connection, dispatch_uid='utils.perf.instrument_connection')
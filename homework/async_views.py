@@ -0,0 +1,166 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.views.decorators.http import require_POST, require_safe
+
+from homework import events
+from homework.cb_views import TODO_LIST_FIELDS, list_pagination_mode
+from homework.forms import CommentForm
+from homework.models import Todo
+from homework.search import search_todos
+from utils.db_routing import replica_aliases, replica_reads
+from utils import perf
+from utils.executors import run_blocking
+from utils.pagination import CursorPaginator
+
+# ASGI(uvicorn 등) 배포용 async 뷰
+# 조회는 async ORM(acount, aget, async for) 으로 하고, 템플릿 렌더링 같은 블로킹 작업은
+# utils.executors 의 크기가 정해진 스레드 풀에서 실행합니다.
+# 템플릿이 렌더링 중에 DB 를 건드리지 않도록 필요한 관계는 모두 미리 불러옵니다.
+
+LIST_PAGE_SIZE = 10
+COMMENT_PAGE_SIZE = 5
+# 프록시가 유휴 연결을 끊지 않도록 보내는 주석 줄 간격(초)
+SSE_KEEPALIVE_SECONDS = 15
+SSE_RETRY_MILLISECONDS = 3000
+
+
+async def load_user(request):
+    # 템플릿의 request.user 가 렌더링 중에 동기 조회를 하지 않도록 미리 채워 둡니다.
+    request.user = await request.auser()
+    return request.user
+
+
+async def paginate(queryset, page_number, per_page):
+    paginator = Paginator(queryset, per_page)
+    paginator.count = await queryset.acount()
+    try:
+        number = paginator.validate_number(page_number)
+    except PageNotAnInteger:
+        number = 1
+    except EmptyPage:
+        number = paginator.num_pages
+    offset = (number - 1) * per_page
+    object_list = [obj async for obj in queryset[offset:offset + per_page]]
+    return Page(object_list, number, paginator)
+
+
+async def paginate_for_mode(request, queryset, per_page, mode=None):
+    if (mode or settings.PAGINATION_MODE) == 'cursor':
+        paginator = CursorPaginator(queryset, per_page)
+        return await sync_to_async(paginator.get_page)(request.GET.get('cursor'))
+    return await paginate(queryset, request.GET.get('page'), per_page)
+
+
+async def render_async(request, template_name, context):
+    with perf.span('template'):
+        content = await run_blocking(render_to_string, template_name, context, request)
+    return HttpResponse(content)
+
+
+def use_replica(request):
+    return request.method in ('GET', 'HEAD') and not getattr(request, 'db_pinned', False) and replica_aliases()
+
+
+@require_safe
+async def todo_list(request):
+    await load_user(request)
+
+    queryset = Todo.objects.select_related('user').only(*TODO_LIST_FIELDS).order_by('-created_at')
+    q = request.GET.get('q')
+    if q:
+        queryset = search_todos(queryset, q)
+
+    if use_replica(request):
+        with replica_reads():
+            page_obj = await paginate_for_mode(request, queryset, LIST_PAGE_SIZE, list_pagination_mode(q))
+    else:
+        page_obj = await paginate_for_mode(request, queryset, LIST_PAGE_SIZE, list_pagination_mode(q))
+
+    return await render_async(request, 'todo_list.html', {
+        'object_list': page_obj.object_list,
+        'page_obj': page_obj,
+        'is_paginated': page_obj.has_other_pages(),
+        'pagination_mode': list_pagination_mode(q),
+    })
+
+
+@require_safe
+@login_required
+async def todo_info(request, pk):
+    await load_user(request)
+
+    async def load():
+        todo = await aget_object_or_404(Todo, pk=pk)
+        comments = todo.comments.select_related('user').order_by('-created_at')
+        return todo, await paginate_for_mode(request, comments, COMMENT_PAGE_SIZE)
+
+    if use_replica(request):
+        with replica_reads():
+            todo, page_obj = await load()
+    else:
+        todo, page_obj = await load()
+
+    return await render_async(request, 'todo_info.html', {
+        'todo': todo,
+        'comment_form': CommentForm(),
+        'page_obj': page_obj,
+        'pagination_mode': settings.PAGINATION_MODE,
+        'comment_stream': events.streaming_supported(request),
+    })
+
+
+@require_POST
+@login_required
+async def comment_create(request, pk):
+    user = await load_user(request)
+
+    todo = await aget_object_or_404(Todo, pk=pk)
+    form = CommentForm(request.POST)
+    if not form.is_valid():
+        # 댓글 폼은 상세 화면에만 있으므로 잘못된 입력은 상세 화면으로 돌려보냅니다.
+        return HttpResponseRedirect(reverse('todo_info', kwargs={'pk': todo.pk}))
+
+    comment = form.save(commit=False)
+    comment.user = user
+    comment.todo = todo
+    await comment.asave()
+    return HttpResponseRedirect(reverse('todo_info', kwargs={'pk': todo.pk}))
+
+
+async def comment_event_stream(subscription):
+    try:
+        yield f'retry: {SSE_RETRY_MILLISECONDS}\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), SSE_KEEPALIVE_SECONDS)
+            except TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            if event is None:
+                break
+            yield events.format_event(event)
+    finally:
+        events.broker.unsubscribe(subscription)
+
+
+@require_safe
+@login_required
+async def comment_stream(request, pk):
+    # 상세 화면을 새로고침하지 않고 댓글 변경을 받는 SSE 엔드포인트 (ASGI 에서만 연결을 오래 유지할 수 있음)
+    todo = await aget_object_or_404(Todo, pk=pk)
+    if not events.streaming_supported(request):
+        # WSGI 에서는 스트림을 열지 않습니다. 204 를 받은 EventSource 는 다시 접속하지 않습니다.
+        return HttpResponse(status=204)
+    subscription = events.broker.subscribe(todo.pk)
+    response = StreamingHttpResponse(comment_event_stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,113 @@
+import math
+import time
+import tracemalloc
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from homework.models import Todo
+
+# 주요 화면 벤치마크 (manage.py benchmark_views)
+# 테스트 클라이언트로 시나리오마다 요청을 반복해서 지연 시간 백분위, 요청당 쿼리 수, 최대 메모리를 잽니다.
+# 메모리는 tracemalloc 때문에 느려지므로 지연 시간 측정이 끝난 뒤 한 번 더 요청해서 따로 잽니다.
+# 결과(report)는 JSON 으로 저장하고, 저장해 둔 기준(baseline)과 비교해서 느려진 항목을 찾습니다.
+
+COMMENT_PAGE_SIZE = 5
+LIST_PAGE_SIZE = 10
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[max(0, math.ceil(len(values) * percent / 100) - 1)]
+
+
+def upload_image(index):
+    from PIL import Image
+
+    data = BytesIO()
+    Image.new('RGB', (1200, 900), (index * 37 % 256, 120, 200)).save(data, 'JPEG')
+    return SimpleUploadedFile(f'upload{index}.jpg', data.getvalue(), content_type='image/jpeg')
+
+
+def scenarios(hot_todo):
+    todo_pages = max(1, math.ceil(Todo.objects.count() / LIST_PAGE_SIZE))
+    comment_pages = max(1, math.ceil(Todo.objects.get(pk=hot_todo).comments.count() / COMMENT_PAGE_SIZE))
+    detail = reverse('todo_info', kwargs={'pk': hot_todo})
+    todo_form = {'title': '벤치마크', 'description': '<p>벤치마크</p>', 'start_date': '2025-08-01', 'end_date': '2025-08-31'}
+    return {
+        'todo_list': lambda client, i: client.get(reverse('todo_list')),
+        'todo_list_deep_page': lambda client, i: client.get(reverse('todo_list'), {'page': todo_pages}),
+        'todo_list_search': lambda client, i: client.get(reverse('todo_list'), {'q': 'django'}),
+        'todo_detail': lambda client, i: client.get(detail),
+        'todo_detail_deep_comments': lambda client, i: client.get(detail, {'page': comment_pages}),
+        'comment_create': lambda client, i: client.post(
+            reverse('comment_create', kwargs={'pk': hot_todo}), {'message': f'벤치마크 댓글 {i}'},
+        ),
+        'image_upload': lambda client, i: client.post(
+            reverse('todo_create'), {**todo_form, 'completed_image': upload_image(i)},
+        ),
+    }
+
+
+def measure(client, request, iterations, cold=False):
+    latencies, queries, statuses = [], [], set()
+    for i in range(iterations):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = request(client, i)
+            latencies.append(time.perf_counter() - started)
+        queries.append(len(captured))
+        statuses.add(response.status_code)
+
+    if cold:
+        cache.clear()
+    tracemalloc.start()
+    try:
+        request(client, iterations)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p90_ms': round(percentile(latencies, 90) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+        'queries': max(queries),
+        'peak_kb': round(peak / 1024, 1),
+        'statuses': sorted(statuses),
+    }
+
+
+def run_suite(client, hot_todo, iterations=30, cold=False, only=None):
+    results = {}
+    for name, request in scenarios(hot_todo).items():
+        if only and name not in only:
+            continue
+        results[name] = measure(client, request, iterations, cold=cold)
+    return results
+
+
+def compare(report, baseline, threshold=1.2):
+    # 지연 시간/메모리는 threshold 배를 넘으면, 쿼리 수는 하나라도 늘면 느려진 것으로 봅니다.
+    rows = []
+    for name, current in report['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+        for metric in ('p50_ms', 'p99_ms', 'queries', 'peak_kb'):
+            before, after = previous[metric], current[metric]
+            ratio = after / before if before else (1.0 if not after else math.inf)
+            regressed = after > before if metric == 'queries' else ratio > threshold
+            rows.append({'scenario': name, 'metric': metric, 'baseline': before, 'current': after,
+                         'ratio': round(ratio, 2), 'regressed': regressed})
+    return rows
@@ -0,0 +1,103 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from utils import perf
+
+# Todo 목록 페이지 데이터 캐시
+# 캐시 키에 버전 번호를 넣고, Todo/Comment 가 바뀌면 signals 에서 버전을 올려 이전 키를 무효화합니다.
+#   - 'all'        : 모든 사용자의 todo 를 보여주는 TodoListView 용
+#   - 'user:<id>'  : 자기 todo 만 보여주는 목록용 (homework.views.todo_list)
+# 렌더링된 HTML 은 CSRF 토큰과 로그인 사용자 정보가 들어가므로 캐시하지 않고,
+# 페이지에 들어갈 객체 목록과 페이지 정보만 저장합니다.
+# 복제본에서 읽은 페이지는 복제 지연만큼 오래됐을 수 있으므로 REPLICA_PIN_SECONDS 동안만 캐시하고,
+# primary 에 고정된 요청(쓰기 직후)은 캐시를 읽지 않습니다. (cb_views.TodoListView.paginate_queryset)
+
+ALL_SCOPE = 'all'
+STATS_KEYS = {
+    'hits': 'todo_list:stats:hits',
+    'misses': 'todo_list:stats:misses',
+}
+
+
+def get_cache():
+    return caches[settings.TODO_LIST_CACHE_ALIAS]
+
+
+def user_scope(user_id):
+    return f'user:{user_id}'
+
+
+def version_key(scope):
+    return f'todo_list:version:{scope}'
+
+
+def initial_version():
+    # 버전 키가 캐시에서 밀려나도 예전 번호를 다시 쓰지 않도록 현재 시각(ms)에서 시작합니다.
+    return int(time.time() * 1000)
+
+
+def get_version(scope):
+    cache = get_cache()
+    version = cache.get(version_key(scope))
+    if version is None:
+        version = initial_version()
+        if not cache.add(version_key(scope), version, None):
+            version = cache.get(version_key(scope), version)
+    return version
+
+
+def bump(*scopes):
+    cache = get_cache()
+    for scope in scopes:
+        try:
+            cache.incr(version_key(scope))
+        except ValueError:
+            cache.set(version_key(scope), initial_version(), None)
+
+
+def invalidate(*scopes):
+    # 지금 한 번, 커밋 후 한 번 더 올립니다. 커밋 전에 다른 요청이 옛 데이터를
+    # 새 버전 키로 채워 넣었더라도 커밋 후의 두 번째 증가로 버려집니다.
+    bump(*scopes)
+    transaction.on_commit(lambda: bump(*scopes))
+
+
+def invalidate_todo_owner(user_id):
+    invalidate(ALL_SCOPE, user_scope(user_id))
+
+
+def page_key(scope, mode, page, q):
+    q_hash = hashlib.md5((q or '').encode()).hexdigest()
+    return f'todo_list:page:{scope}:{get_version(scope)}:{mode}:{page or ""}:{q_hash}'
+
+
+def get_page(key):
+    cache = get_cache()
+    data = cache.get(key)
+    record('hits' if data is not None else 'misses')
+    perf.count_cache(data is not None)
+    return data
+
+
+def set_page(key, data, timeout=None):
+    get_cache().set(key, data, settings.TODO_LIST_CACHE_TIMEOUT if timeout is None else timeout)
+
+
+def record(name):
+    cache = get_cache()
+    try:
+        cache.incr(STATS_KEYS[name])
+    except ValueError:
+        cache.add(STATS_KEYS[name], 1, None)
+
+
+def get_stats():
+    values = get_cache().get_many(STATS_KEYS.values())
+    stats = {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
+    total = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = stats['hits'] / total if total else 0.0
+    return stats
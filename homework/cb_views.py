@@ -1,38 +1,97 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model, login
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core import signing
-from django.core.paginator import Paginator
+from django.core.paginator import Page, Paginator
 from django.core.signing import TimestampSigner, SignatureExpired
-from django.db.models import Q
+from django.db import transaction
 from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import render, get_object_or_404
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, FormView
 
+from homework import caching, conditional, events
 from homework.forms import CommentForm, TodoForm, TodoUpdateForm
 from homework.models import Todo, Comment
+from homework.search import search_todos
 from users.forms import SignupForm, LoginForm
-from utils.email import send_email
+from utils.email import queue_email
+from utils.db_routing import ReplicaReadMixin, reading_from_replica
+from utils.pagination import CursorPaginator
 
 User = get_user_model()
 
-class TodoListView(ListView):
+# 목록 화면에서 실제로 쓰는 컬럼 (description 등은 불러오지 않음)
+TODO_LIST_FIELDS = (
+    'title', 'is_completed', 'completed_image', 'thumbnail', 'thumbnail_status', 'renditions', 'comment_count', 'created_at',
+    'user__name',
+)
+
+def list_pagination_mode(q):
+    # 커서 방식은 created_at 순서로만 나눌 수 있어서, 관련도 순인 검색 결과는 offset 으로 나눕니다.
+    return 'offset' if q else settings.PAGINATION_MODE
+
+
+@method_decorator(cache_control(private=True, no_cache=True), name='get')
+@method_decorator(condition(etag_func=conditional.todo_list_etag), name='get')
+class TodoListView(ReplicaReadMixin, ListView):
     model = Todo
     template_name = 'todo_list.html'
     paginate_by = 10
     ordering = '-created_at'
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # 작성자는 같은 쿼리에서 join 으로 가져오고, 목록에서 쓰지 않는 description 은 불러오지 않음
+        queryset = super().get_queryset().select_related('user').only(*TODO_LIST_FIELDS)
 
         q= self.request.GET.get('q')
         if q:
-            queryset = queryset.filter(
-                Q(title__icontains=q) |
-                Q(description__icontains=q)
-            )
+            queryset = search_todos(queryset, q)
         return queryset
-class TodoDetailView(LoginRequiredMixin,DetailView):
+
+    def paginate_queryset(self, queryset, page_size):
+        # 페이지 데이터(객체 목록, 전체 개수)는 캐시에서 먼저 찾고, 없을 때만 DB 를 조회합니다.
+        mode = list_pagination_mode(self.request.GET.get('q'))
+        page_token = self.request.GET.get('cursor' if mode == 'cursor' else self.page_kwarg)
+        key = caching.page_key(caching.ALL_SCOPE, mode, page_token, self.request.GET.get('q'))
+
+        # 쓰기 직후(primary 고정)에는 다른 요청이 복제본의 옛 데이터로 채운 캐시를 건너뜁니다.
+        cached = None if getattr(self.request, 'db_pinned', False) else caching.get_page(key)
+        if cached is not None:
+            return self.restore_page(queryset, page_size, cached)
+        timeout = settings.REPLICA_PIN_SECONDS if reading_from_replica() else None
+
+        if mode == 'cursor':
+            paginator = CursorPaginator(queryset, page_size)
+            page = paginator.get_page(page_token)
+            caching.set_page(key, {'page': page}, timeout)
+            return paginator, page, page.object_list, page.has_other_pages()
+
+        paginator, page, object_list, is_paginated = super().paginate_queryset(queryset, page_size)
+        page.object_list = list(object_list)
+        caching.set_page(key, {'number': page.number, 'count': paginator.count, 'object_list': page.object_list}, timeout)
+        return paginator, page, page.object_list, is_paginated
+
+    def restore_page(self, queryset, page_size, cached):
+        if 'page' in cached:
+            page = cached['page']
+            return CursorPaginator(queryset, page_size), page, page.object_list, page.has_other_pages()
+        paginator = self.get_paginator(queryset, page_size, allow_empty_first_page=self.get_allow_empty())
+        paginator.count = cached['count']
+        page = Page(cached['object_list'], cached['number'], paginator)
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['pagination_mode'] = list_pagination_mode(self.request.GET.get('q'))
+        return context
+
+@method_decorator(cache_control(private=True, no_cache=True), name='get')
+@method_decorator(condition(etag_func=conditional.todo_detail_etag), name='get')
+class TodoDetailView(LoginRequiredMixin, ReplicaReadMixin, DetailView):
     model = Todo
     template_name = 'todo_info.html'
 
@@ -44,11 +103,16 @@ class TodoDetailView(LoginRequiredMixin,DetailView):
 
     def get_context_data(self, **kwargs):
         comments = self.object.comments.order_by("-created_at")
-        paginator = Paginator(comments, 5)
+        if settings.PAGINATION_MODE == 'cursor':
+            page_obj = CursorPaginator(comments, 5).get_page(self.request.GET.get("cursor"))
+        else:
+            page_obj = Paginator(comments, 5).get_page(self.request.GET.get("page"))
         context = {
             "todo": self.object,
             "comment_form": CommentForm(),
-            "page_obj": paginator.get_page(self.request.GET.get("page")),
+            "page_obj": page_obj,
+            "pagination_mode": settings.PAGINATION_MODE,
+            "comment_stream": events.streaming_supported(self.request),
         }
         return context
 
@@ -137,7 +201,19 @@ class SignupView(CreateView):
     form_class = SignupForm
 
     def form_valid(self,form):
-        user = form.save()
+        with transaction.atomic():
+            user = form.save()
+            self.queue_verification_email(user)
+
+        return render(
+            request=self.request,
+            template_name='registration/signup_done.html',
+            context={
+                'user' : user,
+                     }
+        )
+
+    def queue_verification_email(self, user):
         signer = TimestampSigner()
         signed_user_email = signer.sign(user.email)
         signer_dump = signing.dumps(signed_user_email)
@@ -148,15 +224,8 @@ class SignupView(CreateView):
             아래의 링크를 클릭하여 이메일 인증을 완료해주세요. \n\n
             {url} 
             """
-        send_email(subject=subject,message=message,from_email=None, to_email = user.email)
-
-        return render(
-            request=self.request,
-            template_name='registration/signup_done.html',
-            context={
-                'user' : user,
-                     }
-        )
+        # 메일은 가입과 같은 트랜잭션으로 대기열에만 넣고, 발송은 send_queued_emails 워커가 합니다.
+        queue_email(subject=subject,message=message,from_email=None, to_email = user.email)
 
 def verify_email(request):
     code = request.GET.get('code', '')
@@ -164,7 +233,7 @@ def verify_email(request):
     signer = TimestampSigner()
     try:
         decoded_user_email = signing.loads(code)
-        user_email = signer.unsign(decoded_user_email, max_age=60 * 5)
+        user_email = signer.unsign(decoded_user_email, max_age=settings.EMAIL_VERIFICATION_MAX_AGE)
     except (TypeError, SignatureExpired):
         return render(request, 'registration/verify_failed.html')
 
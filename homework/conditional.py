@@ -0,0 +1,52 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from homework import caching
+from homework.models import Todo
+
+# 조건부 GET(ETag) 검증값
+# 템플릿을 렌더링하거나 description 을 읽지 않고 304 여부를 판단할 수 있도록 가볍게 계산합니다.
+# Last-Modified 는 쓰지 않습니다. 댓글 삭제나 보는 사람이 바뀌어도 최종 수정 시각은 그대로라서
+# If-Modified-Since 만 보내는 클라이언트가 오래된 화면을 계속 쓰게 됩니다.
+
+
+def viewer_fingerprint(request):
+    # 화면에 보이는 로그인 사용자 정보와 CSRF 쿠키가 바뀌면 다시 렌더링해야 합니다.
+    user = request.user
+    if not user.is_authenticated:
+        return f'anonymous:{request.META.get("CSRF_COOKIE", "")}'
+    return f'{user.pk}:{user.name}:{user.is_staff}:{user.is_superuser}:{request.META.get("CSRF_COOKIE", "")}'
+
+
+def make_etag(*parts):
+    return hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def todo_state(request, pk):
+    # todo 와 댓글의 최종 수정 시각, 댓글 수를 한 번의 쿼리로 가져옵니다. (삭제는 댓글 수로 감지)
+    if not hasattr(request, '_todo_state'):
+        state = Todo.objects.filter(pk=pk).values('pk', 'updated_at').annotate(
+            comments_updated_at=Max('comments__updated_at'), comments_count=Count('comments'),
+        ).first()
+        request._todo_state = state and (state['updated_at'], state['comments_updated_at'], state['comments_count'])
+    return request._todo_state
+
+
+def todo_detail_etag(request, pk):
+    state = todo_state(request, pk)
+    if state is None:
+        return None
+    return make_etag('todo', pk, *state, request.GET.urlencode(), viewer_fingerprint(request))
+
+
+def todo_list_etag(request):
+    # 목록 캐시 버전은 todo/작성자가 바뀔 때마다 올라가므로 DB 조회 없이 비교할 수 있습니다.
+    # 프로세스마다 따로인 locmem 캐시에서는 다른 워커의 쓰기로 버전이 오르지 않으므로,
+    # TODO_LIST_ETAG_SECONDS 단위의 시간 구간을 함께 넣어 오래된 목록에 304 를 답하는 시간을 제한합니다.
+    bucket = int(time.time() // settings.TODO_LIST_ETAG_SECONDS)
+    return make_etag(
+        'todo_list', caching.get_version(caching.ALL_SCOPE), bucket, request.GET.urlencode(), viewer_fingerprint(request),
+    )
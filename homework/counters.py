@@ -0,0 +1,68 @@
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from homework.models import Comment, Todo
+
+# Todo.comment_count / last_commented_at 비정규화 필드 관리
+# 목록에서 댓글 수나 최근 활동순 정렬을 보여줄 때 todo 마다 COUNT/MAX 집계를 하지 않도록 todo 행에 저장해 둡니다.
+# 동시에 댓글이 달려도 값이 틀어지지 않도록 읽고 쓰지 않고 F() 로 DB 에서 바로 더하고 뺍니다.
+
+
+def comment_added(comment):
+    created_at = Value(comment.created_at)
+    Todo.objects.filter(pk=comment.todo_id).update(
+        comment_count=F('comment_count') + 1,
+        last_commented_at=Greatest(Coalesce('last_commented_at', created_at), created_at),
+    )
+
+
+def comment_removed(comment):
+    # 마지막 댓글이 지워졌을 수 있으므로 남은 댓글에서 다시 구합니다. (comment_todo_created_idx 사용)
+    Todo.objects.filter(pk=comment.todo_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1,
+        last_commented_at=latest_comment_subquery(),
+    )
+
+
+def recount(todo_id):
+    Todo.objects.filter(pk=todo_id).update(
+        comment_count=comment_count_subquery(), last_commented_at=latest_comment_subquery(),
+    )
+
+
+def comment_count_subquery():
+    return Coalesce(
+        Subquery(Comment.objects.filter(todo=OuterRef('pk')).order_by().values('todo').annotate(
+            count=Count('pk')).values('count')),
+        0,
+    )
+
+
+def latest_comment_subquery():
+    return Subquery(Comment.objects.filter(todo=OuterRef('pk')).order_by('-created_at').values('created_at')[:1])
+
+
+def reconcile(batch_size=1000, dry_run=False):
+    # 실제 댓글 수/마지막 댓글 시각과 다른 todo 를 찾아 pk 순서대로 batch_size 씩 한 번의 UPDATE 로 고칩니다.
+    checked = repaired = 0
+    last_pk = 0
+    while True:
+        rows = list(
+            Todo.objects.filter(pk__gt=last_pk).order_by('pk').values('pk', 'comment_count', 'last_commented_at').annotate(
+                actual_count=comment_count_subquery(), actual_last=latest_comment_subquery(),
+            )[:batch_size]
+        )
+        if not rows:
+            break
+        last_pk = rows[-1]['pk']
+        checked += len(rows)
+        drifted = [
+            row['pk'] for row in rows
+            if (row['comment_count'], row['last_commented_at']) != (row['actual_count'], row['actual_last'])
+        ]
+        repaired += len(drifted)
+        if drifted and not dry_run:
+            Todo.objects.filter(pk__in=drifted).update(
+                comment_count=comment_count_subquery(), last_commented_at=latest_comment_subquery(),
+            )
+    return checked, repaired
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.core.handlers.asgi import ASGIRequest
+
+# 댓글 생성/수정/삭제를 상세 화면의 SSE 구독자에게 전달하는 프로세스 내 pub/sub
+# 구독자 하나는 이벤트 루프 위의 asyncio.Queue 하나라서, 이벤트가 없는 동안에는 스레드도 DB 연결도 쓰지 않습니다.
+# publish 는 signals.py 에서 (동기 스레드에서) 호출되므로 call_soon_threadsafe 로 각 구독자의 루프에 넘깁니다.
+# 같은 프로세스의 구독자에게만 전달되므로 워커를 여러 개 띄우면 Redis pub/sub 같은 공용 브로커로 바꿔야 합니다.
+# WSGI 에서는 Django 가 async 스트리밍 응답을 끝까지 모은 뒤에 보내므로(끝나지 않는 스트림은 워커를 붙잡음) ASGI 에서만 스트림을 엽니다.
+
+SUBSCRIBER_QUEUE_SIZE = 100
+
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+class Subscription:
+    def __init__(self, todo_id):
+        self.todo_id = todo_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def deliver(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 너무 느린 구독자는 쌓인 이벤트를 버리고 연결을 끊습니다. (EventSource 가 다시 접속)
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class CommentBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, todo_id):
+        subscription = Subscription(todo_id)
+        with self._lock:
+            self._subscribers[todo_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.todo_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.todo_id]
+
+    def publish(self, todo_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(todo_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # 루프가 이미 닫힌 구독자
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self, todo_id):
+        with self._lock:
+            return len(self._subscribers.get(todo_id, ()))
+
+
+broker = CommentBroker()
+
+
+def streaming_supported(request):
+    return isinstance(request, ASGIRequest)
+
+
+def comment_event(kind, comment):
+    event = {'type': kind, 'id': comment.pk, 'todo': comment.todo_id}
+    if kind != DELETED:
+        event.update({
+            'user': str(comment.user),
+            'message': comment.message,
+            'created_at': comment.created_at.isoformat(),
+        })
+    return event
+
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
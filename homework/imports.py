@@ -0,0 +1,144 @@
+import csv
+import gzip
+import io
+import json
+from itertools import islice
+from pathlib import Path
+
+from django.core.files import File
+from django.db import transaction
+
+from homework import caching, search
+from homework.forms import TodoForm
+from homework.models import ImportCheckpoint, ThumbnailJob, Todo
+from homework.rich_text import render_description
+from homework.thumbnails import is_supported
+
+# todo 대량 가져오기 (manage.py import_todos)
+# CSV / JSONL(.gz 가능) 를 한 행씩 읽어 batch_size 단위로 TodoForm 검증 → bulk_create 합니다.
+# Todo.save 를 거치지 않으므로 설명 정리, 검색 색인, 썸네일 작업 등록을 배치 단위로 직접 합니다.
+# 썸네일은 만들지 않고 ThumbnailJob 만 넣어 두면 process_thumbnails 워커가 나중에 만듭니다.
+# 배치를 커밋할 때 같은 트랜잭션에서 ImportCheckpoint.position 을 올리므로,
+# 중간에 실패해도 다시 실행하면 마지막으로 커밋된 배치 다음 행부터 이어서 가져옵니다.
+
+FIELDS = ('title', 'description', 'start_date', 'end_date')
+
+
+def open_source(path):
+    path = Path(path)
+    if path.suffix == '.gz':
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def source_format(path):
+    suffixes = [suffix for suffix in Path(path).suffixes if suffix != '.gz']
+    return 'csv' if suffixes and suffixes[-1] == '.csv' else 'jsonl'
+
+
+def read_rows(file, file_format):
+    # 잘못된 JSON 줄도 건너뛸 수 있도록 예외 대신 None 을 돌려줍니다.
+    if file_format == 'csv':
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else None
+
+
+def truthy(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'y', 'yes')
+    return bool(value)
+
+
+class TodoImporter:
+    def __init__(self, path, user, batch_size=500, image_dir=None):
+        self.path = Path(path)
+        self.user = user
+        self.batch_size = batch_size
+        self.image_dir = Path(image_dir) if image_dir else None
+        self.errors = []
+
+    def checkpoint(self, restart=False):
+        checkpoint, _ = ImportCheckpoint.objects.get_or_create(source=str(self.path.resolve()))
+        if restart:
+            checkpoint.position = checkpoint.imported = checkpoint.skipped = 0
+            checkpoint.finished = False
+            checkpoint.save()
+        return checkpoint
+
+    def build(self, number, row):
+        # (Todo, 이미지 파일 경로) 또는 검증 오류 시 None
+        if row is None:
+            self.errors.append((number, {'row': ['읽을 수 없는 행입니다.']}))
+            return None
+        form = TodoForm(data={field: row.get(field) for field in FIELDS})
+        if not form.is_valid():
+            self.errors.append((number, form.errors.get_json_data()))
+            return None
+        todo = form.save(commit=False)
+        todo.user = self.user
+        todo.is_completed = truthy(row.get('is_completed'))
+        todo.description_html, todo.description_text = render_description(todo.description)
+
+        image = None
+        if row.get('completed_image'):
+            image = self.image_dir / row['completed_image'] if self.image_dir else None
+            if image is None or not image.is_file():
+                self.errors.append((number, {'completed_image': [f"{row['completed_image']} 파일이 없습니다."]}))
+                return None
+        return todo, image
+
+    def attach_image(self, todo, image):
+        field = todo.completed_image.field
+        with open(image, 'rb') as file:
+            name = field.storage.save(field.generate_filename(todo, image.name), File(file, image.name))
+        todo.completed_image.name = name
+        if is_supported(name):
+            todo.thumbnail_status = Todo.THUMBNAIL_PENDING
+
+    def import_batch(self, checkpoint, numbered_rows):
+        built = [self.build(number, row) for number, row in numbered_rows]
+        valid = [item for item in built if item is not None]
+
+        with transaction.atomic():
+            for todo, image in valid:
+                if image is not None:
+                    self.attach_image(todo, image)
+            todos = Todo.objects.bulk_create([todo for todo, _ in valid])
+            ThumbnailJob.objects.bulk_create([
+                ThumbnailJob(todo=todo, image_name=todo.completed_image.name)
+                for todo in todos if todo.thumbnail_status == Todo.THUMBNAIL_PENDING
+            ])
+            search.index_todos(todos)
+            caching.invalidate_todo_owner(self.user.pk)
+
+            checkpoint.position += len(numbered_rows)
+            checkpoint.imported += len(todos)
+            checkpoint.skipped += len(numbered_rows) - len(todos)
+            checkpoint.save(update_fields=['position', 'imported', 'skipped', 'updated_at'])
+        return len(todos)
+
+    def run(self, checkpoint, on_batch=None):
+        with open_source(self.path) as file:
+            rows = enumerate(read_rows(file, source_format(self.path)), start=1)
+            # 이미 커밋된 행은 읽고 버립니다.
+            for _ in islice(rows, checkpoint.position):
+                pass
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                imported = self.import_batch(checkpoint, batch)
+                if on_batch:
+                    on_batch(checkpoint, imported)
+
+        checkpoint.finished = True
+        checkpoint.save(update_fields=['finished', 'updated_at'])
+        return checkpoint
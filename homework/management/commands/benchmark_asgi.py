@@ -0,0 +1,139 @@
+import asyncio
+import threading
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from homework.benchmarks import percentile
+from utils import perf
+
+# 응답을 천천히 받아 가는 클라이언트가 많을 때 WSGI 와 ASGI 의 처리량/지연 시간을 비교합니다.
+#   wsgi : gunicorn sync 워커처럼 정해진 수의 워커 스레드가 요청 하나씩을 끝까지(느린 전송 포함) 붙잡고 처리
+#   asgi : uvicorn 처럼 이벤트 루프 하나가 async 뷰를 돌리고, 느린 전송은 await 로 기다림
+# 실제 소켓 대신 프로세스 안에서 핸들러를 직접 호출하므로 네트워크 비용은 빠져 있습니다.
+# 현재 설정된 DB 를 그대로 읽으니 migrate 후 데이터를 넣어 두고 실행하세요.
+# 두 모드가 같은 일을 하도록 목록 페이지 캐시(homework.caching)는 DummyCache 로 꺼서 WSGI 쪽도 요청마다 DB 를 조회합니다.
+# 조건부 GET 은 클라이언트가 If-None-Match 를 보내지 않으므로 304 로 끝나는 요청이 없습니다.
+
+NO_CACHE_ALIAS = 'benchmark_asgi_nocache'
+
+
+class Command(BaseCommand):
+    help = '느린 클라이언트가 많을 때 WSGI(동기 뷰)와 ASGI(async 뷰)의 requests/sec 과 p99 지연을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=100, help='동시에 요청하는 클라이언트 수')
+        parser.add_argument('--requests', type=int, default=1000, help='모드별 전체 요청 수')
+        parser.add_argument('--client-delay', type=float, default=0.05, help='클라이언트가 응답을 받아 가는 데 걸리는 시간(초)')
+        parser.add_argument('--wsgi-workers', type=int, default=8, help='WSGI 워커 스레드 수')
+        parser.add_argument('--wsgi-path', default='/')
+        parser.add_argument('--asgi-path', default='/async/')
+        parser.add_argument('--host', default='localhost')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"clients={options['clients']} requests={options['requests']} "
+            f"client_delay={options['client_delay']}s wsgi_workers={options['wsgi_workers']}"
+        )
+        self.stdout.write(f"{'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for mode, run in (('wsgi', self.run_wsgi), ('asgi', self.run_asgi)):
+            with self.without_page_cache(), perf.request_log_silenced():
+                elapsed, latencies, errors = run(options)
+            self.stdout.write(
+                f"{mode:<6} {len(latencies) / elapsed:>8.1f} {percentile(latencies, 50) * 1000:>8.1f} "
+                f"{percentile(latencies, 99) * 1000:>8.1f} {errors:>7}"
+            )
+
+    def without_page_cache(self):
+        return override_settings(
+            CACHES={**settings.CACHES, NO_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+            TODO_LIST_CACHE_ALIAS=NO_CACHE_ALIAS,
+        )
+
+    def split_requests(self, options):
+        # 전체 요청을 클라이언트마다 나눠서 순서대로 보냅니다.
+        clients, total = options['clients'], options['requests']
+        return [total // clients + (1 if i < total % clients else 0) for i in range(clients)]
+
+    def run_wsgi(self, options):
+        application = WSGIHandler()
+        workers = threading.BoundedSemaphore(options['wsgi_workers'])
+        latencies, lock = [], threading.Lock()
+        errors = [0]
+
+        def environ():
+            environ = {'PATH_INFO': options['wsgi_path'], 'HTTP_HOST': options['host'], 'SERVER_NAME': options['host']}
+            setup_testing_defaults(environ)
+            return environ
+
+        def client(count):
+            for _ in range(count):
+                started = time.perf_counter()
+                status = []
+                # 워커가 비기를 기다린 시간부터 느린 전송이 끝날 때까지 워커 하나를 차지합니다.
+                with workers:
+                    body = application(environ(), lambda s, headers, exc_info=None: status.append(s))
+                    try:
+                        for _chunk in body:
+                            time.sleep(options['client_delay'])
+                    finally:
+                        body.close()
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+                    if not status[0].startswith('2'):
+                        errors[0] += 1
+
+        threads = [threading.Thread(target=client, args=(count,)) for count in self.split_requests(options)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started, latencies, errors[0]
+
+    def run_asgi(self, options):
+        return asyncio.run(self._run_asgi(options))
+
+    async def _run_asgi(self, options):
+        application = ASGIHandler()
+        latencies = []
+        errors = 0
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': options['asgi_path'], 'raw_path': options['asgi_path'].encode(), 'query_string': b'',
+            'headers': [(b'host', options['host'].encode())], 'server': (options['host'], 80), 'client': ('127.0.0.1', 0),
+        }
+
+        async def client(count):
+            nonlocal errors
+            for _ in range(count):
+                started = time.perf_counter()
+                status = []
+                body_sent = []
+
+                async def receive():
+                    # 본문을 한 번 보낸 뒤에는 연결을 끊지 않고 응답을 기다립니다.
+                    if body_sent:
+                        await asyncio.Future()
+                    body_sent.append(True)
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+                async def send(message):
+                    if message['type'] == 'http.response.start':
+                        status.append(message['status'])
+                    elif message['type'] == 'http.response.body':
+                        await asyncio.sleep(options['client_delay'])
+
+                await application(dict(scope), receive, send)
+                latencies.append(time.perf_counter() - started)
+                if not 200 <= status[0] < 300:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client(count) for count in self.split_requests(options)))
+        return time.perf_counter() - started, latencies, errors
@@ -0,0 +1,139 @@
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError, transaction
+from django.test import override_settings
+
+from utils.sqlite import temporary_database
+
+# 쓰기 작업이 계속 들어오는 동안 읽기 처리량이 얼마나 나오는지 비교합니다.
+#   default : Django 기본 설정 (rollback journal, BEGIN DEFERRED, PRAGMA 없음)
+#   tuned   : settings.DATABASES['default'] 의 OPTIONS(transaction_mode) + settings.SQLITE_PRAGMAS
+# 운영 DB 가 아닌 임시 파일에 todo 와 비슷한 테이블을 만들고, django.db.connections 와 transaction.atomic 으로
+# 연결하므로 connection_created 에서 적용되는 PRAGMA 와 BEGIN IMMEDIATE 가 운영과 같은 경로로 측정됩니다.
+
+ALIAS = 'benchmark_sqlite'
+
+
+class Command(BaseCommand):
+    help = '쓰기 부하 중 SQLite 읽기 처리량을 기본 설정과 운영 설정(WAL 등)으로 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--duration', type=float, default=5.0, help='모드별 측정 시간(초)')
+        parser.add_argument('--rows', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"readers={options['readers']} writers={options['writers']} duration={options['duration']}s")
+        self.stdout.write(
+            f"{'mode':<8} {'journal':>8} {'reads/s':>10} {'writes/s':>10} {'read errors':>12} {'write errors':>13}"
+        )
+        for mode in ('default', 'tuned'):
+            with tempfile.TemporaryDirectory() as directory:
+                path = Path(directory) / 'benchmark.sqlite3'
+                database = self.database(path, mode)
+                with override_settings(SQLITE_PRAGMAS=self.pragmas(mode)):
+                    journal_mode = self.prepare(database, options['rows'])
+                    result = self.run(database, options)
+            self.stdout.write(
+                f"{mode:<8} {journal_mode:>8} {result['reads'] / options['duration']:>10.0f} "
+                f"{result['writes'] / options['duration']:>10.0f} {result['read_errors']:>12} {result['write_errors']:>13}"
+            )
+
+    def database(self, path, mode):
+        if mode == 'tuned':
+            return {**settings.DATABASES[DEFAULT_DB_ALIAS], 'NAME': str(path), 'TEST': {}}
+        return {'ENGINE': settings.DATABASES[DEFAULT_DB_ALIAS]['ENGINE'], 'NAME': str(path)}
+
+    def pragmas(self, mode):
+        return settings.SQLITE_PRAGMAS if mode == 'tuned' else {}
+
+    def prepare(self, database, rows):
+        with temporary_database(ALIAS, database) as connection, connection.cursor() as cursor:
+            cursor.execute('''
+                CREATE TABLE todo (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    title VARCHAR(50) NOT NULL,
+                    description TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            cursor.execute('CREATE INDEX todo_created_idx ON todo (created_at)')
+            cursor.execute('CREATE INDEX todo_user_created_idx ON todo (user_id, created_at)')
+            now = time.time()
+            with transaction.atomic(using=ALIAS):
+                cursor.executemany(
+                    'INSERT INTO todo (user_id, title, description, created_at, updated_at) VALUES (%s, %s, %s, %s, %s)',
+                    [(i % 100, f'todo {i}', '<p>description</p>' * 20, now - i, now - i) for i in range(rows)],
+                )
+            cursor.execute('PRAGMA journal_mode')
+            return cursor.fetchone()[0]
+
+    def run(self, database, options):
+        stop = threading.Event()
+        result = {'reads': 0, 'writes': 0, 'read_errors': 0, 'write_errors': 0}
+        lock = threading.Lock()
+
+        def add(counts):
+            with lock:
+                for name, value in counts.items():
+                    result[name] += value
+
+        def reader():
+            # 연결은 스레드마다 따로라서 스레드 안에서 엽니다.
+            with temporary_database(ALIAS, database) as connection:
+                add(self.read(connection, stop))
+
+        def writer():
+            with temporary_database(ALIAS, database) as connection:
+                add(self.write(connection, stop))
+
+        threads = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=writer) for _ in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return result
+
+    def read(self, connection, stop):
+        reads = errors = 0
+        while not stop.is_set():
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT id, title, user_id FROM todo WHERE user_id = %s ORDER BY created_at DESC LIMIT 10',
+                        [random.randrange(100)],
+                    )
+                    cursor.fetchall()
+                reads += 1
+            except OperationalError:
+                errors += 1
+        return {'reads': reads, 'read_errors': errors}
+
+    def write(self, connection, stop):
+        writes = errors = 0
+        while not stop.is_set():
+            try:
+                # tuned 모드는 OPTIONS 의 transaction_mode 로 BEGIN IMMEDIATE 가 됩니다.
+                with transaction.atomic(using=ALIAS), connection.cursor() as cursor:
+                    now = time.time()
+                    cursor.execute(
+                        'INSERT INTO todo (user_id, title, description, created_at, updated_at) VALUES (%s, %s, %s, %s, %s)',
+                        [random.randrange(100), 'new todo', '<p>description</p>', now, now],
+                    )
+                    cursor.execute('UPDATE todo SET updated_at = %s WHERE id = %s', [now, random.randrange(1, 1000)])
+                writes += 1
+            except OperationalError:
+                errors += 1
+        return {'writes': writes, 'write_errors': errors}
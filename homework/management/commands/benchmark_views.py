@@ -0,0 +1,108 @@
+import json
+import platform
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from homework import benchmarks, seeding
+from utils import perf
+
+# 운영/개발 DB 를 건드리지 않도록 임시 파일 DB 를 새로 만들어 seed 데이터를 넣고 측정합니다.
+#   manage.py benchmark_views --output bench.json
+#   manage.py benchmark_views --baseline bench.json --fail-on-regression
+
+
+class Command(BaseCommand):
+    help = '가짜 데이터로 목록/상세/댓글/이미지 업로드를 측정해 JSON 리포트를 만들고 기준과 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5)
+        parser.add_argument('--todos', type=int, default=200, help='사용자마다 만들 todo 수')
+        parser.add_argument('--max-comments', type=int, default=300)
+        parser.add_argument('--images', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--cold', action='store_true', help='요청마다 캐시를 비웁니다.')
+        parser.add_argument('--only', nargs='*', help='측정할 시나리오 이름')
+        parser.add_argument('--output', help='리포트를 저장할 JSON 경로')
+        parser.add_argument('--baseline', help='비교할 기준 리포트 JSON 경로')
+        parser.add_argument('--threshold', type=float, default=1.2, help='지연 시간/메모리가 몇 배를 넘으면 느려진 것으로 볼지')
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            baseline = json.loads(Path(options['baseline']).read_text())
+
+        with tempfile.TemporaryDirectory() as directory:
+            report = self.run(Path(directory), options)
+
+        self.print_report(report)
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2, ensure_ascii=False))
+            self.stdout.write(f"{options['output']} 에 저장했습니다.")
+        if baseline is not None:
+            regressions = self.print_comparison(benchmarks.compare(report, baseline, options['threshold']))
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'{regressions}개 항목이 기준보다 느려졌습니다.')
+
+    def run(self, directory, options):
+        setup_test_environment()
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = str(directory / 'benchmark.sqlite3')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(MEDIA_ROOT=str(directory / 'media')), perf.request_log_silenced():
+                cache.clear()
+                seeded = seeding.seed(
+                    users=options['users'], todos_per_user=options['todos'], max_comments=options['max_comments'],
+                    images=options['images'], seed=options['seed'],
+                )
+                client = Client()
+                client.login(email=seeding.seed_email(0), password=seeding.PASSWORD)
+                results = benchmarks.run_suite(
+                    client, seeded['hot_todo'], iterations=options['iterations'], cold=options['cold'], only=options['only'],
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        return {
+            'created_at': timezone.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'sqlite': sqlite3.sqlite_version,
+            },
+            'options': {key: options[key] for key in ('users', 'todos', 'max_comments', 'images', 'seed', 'iterations', 'cold')},
+            'data': seeded,
+            'scenarios': results,
+        }
+
+    def print_report(self, report):
+        self.stdout.write(f"{'scenario':<28} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'queries':>8} {'peak KB':>9}  status")
+        for name, result in report['scenarios'].items():
+            self.stdout.write(
+                f"{name:<28} {result['p50_ms']:>8.1f} {result['p90_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+                f"{result['queries']:>8} {result['peak_kb']:>9.1f}  {result['statuses']}"
+            )
+
+    def print_comparison(self, rows):
+        regressions = 0
+        for row in rows:
+            if not row['regressed']:
+                continue
+            regressions += 1
+            self.stdout.write(self.style.WARNING(
+                f"느려짐: {row['scenario']} {row['metric']} {row['baseline']} -> {row['current']} (x{row['ratio']})"
+            ))
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS('기준과 비교해 느려진 항목이 없습니다.'))
+        return regressions
@@ -0,0 +1,36 @@
+import gzip
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from homework import exports
+from homework.models import Todo
+
+
+class Command(BaseCommand):
+    help = 'todo 와 댓글을 gzip 으로 압축한 CSV/NDJSON 파일로 내보냅니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='저장할 파일 경로 (예: todos.ndjson.gz)')
+        parser.add_argument('--format', choices=exports.FORMATS, default='ndjson')
+        parser.add_argument('--user', help='사용자 이메일 (없으면 전체)')
+        parser.add_argument('--chunk-size', type=int, default=exports.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        todos = Todo.objects.all()
+        if options['user']:
+            user = get_user_model().objects.filter(email=options['user']).first()
+            if user is None:
+                raise CommandError(f"{options['user']} 사용자가 없습니다.")
+            todos = todos.filter(user=user)
+
+        started = time.monotonic()
+        size = 0
+        with gzip.open(options['output'], 'wt', encoding='utf-8', newline='') as file:
+            for chunk in exports.export_chunks(todos, options['format'], chunk_size=options['chunk_size']):
+                file.write(chunk)
+                size += len(chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['output']} 에 저장했습니다. ({size} 글자, {time.monotonic() - started:.1f}초)"
+        ))
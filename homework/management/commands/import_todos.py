@@ -0,0 +1,46 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from homework.imports import TodoImporter
+
+
+class Command(BaseCommand):
+    help = 'CSV/JSONL 파일에서 todo 를 대량으로 가져옵니다. 실패하면 다시 실행해서 이어서 가져올 수 있습니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='title, description, start_date, end_date[, is_completed, completed_image] 를 가진 .csv/.jsonl(.gz)')
+        parser.add_argument('--user', required=True, help='todo 를 소유할 사용자 이메일')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--image-dir', help='completed_image 열의 파일을 찾을 디렉터리')
+        parser.add_argument('--restart', action='store_true', help='진행 기록을 무시하고 처음부터 가져옵니다.')
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.filter(email=options['user']).first()
+        if user is None:
+            raise CommandError(f"{options['user']} 사용자가 없습니다.")
+
+        importer = TodoImporter(options['path'], user, batch_size=options['batch_size'], image_dir=options['image_dir'])
+        checkpoint = importer.checkpoint(restart=options['restart'])
+        if checkpoint.finished:
+            raise CommandError('이미 끝까지 가져온 파일입니다. 다시 가져오려면 --restart 를 쓰세요.')
+        if checkpoint.position:
+            self.stdout.write(f'{checkpoint.position}번째 행 다음부터 이어서 가져옵니다.')
+
+        started = time.monotonic()
+        start_position = checkpoint.position
+
+        def report(checkpoint, imported):
+            rate = (checkpoint.position - start_position) / max(time.monotonic() - started, 1e-6)
+            self.stdout.write(f'{checkpoint.position}행 처리 (이번 배치 {imported}개 추가, {rate:.0f} rows/s)')
+
+        checkpoint = importer.run(checkpoint, on_batch=report)
+        for number, errors in importer.errors:
+            self.stderr.write(f'{number}행: {errors}')
+
+        elapsed = time.monotonic() - started
+        rate = (checkpoint.position - start_position) / max(elapsed, 1e-6)
+        self.stdout.write(self.style.SUCCESS(
+            f'{checkpoint.imported}개 가져옴, {checkpoint.skipped}개 건너뜀 ({elapsed:.1f}초, {rate:.0f} rows/s)'
+        ))
@@ -0,0 +1,67 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from homework import thumbnails
+
+
+class Command(BaseCommand):
+    help = '대기 중인 썸네일 작업을 프로세스 풀에서 처리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help='프로세스 수 (0 이면 현재 프로세스에서 처리)')
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument('--sleep', type=float, default=2.0, help='대기 작업이 없을 때 쉬는 시간(초)')
+        parser.add_argument('--once', action='store_true', help='대기 중인 작업을 모두 처리하면 종료')
+
+    def handle(self, *args, **options):
+        pool = ProcessPoolExecutor(max_workers=options['workers']) if options['workers'] > 0 else None
+        try:
+            while True:
+                processed = self.process_batch(pool, options['batch_size'])
+                if processed:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def process_batch(self, pool, batch_size):
+        jobs = thumbnails.claim_jobs(batch_size)
+        if not jobs:
+            return 0
+
+        futures = []
+        for job in jobs:
+            manifest = thumbnails.find_reusable_manifest(job)
+            if manifest and thumbnails.reuse_renditions(job, manifest):
+                self.stdout.write(f'기존 썸네일 재사용: {job.image_name}')
+                continue
+            try:
+                source = thumbnails.read_source(job)
+            except OSError as e:
+                thumbnails.fail_job(job, e)
+                continue
+            if source is None:
+                thumbnails.complete_job(job, None)
+                continue
+            if pool is None:
+                futures.append((job, None, source))
+            else:
+                futures.append((job, pool.submit(thumbnails.render_renditions, source, job.image_name), None))
+
+        for job, future, source in futures:
+            try:
+                result = future.result() if future is not None else thumbnails.render_renditions(source, job.image_name)
+            except Exception as e:
+                thumbnails.fail_job(job, e)
+                self.stderr.write(f'썸네일 생성 실패: {job} - {e}')
+                continue
+            thumbnails.complete_job(job, result)
+            self.stdout.write(f'썸네일 생성 완료: {job.image_name}')
+        return len(jobs)
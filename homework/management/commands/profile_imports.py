@@ -0,0 +1,75 @@
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# 워커가 뜰 때 import 에 드는 시간을 `python -X importtime` 으로 잽니다.
+# 현재 프로세스는 이미 Django 를 불러왔으므로 새 인터프리터에서 module(기본 config.wsgi)을 import 하고,
+# --urls 를 주면 첫 요청 때 불리는 URLconf(뷰 모듈)까지 불러옵니다.
+# 여러 번 실행해서 가장 빠른 실행을 기준으로 누적(cumulative) / 자체(self) 시간 상위 모듈을 보여주고,
+# --budget-ms 를 넘으면 실패합니다. (-X importtime 자체의 오버헤드가 조금 들어갑니다)
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(output):
+    # [(모듈, 자체 us, 누적 us, 깊이)]
+    rows = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def matches(name, prefixes):
+    return not prefixes or any(name == prefix or name.startswith(f'{prefix}.') for prefix in prefixes)
+
+
+class Command(BaseCommand):
+    help = '새 인터프리터에서 WSGI 애플리케이션을 import 하는 시간을 재고 오래 걸리는 모듈을 보여줍니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', default='config.wsgi', help='import 할 모듈')
+        parser.add_argument('--urls', action='store_true', help='URLconf 와 뷰 모듈까지 불러옵니다 (첫 요청과 같은 상태)')
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument('--prefix', action='append', default=[], help='이 패키지의 모듈만 보여줍니다 (여러 번 지정 가능)')
+        parser.add_argument('--repeat', type=int, default=3, help='가장 빠른 실행을 기준으로 삼습니다')
+        parser.add_argument('--budget-ms', type=float, help='전체 import 시간이 이보다 길면 실패합니다')
+
+    def handle(self, *args, **options):
+        runs = [self.run(options) for _ in range(max(1, options['repeat']))]
+        total_ms, rows = min(runs, key=lambda run: run[0])
+
+        self.stdout.write(f"{options['module']}{' + urls' if options['urls'] else ''}: {total_ms:.1f}ms "
+                          f"(best of {len(runs)}, {len(rows)} modules)")
+        shown = [row for row in rows if matches(row[0], options['prefix'])]
+        for title, index in (('cumulative', 2), ('self', 1)):
+            self.stdout.write(f'\ntop {options["top"]} by {title}')
+            self.stdout.write(f"{'ms':>8} {'self ms':>8}  module")
+            for name, self_us, cumulative_us, depth in sorted(shown, key=lambda row: row[index], reverse=True)[:options['top']]:
+                self.stdout.write(f'{cumulative_us / 1000:>8.1f} {self_us / 1000:>8.1f}  {"  " * depth}{name}')
+
+        if options['budget_ms'] is not None and total_ms > options['budget_ms']:
+            raise CommandError(f"import 시간 {total_ms:.1f}ms 가 예산 {options['budget_ms']:.1f}ms 를 넘었습니다.")
+
+    def run(self, options):
+        code = '\n'.join([
+            'import time',
+            'started = time.perf_counter()',
+            f"import {options['module']}",
+            'from django.urls import get_resolver; get_resolver().url_patterns' if options['urls'] else '',
+            'print((time.perf_counter() - started) * 1000)',
+        ])
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import 실패')
+        return float(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
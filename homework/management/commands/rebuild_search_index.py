@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from homework import search
+from homework.models import Todo
+
+
+class Command(BaseCommand):
+    help = 'Todo 전문검색(FTS5) 색인을 처음부터 다시 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('전문검색 색인은 SQLite 에서만 사용할 수 있습니다.')
+        count = search.rebuild_index(Todo.objects.all(), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{count}개의 Todo 를 색인했습니다.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from homework import caching, counters
+
+
+class Command(BaseCommand):
+    help = 'Todo 의 댓글 수(comment_count)와 마지막 댓글 시각(last_commented_at)을 실제 댓글과 맞춥니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='고치지 않고 어긋난 todo 수만 셉니다.')
+
+    def handle(self, *args, **options):
+        checked, repaired = counters.reconcile(batch_size=options['batch_size'], dry_run=options['dry_run'])
+        if repaired and not options['dry_run']:
+            caching.bump(caching.ALL_SCOPE)
+        verb = '어긋나 있습니다' if options['dry_run'] else '고쳤습니다'
+        self.stdout.write(self.style.SUCCESS(f'{checked}개 중 {repaired}개의 Todo 카운터가 {verb}.'))
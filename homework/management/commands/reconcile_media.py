@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from homework.storage import media_storage
+
+
+class Command(BaseCommand):
+    help = '이미지 파일(MediaBlob)의 참조 수를 실제 Todo 참조와 맞추고, 참조 없는 파일을 지웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=1.0, help='이보다 최근에 만들어진 파일은 건드리지 않습니다.')
+        parser.add_argument('--dry-run', action='store_true', help='고치지 않고 개수만 셉니다.')
+
+    def handle(self, *args, **options):
+        repaired, removed = media_storage.reconcile(
+            grace=timedelta(hours=options['grace_hours']), dry_run=options['dry_run'],
+        )
+        if options['dry_run']:
+            message = f'참조 수가 어긋난 파일 {repaired}개, 참조 없는 파일 {removed}개가 있습니다.'
+        else:
+            message = f'참조 수가 어긋난 파일 {repaired}개를 고치고, 참조 없는 파일 {removed}개를 지웠습니다.'
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from homework import seeding
+
+
+class Command(BaseCommand):
+    help = '부하 테스트용 사용자/todo/댓글/이미지 데이터를 seed 값으로 재현 가능하게 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--todos', type=int, default=100, help='사용자마다 만들 todo 수')
+        parser.add_argument('--max-comments', type=int, default=500, help='todo 하나에 달 최대 댓글 수')
+        parser.add_argument('--alpha', type=float, default=1.2, help='댓글 수 파레토 분포 모양 (작을수록 한쪽에 몰림)')
+        parser.add_argument('--images', type=int, default=0, help='이미지를 붙일 todo 수')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--clear', action='store_true', help='이전에 만든 seed 사용자와 데이터를 먼저 지웁니다.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        with transaction.atomic():
+            if options['clear']:
+                seeding.clear()
+            result = seeding.seed(
+                users=options['users'], todos_per_user=options['todos'], max_comments=options['max_comments'],
+                alpha=options['alpha'], images=options['images'], seed=options['seed'],
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"사용자 {result['users']}명, todo {result['todos']}개, 댓글 {result['comments']}개, 이미지 {result['images']}개 "
+            f"({time.monotonic() - started:.1f}초, 로그인: {seeding.seed_email(0)} / {seeding.PASSWORD})"
+        ))
@@ -0,0 +1,37 @@
+from html import unescape
+
+from django.db import migrations
+from django.utils.html import strip_tags
+
+FTS_TABLE = 'homework_todo_fts'
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Todo = apps.get_model('homework', 'Todo')
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, body, tokenize='unicode61')"
+    )
+    for pk, title, description in Todo.objects.values_list('pk', 'title', 'description').iterator():
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)',
+            (pk, title, unescape(strip_tags(description or '')).strip()),
+        )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homework', '0008_todo_completed_image_todo_thumbnail'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
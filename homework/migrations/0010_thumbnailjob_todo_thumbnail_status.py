@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def mark_existing_thumbnails_ready(apps, schema_editor):
+    Todo = apps.get_model('homework', 'Todo')
+    Todo.objects.exclude(thumbnail='').exclude(thumbnail__isnull=True).update(thumbnail_status='ready')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homework', '0009_todo_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todo',
+            name='thumbnail_status',
+            field=models.CharField(blank=True, choices=[('pending', '생성 대기'), ('ready', '생성 완료'), ('failed', '생성 실패')], default='', max_length=10, verbose_name='썸네일 상태'),
+        ),
+        migrations.CreateModel(
+            name='ThumbnailJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('image_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('processing', '처리중'), ('done', '완료'), ('failed', '실패')], db_index=True, default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('todo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='thumbnail_jobs', to='homework.todo')),
+            ],
+            options={
+                'verbose_name': '썸네일 작업',
+                'verbose_name_plural': '썸네일 작업 목록',
+            },
+        ),
+        migrations.RunPython(mark_existing_thumbnails_ready, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homework', '0010_thumbnailjob_todo_thumbnail_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todo',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='썸네일 목록'),
+        ),
+    ]
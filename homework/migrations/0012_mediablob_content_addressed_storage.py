@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:19
+
+import homework.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homework', '0011_todo_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': '미디어 파일',
+                'verbose_name_plural': '미디어 파일 목록',
+            },
+        ),
+        migrations.AlterField(
+            model_name='todo',
+            name='completed_image',
+            field=models.ImageField(blank=True, null=True, storage=homework.storage.get_media_storage, upload_to='images/%Y/%m/%d', verbose_name='완료이미지'),
+        ),
+        migrations.AlterField(
+            model_name='todo',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, storage=homework.storage.get_media_storage, upload_to='images/%Y/%m/%d/thumbnail', verbose_name='썸네일'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:38
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_counters(apps, schema_editor):
+    Todo = apps.get_model('homework', 'Todo')
+    Comment = apps.get_model('homework', 'Comment')
+    comments = Comment.objects.filter(todo=OuterRef('pk')).order_by()
+    Todo.objects.update(
+        comment_count=Coalesce(Subquery(comments.values('todo').annotate(count=Count('pk')).values('count')), 0),
+        last_commented_at=Subquery(comments.order_by('-created_at').values('created_at')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homework', '0013_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todo',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='댓글 수'),
+        ),
+        migrations.AddField(
+            model_name='todo',
+            name='last_commented_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='마지막 댓글'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['last_commented_at'], name='todo_last_commented_idx'),
+        ),
+        migrations.RunPython(fill_comment_counters, migrations.RunPython.noop),
+    ]
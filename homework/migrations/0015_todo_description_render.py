@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:39
+
+import re
+from html import unescape
+
+import bleach
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+# homework.rich_text 의 이 시점 규칙 (마이그레이션은 앱 코드가 바뀌어도 그대로 동작해야 하므로 복사해 둠)
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'font', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'iframe',
+    'img', 'li', 'ol', 'p', 'pre', 's', 'span', 'strike', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'th',
+    'thead', 'tr', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title', 'target', 'rel'],
+    'font': ['color', 'face'],
+    'img': ['src', 'alt', 'width', 'height'],
+    'iframe': ['src', 'width', 'height', 'frameborder', 'allowfullscreen'],
+    'td': ['colspan', 'rowspan'],
+    'th': ['colspan', 'rowspan'],
+}
+ALLOWED_PROTOCOLS = {'http', 'https', 'mailto'}
+ALLOWED_IFRAME_SRC = re.compile(r'^https://(www\.youtube\.com/embed/|player\.vimeo\.com/video/)')
+
+
+def allow_attribute(tag, name, value):
+    if tag == 'iframe' and name == 'src':
+        return bool(ALLOWED_IFRAME_SRC.match(value))
+    return name in ALLOWED_ATTRIBUTES.get(tag, ())
+
+
+def render_description(cleaner, description):
+    html = cleaner.clean(description or '').strip()
+    text = unescape(strip_tags(re.sub(r'<(br|/p|/div|/li|/h\d|/tr)\b[^>]*>', ' ', html, flags=re.I)))
+    return html, ' '.join(text.split())
+
+
+def render_existing_descriptions(apps, schema_editor):
+    Todo = apps.get_model('homework', 'Todo')
+    cleaner = bleach.Cleaner(
+        tags=ALLOWED_TAGS, attributes=allow_attribute, protocols=ALLOWED_PROTOCOLS, strip=True, strip_comments=True,
+    )
+    todos = []
+    for todo in Todo.objects.only('description').iterator(chunk_size=500):
+        todo.description_html, todo.description_text = render_description(cleaner, todo.description)
+        todos.append(todo)
+        if len(todos) >= 500:
+            Todo.objects.bulk_update(todos, ['description_html', 'description_text'])
+            todos = []
+    Todo.objects.bulk_update(todos, ['description_html', 'description_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homework', '0014_todo_comment_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todo',
+            name='description_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='설명 HTML'),
+        ),
+        migrations.AddField(
+            model_name='todo',
+            name='description_text',
+            field=models.TextField(blank=True, editable=False, verbose_name='설명 텍스트'),
+        ),
+        migrations.RunPython(render_existing_descriptions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homework', '0015_todo_description_render'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('source', models.CharField(max_length=500, unique=True)),
+                ('position', models.PositiveIntegerField(default=0, verbose_name='처리한 행 수')),
+                ('imported', models.PositiveIntegerField(default=0)),
+                ('skipped', models.PositiveIntegerField(default=0)),
+                ('finished', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': '가져오기 진행 상황',
+                'verbose_name_plural': '가져오기 진행 상황 목록',
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+FTS_TABLE = 'homework_todo_fts'
+
+
+def recreate_fts_table(tokenize):
+    # 한국어는 복합어 안의 부분 문자열로 찾는 경우가 많아서 단어(unicode61) 대신 trigram 으로 색인합니다.
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        Todo = apps.get_model('homework', 'Todo')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        schema_editor.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, body, tokenize='{tokenize}')")
+        for pk, title, description_text in Todo.objects.values_list('pk', 'title', 'description_text').iterator():
+            schema_editor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)', (pk, title, description_text),
+            )
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homework', '0016_importcheckpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(recreate_fts_table('trigram'), recreate_fts_table('unicode61')),
+    ]
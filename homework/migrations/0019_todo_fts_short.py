@@ -0,0 +1,47 @@
+import re
+
+from django.db import migrations
+
+SHORT_FTS_TABLE = 'homework_todo_fts_short'
+WORD_RE = re.compile(r'[^\W_]+')
+
+
+def short_ngrams(text):
+    # homework.search.short_ngrams 와 같은 규칙 (마이그레이션은 앱 코드가 바뀌어도 그대로 동작해야 하므로 복사해 둠)
+    grams = []
+    for word in WORD_RE.findall(text):
+        grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+        grams.append(word[-1])
+    return ' '.join(grams)
+
+
+def create_short_fts_table(apps, schema_editor):
+    # trigram 색인으로 찾을 수 없는 1~2글자 검색어용 색인
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Todo = apps.get_model('homework', 'Todo')
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SHORT_FTS_TABLE} USING fts5(title, body, tokenize='unicode61', prefix='1')"
+    )
+    for pk, title, description_text in Todo.objects.values_list('pk', 'title', 'description_text').iterator():
+        schema_editor.execute(
+            f'INSERT INTO {SHORT_FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)',
+            (pk, short_ngrams(title), short_ngrams(description_text)),
+        )
+
+
+def drop_short_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS {SHORT_FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homework', '0018_thumbnailjob_claimed_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_short_fts_table, drop_short_fts_table),
+    ]
@@ -1,10 +1,9 @@
-from io import BytesIO
-
 from django.contrib.auth import get_user_model
-from django.db import models
-from PIL import Image
-from pathlib import Path
+from django.db import models, transaction
 
+from homework.rich_text import render_description
+from homework.storage import get_media_storage
+from homework.thumbnails import delete_renditions, is_supported
 from utils.models import TimestampModel
 
 # Create your models here.
@@ -12,61 +11,94 @@ from utils.models import TimestampModel
 User = get_user_model()
 
 class Todo(TimestampModel):
+    THUMBNAIL_PENDING = 'pending'
+    THUMBNAIL_READY = 'ready'
+    THUMBNAIL_FAILED = 'failed'
+    THUMBNAIL_STATUS_CHOICES = (
+        (THUMBNAIL_PENDING, '생성 대기'),
+        (THUMBNAIL_READY, '생성 완료'),
+        (THUMBNAIL_FAILED, '생성 실패'),
+    )
+    # homework.counters 가 F() 로 DB 에서 바로 고치는 필드
+    COUNTER_FIELDS = ('comment_count', 'last_commented_at')
+
     title = models.CharField('제목',max_length=50)
     description = models.TextField('설명')
+    # 저장할 때 description 에서 만들어 두는 정리된 HTML 과 평문 (homework.rich_text)
+    description_html = models.TextField('설명 HTML', blank=True, editable=False)
+    description_text = models.TextField('설명 텍스트', blank=True, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     start_date = models.DateField('시작일')
     end_date = models.DateField('마감일',)
     is_completed = models.BooleanField(default=False)
-    completed_image = models.ImageField('완료이미지', upload_to='images/%Y/%m/%d', null=True, blank=True)
-    thumbnail = models.ImageField('썸네일',upload_to='images/%Y/%m/%d/thumbnail', null=True, blank=True)
+    completed_image = models.ImageField('완료이미지', upload_to='images/%Y/%m/%d', storage=get_media_storage, null=True, blank=True)
+    thumbnail = models.ImageField('썸네일',upload_to='images/%Y/%m/%d/thumbnail', storage=get_media_storage, null=True, blank=True)
+    renditions = models.JSONField('썸네일 목록', default=dict, blank=True, editable=False)
+    thumbnail_status = models.CharField('썸네일 상태', max_length=10, choices=THUMBNAIL_STATUS_CHOICES, blank=True, default='')
+    # 댓글 수/마지막 댓글 시각 (homework.counters 가 댓글 저장/삭제 때 갱신, reconcile_comment_counters 로 보정)
+    comment_count = models.PositiveIntegerField('댓글 수', default=0, editable=False)
+    last_commented_at = models.DateTimeField('마지막 댓글', null=True, blank=True, editable=False)
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-        if not self.completed_image:
-            return super().save(*args,**kwargs)
-
-        image = Image.open(self.completed_image)
-        image.thumbnail((300,300))
-
-        image_path = Path(self.completed_image.name)
-
-        thumbnail_name = image_path.stem
-        thumbnail_extension = image_path.suffix.lower()
-        thumbnail_filename = f'{thumbnail_name}_thumb{thumbnail_extension}'
-
-        if thumbnail_extension in ['.jpg','.jpeg'] :
-            file_type = 'JPEG'
-        elif thumbnail_extension == '.gif':
-            file_type = 'GIF'
-        elif thumbnail_extension == '.png':
-            file_type = 'PNG'
-        else:
-            return super().save(*args,**kwargs)
-
-        temp_thumb = BytesIO()
-        image.save(temp_thumb, file_type)
-        temp_thumb.seek(0)
-
-        self.thumbnail.save(thumbnail_filename,temp_thumb, save=False)
-        temp_thumb.close()
-        return super().save(*args,**kwargs)
-
+        # 새로 업로드된 이미지는 썸네일을 비워두고 큐에 넣어 워커가 비동기로 만들게 합니다.
+        new_image = bool(self.completed_image) and not self.completed_image._committed
+        old_renditions = self.renditions
+        old_image = None
+        if new_image and self.pk and hasattr(self.completed_image.storage, 'retain'):
+            old_image = Todo.objects.filter(pk=self.pk).values_list('completed_image', flat=True).first()
+        if new_image:
+            self.thumbnail = None
+            self.renditions = {}
+            self.thumbnail_status = self.THUMBNAIL_PENDING if is_supported(self.completed_image.name) else ''
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'description' in update_fields:
+            self.description_html, self.description_text = render_description(self.description)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'description_html', 'description_text'}
+        if update_fields is None and not self._state.adding and not kwargs.get('force_insert'):
+            # 불러온 뒤에 달리거나 지워진 댓글의 카운터를 예전 값으로 덮어쓰지 않도록 수정할 때는 카운터를 빼고 저장합니다.
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+
+        with transaction.atomic():
+            result = super().save(*args, **kwargs)
+            if old_image and old_image == self.completed_image.name:
+                # 같은 내용을 다시 올리면 이름이 같아 django_cleanup 이 예전 참조를 놓지 않으므로
+                # 저장하면서 올린 참조를 되돌립니다. (참조가 둘 이상이라 파일은 지워지지 않습니다)
+                self.completed_image.storage.delete(old_image)
+            if new_image and self.thumbnail_status == self.THUMBNAIL_PENDING:
+                ThumbnailJob.objects.create(todo=self, image_name=self.completed_image.name)
+            if new_image and old_renditions:
+                storage = self.thumbnail.storage
+                transaction.on_commit(lambda: delete_renditions(old_renditions, storage))
+        return result
 
     def get_thumbnail_image_url(self):
-        if self.thumbnail:
+        if self.thumbnail and self.thumbnail_status == self.THUMBNAIL_READY:
             return self.thumbnail.url
         elif self.completed_image:
             return self.completed_image.url
         return None
 
-
-
     class Meta:
         verbose_name = '할 일'
         verbose_name_plural = '할 일 리스트'
+        indexes = [
+            # 전체 목록 최신순 (TodoListView, 커서 페이지네이션의 created_at, id 순서)
+            models.Index(fields=['created_at'], name='todo_created_idx'),
+            # 사용자별 목록 최신순 (views.todo_list)
+            models.Index(fields=['user', 'created_at'], name='todo_user_created_idx'),
+            # 관리자 목록 정렬 (-start_date)
+            models.Index(fields=['start_date'], name='todo_start_date_idx'),
+            # 최근 활동순 정렬
+            models.Index(fields=['last_commented_at'], name='todo_last_commented_idx'),
+        ]
 
 
 class Comment(TimestampModel):
@@ -80,3 +112,64 @@ class Comment(TimestampModel):
     class Meta:
         verbose_name = '댓글'
         verbose_name_plural = '댓글 목록'
+        indexes = [
+            # todo 상세 화면의 댓글 목록 최신순
+            models.Index(fields=['todo', 'created_at'], name='comment_todo_created_idx'),
+        ]
+
+
+class ThumbnailJob(TimestampModel):
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, '대기'),
+        (PROCESSING, '처리중'),
+        (DONE, '완료'),
+        (FAILED, '실패'),
+    )
+
+    todo = models.ForeignKey(Todo, on_delete=models.CASCADE, related_name='thumbnail_jobs')
+    image_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)  # 워커가 가져간 시각 (임대 만료 판단)
+
+    def __str__(self):
+        return f'{self.todo_id}:{self.image_name} ({self.status})'
+
+    class Meta:
+        verbose_name = '썸네일 작업'
+        verbose_name_plural = '썸네일 작업 목록'
+
+
+class MediaBlob(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField(default=0)
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.name} ({self.refcount})'
+
+    class Meta:
+        verbose_name = '미디어 파일'
+        verbose_name_plural = '미디어 파일 목록'
+
+
+class ImportCheckpoint(TimestampModel):
+    # import_todos 가 배치를 커밋할 때 같은 트랜잭션에서 진행 위치를 기록합니다. (실패 후 이어서 가져오기)
+    source = models.CharField(max_length=500, unique=True)
+    position = models.PositiveIntegerField('처리한 행 수', default=0)
+    imported = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    finished = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f'{self.source} ({self.position})'
+
+    class Meta:
+        verbose_name = '가져오기 진행 상황'
+        verbose_name_plural = '가져오기 진행 상황 목록'
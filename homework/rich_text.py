@@ -0,0 +1,61 @@
+import re
+from html import unescape
+
+from django.utils.html import strip_tags
+
+# Summernote 로 입력받은 설명 HTML 을 저장할 때 한 번만 정리합니다.
+#   description_html : 허용한 태그/속성만 남기고 정규화한 HTML (상세 화면에서 그대로 출력)
+#   description_text : 태그를 뺀 평문 (검색 색인, 미리보기)
+# style 속성은 CSS 검사기(tinycss2)가 없어서 허용하지 않습니다. 글자색은 <font color> 로 남습니다.
+# bleach 는 import 가 무거워(html5lib) 처음 저장할 때 불러옵니다. 이 모듈은 models 에서 불립니다.
+
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'font', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'iframe',
+    'img', 'li', 'ol', 'p', 'pre', 's', 'span', 'strike', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'th',
+    'thead', 'tr', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title', 'target', 'rel'],
+    'font': ['color', 'face'],
+    'img': ['src', 'alt', 'width', 'height'],
+    'iframe': ['src', 'width', 'height', 'frameborder', 'allowfullscreen'],
+    'td': ['colspan', 'rowspan'],
+    'th': ['colspan', 'rowspan'],
+}
+ALLOWED_PROTOCOLS = {'http', 'https', 'mailto'}
+# Summernote 의 동영상 삽입(iframe)은 이 주소만 허용합니다.
+ALLOWED_IFRAME_SRC = re.compile(r'^https://(www\.youtube\.com/embed/|player\.vimeo\.com/video/)')
+
+_cleaner = None
+
+
+def allow_attribute(tag, name, value):
+    if tag == 'iframe' and name == 'src':
+        return bool(ALLOWED_IFRAME_SRC.match(value))
+    return name in ALLOWED_ATTRIBUTES.get(tag, ())
+
+
+def get_cleaner():
+    global _cleaner
+    if _cleaner is None:
+        import bleach
+
+        _cleaner = bleach.Cleaner(
+            tags=ALLOWED_TAGS, attributes=allow_attribute, protocols=ALLOWED_PROTOCOLS, strip=True, strip_comments=True,
+        )
+    return _cleaner
+
+
+def sanitize_html(html):
+    return get_cleaner().clean(html or '').strip()
+
+
+def plain_text(html):
+    # 블록 태그 경계에서 단어가 붙지 않도록 공백을 넣고, 연속 공백은 하나로 줄입니다.
+    text = unescape(strip_tags(re.sub(r'<(br|/p|/div|/li|/h\d|/tr)\b[^>]*>', ' ', html or '', flags=re.I)))
+    return ' '.join(text.split())
+
+
+def render_description(description):
+    html = sanitize_html(description)
+    return html, plain_text(html)
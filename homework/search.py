@@ -0,0 +1,145 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# Todo 제목/설명 전문검색 (SQLite FTS5)
+# rowid 를 Todo.pk 와 같게 두고, 설명은 저장할 때 만들어 둔 평문(Todo.description_text)으로 색인합니다.
+# trigram 토크나이저라 단어 중간의 부분 문자열도 찾습니다. ("회의록" 으로 "주간회의록정리" 검색)
+# trigram 은 3글자보다 짧은 검색어를 찾지 못하므로, 짧은 검색어(한국어는 "회의" 같은 두 글자가 흔함)는
+# 단어를 2글자씩 잘라 넣은 별도 색인(SHORT_FTS_TABLE)에서 찾습니다.
+#   "회의록" -> "회의 의록 록" : 두 글자는 그대로, 한 글자는 접두어 검색("회"*)으로 모든 위치를 찾습니다.
+# 글자/숫자가 하나도 없는 짧은 검색어("!!")만 icontains 로 찾습니다.
+# 관련도 순서는 페이지 번호(offset) 방식에서만 유지됩니다. 커서 방식은 created_at 순서가 필요해서
+# 검색 결과는 PAGINATION_MODE 와 상관없이 offset 으로 나눕니다. (cb_views.list_pagination_mode)
+
+FTS_TABLE = 'homework_todo_fts'
+SHORT_FTS_TABLE = 'homework_todo_fts_short'
+MIN_MATCH_LENGTH = 3
+# unicode61 토크나이저가 단어로 보는 글자 (밑줄은 구분자)
+WORD_RE = re.compile(r'[^\W_]+')
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def split_terms(q):
+    # (trigram 색인으로 찾을 검색어, 2글자 색인으로 찾을 짧은 검색어)
+    terms = q.split()
+    return [term for term in terms if len(term) >= MIN_MATCH_LENGTH], [term for term in terms if len(term) < MIN_MATCH_LENGTH]
+
+
+def build_match_query(terms):
+    # 검색어마다 부분 문자열 검색, 공백은 AND
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def short_ngrams(text):
+    # 단어마다 2글자 조각과 마지막 글자 (한 글자 검색어가 단어의 마지막 글자일 때도 접두어로 찾을 수 있도록)
+    grams = []
+    for word in WORD_RE.findall(text):
+        grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+        grams.append(word[-1])
+    return ' '.join(grams)
+
+
+def build_short_match_query(terms):
+    grams = []
+    for term in terms:
+        grams.extend(f'"{word}"' if len(word) > 1 else f'"{word}"*' for word in WORD_RE.findall(term))
+    return ' '.join(grams)
+
+
+def contains_filter(terms):
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(description_text__icontains=term)
+    return condition
+
+
+def insert_rows(cursor, rows):
+    # rows: (pk, title, description_text)
+    cursor.executemany(f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)', rows)
+    cursor.executemany(
+        f'INSERT INTO {SHORT_FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)',
+        [(pk, short_ngrams(title), short_ngrams(body)) for pk, title, body in rows],
+    )
+
+
+def delete_rows(cursor, pks):
+    placeholders = ', '.join(['%s'] * len(pks))
+    for table in (FTS_TABLE, SHORT_FTS_TABLE):
+        cursor.execute(f'DELETE FROM {table} WHERE rowid IN ({placeholders})', pks)
+
+
+def index_todo(todo):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        delete_rows(cursor, [todo.pk])
+        insert_rows(cursor, [(todo.pk, todo.title, todo.description_text)])
+
+
+def index_todos(todos):
+    # bulk_create/bulk_update 는 post_save 를 보내지 않으므로 한 번에 색인합니다.
+    if not is_available() or not todos:
+        return
+    with connection.cursor() as cursor:
+        delete_rows(cursor, [todo.pk for todo in todos])
+        insert_rows(cursor, [(todo.pk, todo.title, todo.description_text) for todo in todos])
+
+
+def remove_todo(pk):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        delete_rows(cursor, [pk])
+
+
+def rebuild_index(queryset, batch_size=1000):
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(f'DELETE FROM {SHORT_FTS_TABLE}')
+        count = 0
+        rows = []
+        for row in queryset.values_list('pk', 'title', 'description_text').iterator(chunk_size=batch_size):
+            rows.append(row)
+            if len(rows) >= batch_size:
+                insert_rows(cursor, rows)
+                count += len(rows)
+                rows = []
+        if rows:
+            insert_rows(cursor, rows)
+            count += len(rows)
+        for table in (FTS_TABLE, SHORT_FTS_TABLE):
+            cursor.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+    return count
+
+
+def search_todos(queryset, q):
+    # 관련도 순(bm25, 제목 가중치 10배)으로 정렬된 queryset 을 돌려줍니다.
+    if not is_available():
+        return queryset.filter(contains_filter(q.split()))
+
+    terms, short_terms = split_terms(q)
+    queryset = queryset.filter(contains_filter([term for term in short_terms if not WORD_RE.search(term)]))
+    short_match = build_short_match_query(short_terms)
+    if short_match:
+        queryset = queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {SHORT_FTS_TABLE} WHERE {SHORT_FTS_TABLE} MATCH %s', (short_match,))
+        )
+    if not terms:
+        return queryset
+    match = build_match_query(terms)
+    table = queryset.model._meta.db_table
+    return queryset.filter(
+        pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+    ).annotate(
+        search_rank=RawSQL(
+            f'SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+            (match,),
+        )
+    ).order_by('search_rank', '-created_at')
@@ -0,0 +1,99 @@
+import random
+from datetime import date, timedelta
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+
+from homework import caching, counters, search
+from homework.models import Comment, ThumbnailJob, Todo
+from homework.rich_text import render_description
+
+# 부하 테스트용 가짜 데이터 생성기 (manage.py seed_data, manage.py benchmark_views)
+# 같은 seed 면 같은 데이터가 만들어집니다. 댓글 수는 파레토 분포라 대부분의 todo 는 댓글이 거의 없고
+# 일부 todo 에 댓글이 몰립니다. 첫 번째 todo 에는 항상 max_comments 개를 달아서 깊은 댓글 페이지를 만들 수 있게 합니다.
+
+EMAIL_PREFIX = 'seed-'
+PASSWORD = 'password1234'
+WORDS = (
+    '장보기', '운동', '독서', '청소', '회의', '보고서', '여행', '공부', '빨래', '요리', '산책', '정리',
+    'python', 'django', 'review', 'deploy', 'release', 'bugfix', 'design', 'meeting',
+)
+
+
+def seed_email(index):
+    return f'{EMAIL_PREFIX}{index}@example.com'
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def sample_image(rng, size=(800, 600)):
+    from PIL import Image
+
+    data = BytesIO()
+    color = tuple(rng.randrange(256) for _ in range(3))
+    Image.new('RGB', size, color).save(data, 'JPEG', quality=85)
+    return data.getvalue()
+
+
+def comment_count(rng, alpha, max_comments):
+    return min(max_comments, int(rng.paretovariate(alpha)) - 1)
+
+
+def clear():
+    get_user_model().objects.filter(email__startswith=EMAIL_PREFIX).delete()
+
+
+def seed(users=10, todos_per_user=100, max_comments=500, alpha=1.2, images=0, seed=0, batch_size=1000):
+    rng = random.Random(seed)
+    User = get_user_model()
+    password = make_password(PASSWORD)
+    seeded_users = User.objects.bulk_create([
+        User(email=seed_email(i), name=f'seed{i}', password=password, is_active=True) for i in range(users)
+    ])
+
+    todos = []
+    for user in seeded_users:
+        for i in range(todos_per_user):
+            start = date(2025, 1, 1) + timedelta(days=rng.randrange(365))
+            todo = Todo(
+                title=sentence(rng, 3)[:50], description=f'<p>{sentence(rng, 30)}</p>' * 3, user=user,
+                start_date=start, end_date=start + timedelta(days=rng.randrange(1, 30)), is_completed=rng.random() < 0.3,
+            )
+            todo.description_html, todo.description_text = render_description(todo.description)
+            todos.append(todo)
+    todos = Todo.objects.bulk_create(todos, batch_size=batch_size)
+
+    image_todos = rng.sample(todos, min(images, len(todos)))
+    storage = Todo._meta.get_field('completed_image').storage
+    for todo in image_todos:
+        todo.completed_image.name = storage.save(f'seed/{todo.pk}.jpg', ContentFile(sample_image(rng)))
+        todo.thumbnail_status = Todo.THUMBNAIL_PENDING
+    Todo.objects.bulk_update(image_todos, ['completed_image', 'thumbnail_status'], batch_size=batch_size)
+    ThumbnailJob.objects.bulk_create([ThumbnailJob(todo=todo, image_name=todo.completed_image.name) for todo in image_todos])
+
+    comments = 0
+    batch = []
+    for index, todo in enumerate(todos):
+        count = max_comments if index == 0 else comment_count(rng, alpha, max_comments)
+        for _ in range(count):
+            batch.append(Comment(todo=todo, user=rng.choice(seeded_users), message=sentence(rng, 8)))
+        if len(batch) >= batch_size:
+            comments += len(Comment.objects.bulk_create(batch))
+            batch = []
+    comments += len(Comment.objects.bulk_create(batch))
+
+    # bulk_create 는 시그널을 보내지 않으므로 카운터, 검색 색인, 목록 캐시를 한 번에 맞춥니다.
+    counters.reconcile(batch_size=batch_size)
+    search.rebuild_index(Todo.objects.all(), batch_size=batch_size)
+    caching.bump(caching.ALL_SCOPE)
+    return {
+        'users': len(seeded_users),
+        'todos': len(todos),
+        'comments': comments,
+        'images': len(image_todos),
+        'hot_todo': todos[0].pk if todos else None,
+    }
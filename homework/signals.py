@@ -0,0 +1,112 @@
+import weakref
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from homework import caching, counters, events, search
+from homework.thumbnails import delete_renditions
+from homework.models import Comment, Todo
+
+User = get_user_model()
+
+# delete() 를 호출한 객체(origin)별로 함께 지워지는 todo pk 와 이미 처리한 todo pk 를 기록합니다.
+# todo 와 같이 지워지는 댓글은 카운터/캐시/SSE 작업을 건너뛰고, 다른 todo 의 댓글은 todo 마다 한 번만 처리해서
+# 댓글 수만큼 쿼리가 늘어나지 않게 합니다. origin 이 사라지면 기록도 같이 사라지므로 delete 가 실패해도 남지 않습니다.
+_deletes = weakref.WeakKeyDictionary()
+
+
+def delete_state(origin, key):
+    return _deletes.setdefault(origin, {}).setdefault(key, set())
+
+
+@receiver(pre_delete, sender=Todo)
+def remember_deleting_todo(sender, instance, origin=None, **kwargs):
+    if origin is not None:
+        delete_state(origin, 'todos').add(instance.pk)
+
+
+def deleted_with_todo(instance, origin):
+    return origin is not None and instance.todo_id in delete_state(origin, 'todos')
+
+
+def first_in_delete(instance, origin, key):
+    # 같은 delete() 로 지워지는 댓글 중 todo 마다 처음 한 번만 True
+    handled = delete_state(origin, key)
+    if instance.todo_id in handled:
+        return False
+    handled.add(instance.todo_id)
+    return True
+
+
+@receiver(post_save, sender=Todo)
+def index_todo(sender, instance, **kwargs):
+    search.index_todo(instance)
+
+
+@receiver(post_delete, sender=Todo)
+def unindex_todo(sender, instance, **kwargs):
+    search.remove_todo(instance.pk)
+
+
+@receiver(post_delete, sender=Todo)
+def delete_todo_renditions(sender, instance, **kwargs):
+    if instance.renditions:
+        storage = instance.thumbnail.storage
+        transaction.on_commit(lambda: delete_renditions(instance.renditions, storage))
+
+
+@receiver(post_save, sender=Todo)
+@receiver(post_delete, sender=Todo)
+def invalidate_todo_lists(sender, instance, **kwargs):
+    caching.invalidate_todo_owner(instance.user_id)
+
+
+@receiver(post_save, sender=Comment)
+def count_comment_added(sender, instance, created, **kwargs):
+    if created:
+        counters.comment_added(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def count_comment_removed(sender, instance, origin=None, **kwargs):
+    if origin is None or origin is instance:
+        counters.comment_removed(instance)
+    elif not deleted_with_todo(instance, origin) and first_in_delete(instance, origin, 'counted'):
+        # 여러 댓글이 한꺼번에 지워지면 signal 이 오기 전에 모두 지워져 있으므로 남은 댓글로 한 번 다시 셉니다.
+        counters.recount(instance.todo_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_lists(sender, instance, origin=None, **kwargs):
+    # 목록에 댓글 수가 보이므로 전체 목록과 작성자 목록을 모두 무효화합니다.
+    # todo 와 같이 지워지는 경우에는 invalidate_todo_lists 가 무효화합니다.
+    if origin is not None and (deleted_with_todo(instance, origin) or not first_in_delete(instance, origin, 'invalidated')):
+        return
+    todo_owner_id = Todo.objects.filter(pk=instance.todo_id).values_list('user_id', flat=True).first()
+    if todo_owner_id is not None:
+        caching.invalidate_todo_owner(todo_owner_id)
+
+
+@receiver(post_save, sender=Comment)
+def publish_comment_saved(sender, instance, created, **kwargs):
+    event = events.comment_event(events.CREATED if created else events.UPDATED, instance)
+    transaction.on_commit(lambda: events.broker.publish(instance.todo_id, event))
+
+
+@receiver(post_delete, sender=Comment)
+def publish_comment_deleted(sender, instance, origin=None, **kwargs):
+    if deleted_with_todo(instance, origin):
+        return
+    event = events.comment_event(events.DELETED, instance)
+    transaction.on_commit(lambda: events.broker.publish(instance.todo_id, event))
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_names(sender, instance, update_fields=None, **kwargs):
+    # 로그인 때마다 last_login 만 저장되는 경우는 목록에 영향이 없습니다.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    caching.invalidate_todo_owner(instance.pk)
@@ -0,0 +1,146 @@
+import hashlib
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from utils import perf
+
+# 내용(sha256) 기준으로 파일 이름을 정하는 저장소
+# 같은 이미지는 한 번만 저장하고 MediaBlob.refcount 로 몇 곳에서 참조하는지 셉니다.
+# django_cleanup 이 파일을 지울 때 부르는 delete() 는 참조 수만 줄이고,
+# 0 이 되었을 때만 실제 파일을 지웁니다.
+# 파일 쓰기는 트랜잭션에 묶이지 않으므로, 롤백된 저장은 참조 없는 파일을 남깁니다.
+# 이런 파일과 어긋난 참조 수는 reconcile(manage.py reconcile_media)이 실제 Todo 참조로 다시 세어 정리합니다.
+
+ORPHAN_GRACE = timedelta(hours=1)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    prefix = 'images/sha256'
+
+    def blob_model(self):
+        return apps.get_model('homework', 'MediaBlob')
+
+    def blob_name(self, digest, extension):
+        return f'{self.prefix}/{digest[:2]}/{digest}{extension}'
+
+    def hash_content(self, content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        return digest.hexdigest()
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        # 업로드 요청에서 이미지 해시 계산과 파일 쓰기에 걸린 시간 (Server-Timing 의 img)
+        with perf.span('image'):
+            target = self.blob_name(self.hash_content(content), Path(name).suffix.lower())
+            self.retain(target, size=content.size)
+
+            if not super().exists(target):
+                saved = self._save(target, content)
+                if saved != target:
+                    # 같은 내용을 동시에 저장한 경우라 먼저 저장된 파일을 씁니다.
+                    super().delete(saved)
+        return target
+
+    def retain(self, name, size=0):
+        MediaBlob = self.blob_model()
+        with transaction.atomic():
+            if MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1):
+                return
+            try:
+                with transaction.atomic():
+                    MediaBlob.objects.create(name=name, size=size, refcount=1)
+            except IntegrityError:
+                MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1)
+
+    def referenced_names(self):
+        # Todo 가 실제로 참조하는 이 저장소의 파일별 참조 수 (completed_image, thumbnail, renditions)
+        from homework.models import Todo
+        from homework.thumbnails import manifest_names
+
+        counts = Counter()
+        rows = Todo.objects.values_list('completed_image', 'thumbnail', 'renditions').iterator()
+        for image, thumbnail, renditions in rows:
+            for name in (image, thumbnail, *manifest_names(renditions)):
+                if name and name.startswith(f'{self.prefix}/'):
+                    counts[name] += 1
+        return counts
+
+    def stored_names(self):
+        root = Path(self.path(self.prefix))
+        if not root.is_dir():
+            return
+        for directory, _, files in os.walk(root):
+            for file in files:
+                yield Path(directory, file).relative_to(self.location).as_posix()
+
+    def reconcile(self, grace=ORPHAN_GRACE, dry_run=False):
+        # grace 보다 최근에 만들어진 blob/파일은 아직 커밋되지 않은 업로드나 썸네일 작업일 수 있어 건드리지 않습니다.
+        # 참조 수를 다시 세는 동안 생긴 업로드와 경합할 수 있으니 썸네일 워커가 한가할 때 실행하세요.
+        MediaBlob = self.blob_model()
+        cutoff = timezone.now() - grace
+        actual = self.referenced_names()
+        repaired = removed = 0
+
+        for blob in MediaBlob.objects.filter(created_at__lt=cutoff).iterator():
+            count = actual.get(blob.name, 0)
+            if blob.refcount == count:
+                continue
+            repaired += 1
+            if dry_run:
+                continue
+            if count:
+                MediaBlob.objects.filter(pk=blob.pk).update(refcount=count)
+            else:
+                blob.delete()
+                super().delete(blob.name)
+                removed += 1
+
+        known = set(MediaBlob.objects.values_list('name', flat=True))
+        for name, count in actual.items():
+            if name not in known and super().exists(name):
+                repaired += 1
+                if not dry_run:
+                    MediaBlob.objects.create(name=name, size=super().size(name), refcount=count)
+                known.add(name)
+
+        for name in self.stored_names():
+            modified = datetime.fromtimestamp(os.path.getmtime(self.path(name)), tz=timezone.get_current_timezone())
+            if name not in known and modified < cutoff:
+                removed += 1
+                if not dry_run:
+                    super().delete(name)
+        return repaired, removed
+
+    def delete(self, name):
+        MediaBlob = self.blob_model()
+        with transaction.atomic():
+            if not MediaBlob.objects.filter(name=name).update(refcount=F('refcount') - 1):
+                # 참조 정보가 없는 예전 파일은 그대로 지웁니다.
+                return super().delete(name)
+            deleted, _ = MediaBlob.objects.filter(name=name, refcount__lte=0).delete()
+        if deleted:
+            super().delete(name)
+
+
+media_storage = ContentAddressedStorage()
+
+
+def get_media_storage():
+    return media_storage
@@ -0,0 +1,54 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from homework.thumbnails import CONTENT_TYPES
+
+register = template.Library()
+
+# 썸네일이 아직 없을 때 작은 칸에 원본 대신 보여줄 회색 이미지 (요청 없이 바로 그려지도록 data URI)
+PLACEHOLDER_SRC = (
+    "data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 1 1'%3E"
+    "%3Crect width='1' height='1' fill='%23e9ecef'/%3E%3C/svg%3E"
+)
+
+
+def build_srcset(storage, names, widths):
+    return ', '.join(f'{storage.url(name)} {width}w' for name, width in zip(names, widths))
+
+
+@register.simple_tag
+def todo_image(todo, sizes, original=True, **attrs):
+    # {% todo_image todo sizes="100px" original=False class="img-thumbnail" alt="썸네일" %}
+    # sizes 는 화면에 실제로 그려지는 너비입니다. 브라우저가 이 값으로 srcset 에서 파일을 고르므로 호출하는 곳마다 맞게 넘깁니다.
+    # renditions 가 있으면 <picture> 로 포맷별 srcset 을, 없으면 원본/썸네일 <img> 를 출력합니다.
+    # 썸네일이 준비되기 전에는 원본을 내려보내는데, 목록처럼 작은 칸에서는 original=False 로 자리표시 이미지를 씁니다.
+    manifest = todo.renditions
+    attrs.setdefault('loading', 'lazy')
+    attributes = format_html_join('', ' {}="{}"', sorted(attrs.items()))
+
+    if not manifest or todo.thumbnail_status != todo.THUMBNAIL_READY:
+        url = todo.get_thumbnail_image_url()
+        if not url:
+            return ''
+        if not original and todo.thumbnail_status != todo.THUMBNAIL_READY:
+            url = PLACEHOLDER_SRC
+        return format_html('<img src="{}"{}>', url, attributes)
+
+    storage = todo.thumbnail.storage
+    widths = manifest['widths']
+    fallback = manifest['fallback']
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (CONTENT_TYPES[key], build_srcset(storage, names, widths), sizes)
+            for key, names in manifest['sources'].items() if key != fallback
+        ),
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}"{}></picture>',
+        sources,
+        todo.thumbnail.url,
+        build_srcset(storage, manifest['sources'][fallback], widths),
+        sizes,
+        attributes,
+    )
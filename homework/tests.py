@@ -1,3 +1,1337 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import json
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, router, transaction
+from django.db.models import Q
+from asgiref.sync import sync_to_async
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from homework import benchmarks, caching, events, search, seeding, thumbnails
+from homework.management.commands import profile_imports
+from homework.models import Comment, MediaBlob, ThumbnailJob, Todo
+from utils import perf, profiling, sqlite
+from utils.query_plan import explain_query_plan, plan_problems
+from PIL import ExifTags, Image
+
+User = get_user_model()
+
+
+def setUpModule():
+    # 요청마다 남는 성능 로그가 테스트 출력에 섞이지 않게 합니다.
+    unittest.enterModuleContext(perf.request_log_silenced())
+
+
+class TodoFixtureMixin:
+    # 여러 테스트가 함께 쓰는 사용자/todo 준비 (TestCase, TransactionTestCase 모두에 섞어 씁니다)
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user('user')
+        cache.clear()
+
+    def create_user(self, name):
+        return User.objects.create_user(email=f'{name}@example.com', password='password1234', name=name, is_active=True)
+
+    def create_todo(self, title='할 일', description='', user=None, **fields):
+        return Todo.objects.create(
+            title=title, description=description, user=user or self.user, start_date=date(2025, 8, 1), end_date=date(2025, 8, 31),
+            **fields,
+        )
+
+
+class TodoListViewTest(TestCase):
+    # session + user + count + todo 목록 (작성자 join)
+    QUERY_BUDGET = 4
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(email=f'user{i}@example.com', password='password1234', name=f'user{i}', is_active=True)
+            for i in range(3)
+        ]
+        self.client.force_login(self.users[0])
+        cache.clear()
+
+    def create_todos(self, count):
+        Todo.objects.bulk_create([
+            Todo(
+                title=f'todo {i}',
+                description='<p>description</p>' * 100,
+                user=self.users[i % len(self.users)],
+                start_date=date(2025, 8, 1),
+                end_date=date(2025, 8, 31),
+            )
+            for i in range(count)
+        ])
+        # bulk_create 는 signal 을 보내지 않으므로 목록 캐시를 직접 무효화합니다.
+        caching.bump(caching.ALL_SCOPE)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        self.create_todos(1)
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            self.client.get(reverse('todo_list'))
+
+        self.create_todos(20)
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.client.get(reverse('todo_list'))
+        self.assertEqual(len(response.context['page_obj'].object_list), 10)
+
+    def test_search_query_budget(self):
+        self.create_todos(20)
+        search.rebuild_index(Todo.objects.all())
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.client.get(reverse('todo_list'), {'q': 'todo 1'})
+        self.assertContains(response, '[user1] todo 1')
+
+    def test_description_is_not_loaded(self):
+        self.create_todos(1)
+        response = self.client.get(reverse('todo_list'))
+        todo = response.context['page_obj'].object_list[0]
+        self.assertIn('description', todo.get_deferred_fields())
+
+
+class TodoListCacheTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def titles(self, response):
+        return [todo.title for todo in response.context['page_obj'].object_list]
+
+    def test_second_request_is_served_from_cache(self):
+        self.create_todo('첫번째')
+        self.client.get(reverse('todo_list'))
+        # session + user 만 조회
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('todo_list'))
+        self.assertEqual(self.titles(response), ['첫번째'])
+        self.assertContains(response, '[user] 첫번째')
+        self.assertEqual(caching.get_stats()['hits'], 1)
+        self.assertEqual(caching.get_stats()['misses'], 1)
+
+    def test_save_and_delete_invalidate(self):
+        todo = self.create_todo('첫번째')
+        self.client.get(reverse('todo_list'))
+
+        todo.title = '수정됨'
+        todo.save()
+        self.assertEqual(self.titles(self.client.get(reverse('todo_list'))), ['수정됨'])
+
+        todo.delete()
+        self.assertEqual(self.titles(self.client.get(reverse('todo_list'))), [])
+
+    def test_author_rename_invalidates(self):
+        self.create_todo('첫번째')
+        self.client.get(reverse('todo_list'))
+
+        self.user.name = '새이름'
+        self.user.save()
+        self.assertContains(self.client.get(reverse('todo_list')), '[새이름] 첫번째')
+
+    def test_queries_are_cached_separately(self):
+        self.create_todo('운동')
+        self.create_todo('독서')
+        self.assertEqual(len(self.titles(self.client.get(reverse('todo_list')))), 2)
+        self.assertEqual(self.titles(self.client.get(reverse('todo_list'), {'q': '운동'})), ['운동'])
+
+
+class ConditionalGetTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.todo = self.create_todo(description='<p>' + '긴 설명' * 1000 + '</p>')
+        self.url = reverse('todo_info', kwargs={'pk': self.todo.pk})
+        # 첫 응답에서 CSRF 쿠키가 생기므로 미리 한 번 요청해 둡니다.
+        self.client.get(self.url)
+
+    def test_detail_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+
+        # session + user + todo/댓글 검증값
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_changes_with_comments(self):
+        etag = self.client.get(self.url)['ETag']
+        comment = Comment.objects.create(todo=self.todo, user=self.user, message='댓글')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        comment.delete()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detail_ignores_if_modified_since(self):
+        # 댓글을 삭제해도 todo/남은 댓글의 수정 시각은 그대로이므로 If-Modified-Since 만으로 304 를 답하면 안 됩니다.
+        comment = Comment.objects.create(todo=self.todo, user=self.user, message='댓글')
+        response = self.client.get(self.url)
+        self.assertNotIn('Last-Modified', response)
+
+        comment.delete()
+        modified_since = http_date(time.time() + 60)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=modified_since).status_code, 200)
+
+    def test_detail_changes_when_thumbnail_is_ready(self):
+        todo = self.create_todo('사진', completed_image='images/photo.jpg', thumbnail_status=Todo.THUMBNAIL_PENDING)
+        job = ThumbnailJob.objects.create(todo=todo, image_name=todo.completed_image.name)
+        url = reverse('todo_info', kwargs={'pk': todo.pk})
+        response = self.client.get(url)
+
+        manifest = {'size': [300, 225], 'widths': [300], 'fallback': 'jpeg', 'sources': {'jpeg': ['images/photo_300w.jpg']}}
+        thumbnails.attach_manifest(job, manifest)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_detail_depends_on_viewer(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.force_login(self.create_user('other'))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_not_modified_until_todo_changes(self):
+        etag = self.client.get(reverse('todo_list'))['ETag']
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('todo_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.todo.title = '바뀐 할 일'
+        self.todo.save()
+        self.assertEqual(self.client.get(reverse('todo_list'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_etag_expires_without_shared_cache(self):
+        # 다른 워커의 쓰기로 버전이 오르지 않아도 TODO_LIST_ETAG_SECONDS 가 지나면 다시 렌더링합니다.
+        now = 1_000_000.0
+        with mock.patch('homework.conditional.time.time', return_value=now):
+            etag = self.client.get(reverse('todo_list'))['ETag']
+            self.assertEqual(self.client.get(reverse('todo_list'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with mock.patch('homework.conditional.time.time', return_value=now + settings.TODO_LIST_ETAG_SECONDS):
+            self.assertEqual(self.client.get(reverse('todo_list'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTest(TodoFixtureMixin, TransactionTestCase):
+    # default(메모리)와 replica(이 테스트만 쓰는 임시 파일)는 서로 다른 SQLite DB 이고 복제되지 않으므로,
+    # 어느 쪽에서 읽었는지 결과로 알 수 있습니다. replica 에 없는 행은 "아직 복제되지 않은" 행입니다.
+    def setUp(self):
+        # 비어 있는 primary 를 복사해 스키마만 있는 replica 를 만듭니다. (replica 는 마이그레이션하지 않음)
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'replica.sqlite3'
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        target.close()
+        self.enterContext(sqlite.temporary_database('replica', {'ENGINE': 'django.db.backends.sqlite3', 'NAME': path}))
+
+        super().setUp()
+        self.client.force_login(self.user)
+        replica_user = User.objects.using('replica').create(pk=self.user.pk, email='user@example.com', name='user', is_active=True)
+        # bulk_create 는 signal(검색 색인/캐시 무효화)을 보내지 않아 primary 를 건드리지 않습니다.
+        self.replica_todo, = Todo.objects.using('replica').bulk_create([Todo(
+            title='복제본', description='', user=replica_user, start_date=date(2025, 8, 1), end_date=date(2025, 8, 31),
+        )])
+
+    def titles(self, client=None):
+        response = (client or self.client).get(reverse('todo_list'))
+        return [todo.title for todo in response.context['page_obj'].object_list]
+
+    def post_todo(self):
+        response = self.client.post(reverse('todo_create'), {
+            'title': '새 할 일', 'description': '<p>내용</p>', 'start_date': '2025-08-01', 'end_date': '2025-08-31',
+        })
+        self.assertEqual(response.status_code, 302)
+
+    def test_list_reads_from_replica(self):
+        self.assertEqual(self.titles(), ['복제본'])
+
+    def test_detail_reads_from_replica(self):
+        response = self.client.get(reverse('todo_info', kwargs={'pk': self.replica_todo.pk}))
+        self.assertContains(response, '복제본')
+        self.assertFalse(Todo.objects.filter(pk=self.replica_todo.pk).exists())
+
+    def test_writer_reads_own_write_while_pinned(self):
+        self.post_todo()
+        self.assertTrue(Todo.objects.filter(title='새 할 일').exists())
+
+        # 고정 쿠키가 없는 다른 사용자는 아직 복제되지 않은 replica 를 읽고, 그 페이지가 캐시에 들어갑니다.
+        self.assertEqual(self.titles(self.client_class()), ['복제본'])
+        # 쓴 사람은 쿠키로 primary 에 고정되어, replica 로 채워진 캐시도 건너뛰고 자기가 쓴 todo 를 봅니다.
+        self.assertEqual(self.titles(), ['새 할 일'])
+
+        # 고정 시간이 지나 쿠키가 없어지면 다시 replica 에서 읽습니다.
+        self.client.cookies.pop('db_pin')
+        cache.clear()
+        self.assertEqual(self.titles(), ['복제본'])
+
+    def test_replica_is_not_migrated(self):
+        self.assertFalse(router.allow_migrate('replica', 'homework', model_name='todo'))
+        self.assertTrue(router.allow_migrate('default', 'homework', model_name='todo'))
+
+    def test_replica_pages_are_cached_briefly(self):
+        with mock.patch.object(caching, 'set_page', wraps=caching.set_page) as set_page:
+            self.titles()
+        self.assertEqual(set_page.call_args.args[2], settings.REPLICA_PIN_SECONDS)
+
+
+class AsyncViewTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.todo = self.create_todo('비동기 할 일', '<p>내용</p>')
+        Comment.objects.create(todo=self.todo, user=self.user, message='첫 댓글')
+
+    async def test_list(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('async_todo_list'), {'q': '비동기'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '[user] 비동기 할 일')
+
+    async def test_detail_requires_login(self):
+        response = await self.async_client.get(reverse('async_todo_info', kwargs={'pk': self.todo.pk}))
+        self.assertEqual(response.status_code, 302)
+
+    async def test_detail_renders_comments(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('async_todo_info', kwargs={'pk': self.todo.pk}))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '첫 댓글')
+
+    async def test_comment_create(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.post(
+            reverse('async_comment_create', kwargs={'pk': self.todo.pk}), {'message': '두번째 댓글'},
+        )
+        self.assertRedirects(response, reverse('todo_info', kwargs={'pk': self.todo.pk}), fetch_redirect_response=False)
+        self.assertEqual(await Comment.objects.filter(todo=self.todo).acount(), 2)
+
+    async def test_list_rejects_post(self):
+        response = await self.async_client.post(reverse('async_todo_list'))
+        self.assertEqual(response.status_code, 405)
+
+
+class CommentStreamTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.todo = self.create_todo()
+
+    def save_comment(self, message):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Comment.objects.create(todo=self.todo, user=self.user, message=message)
+
+    def delete_comment(self, comment):
+        with self.captureOnCommitCallbacks(execute=True):
+            comment.delete()
+
+    async def next_event(self, subscription):
+        return await asyncio.wait_for(subscription.queue.get(), 1)
+
+    async def test_comment_changes_are_published_after_commit(self):
+        subscription = events.broker.subscribe(self.todo.pk)
+        try:
+            comment = await sync_to_async(self.save_comment)('새 댓글')
+            event = await self.next_event(subscription)
+            self.assertEqual((event['type'], event['id'], event['message']), (events.CREATED, comment.pk, '새 댓글'))
+
+            comment_id = comment.pk
+            await sync_to_async(self.delete_comment)(comment)
+            event = await self.next_event(subscription)
+            self.assertEqual((event['type'], event['id']), (events.DELETED, comment_id))
+        finally:
+            events.broker.unsubscribe(subscription)
+
+    async def test_stream_sends_events_and_unsubscribes(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('comment_stream', kwargs={'pk': self.todo.pk}))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b'retry:'))
+
+        events.broker.publish(self.todo.pk, {'type': events.UPDATED, 'id': 1, 'todo': self.todo.pk, 'message': '수정'})
+        chunk = (await anext(stream)).decode()
+        self.assertTrue(chunk.startswith('event: updated\n'))
+        self.assertEqual(json.loads(chunk.split('data: ', 1)[1])['message'], '수정')
+
+        # 클라이언트가 연결을 끊으면 ASGI 서버가 응답 태스크를 취소합니다.
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(events.broker.subscriber_count(self.todo.pk), 0)
+
+    def test_wsgi_does_not_open_stream(self):
+        # WSGI 는 async 스트림을 끝까지 모아서 보내므로, 끝나지 않는 스트림 대신 204 로 재접속을 멈춥니다.
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('comment_stream', kwargs={'pk': self.todo.pk}))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(response.streaming)
+        self.assertEqual(events.broker.subscriber_count(self.todo.pk), 0)
+
+        response = self.client.get(reverse('todo_info', kwargs={'pk': self.todo.pk}))
+        self.assertNotContains(response, 'data-stream-url=')
+        self.assertContains(response, "querySelector('#delete-button')")
+
+    async def test_asgi_detail_page_links_stream(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('async_todo_info', kwargs={'pk': self.todo.pk}))
+        self.assertContains(response, 'data-stream-url="%s"' % reverse('comment_stream', kwargs={'pk': self.todo.pk}))
+
+    def test_slow_subscriber_is_disconnected(self):
+        async def overflow():
+            subscription = events.broker.subscribe(self.todo.pk)
+            for i in range(events.SUBSCRIBER_QUEUE_SIZE + 1):
+                subscription.deliver({'type': events.DELETED, 'id': i})
+            events.broker.unsubscribe(subscription)
+            return await subscription.queue.get()
+
+        self.assertIsNone(asyncio.run(overflow()))
+
+
+class CommentCounterTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.todo = self.create_todo()
+
+    def add_comments(self, todo, user, count):
+        for i in range(count):
+            Comment.objects.create(todo=todo, user=user, message=f'댓글 {i}')
+
+    def test_cascade_delete_skips_per_comment_work(self):
+        # 댓글 조회 + thumbnail job/댓글/todo 삭제 + 검색 색인 2개 삭제 (댓글마다 카운터 UPDATE/작성자 조회를 하지 않음)
+        self.add_comments(self.todo, self.user, 50)
+        with self.assertNumQueries(6):
+            self.todo.delete()
+        self.assertFalse(Comment.objects.exists())
+
+    def test_user_delete_updates_other_todos(self):
+        other = self.create_user('other')
+        self.add_comments(self.todo, other, 30)
+        other_todo = self.create_todo('남의 할 일', user=other)
+        self.add_comments(other_todo, self.user, 30)
+        self.add_comments(other_todo, other, 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.user.delete()
+        # 남의 todo 는 댓글 수와 상관없이 한 번씩만 다시 셉니다.
+        self.assertLess(len(queries), 20)
+        other_todo.refresh_from_db()
+        self.assertEqual(other_todo.comment_count, 2)
+
+    def test_counters_follow_comment_views(self):
+        for message in ('첫 댓글', '둘째 댓글'):
+            self.client.post(reverse('comment_create', kwargs={'pk': self.todo.pk}), {'message': message})
+        first, second = Comment.objects.order_by('created_at')
+        self.todo.refresh_from_db()
+        self.assertEqual((self.todo.comment_count, self.todo.last_commented_at), (2, second.created_at))
+
+        self.client.post(reverse('comment_delete', kwargs={'pk': second.pk}))
+        self.todo.refresh_from_db()
+        self.assertEqual((self.todo.comment_count, self.todo.last_commented_at), (1, first.created_at))
+
+        self.client.post(reverse('comment_delete', kwargs={'pk': first.pk}))
+        self.todo.refresh_from_db()
+        self.assertEqual((self.todo.comment_count, self.todo.last_commented_at), (0, None))
+
+    def test_stale_save_keeps_counters(self):
+        stale = Todo.objects.get(pk=self.todo.pk)
+        comment = Comment.objects.create(todo=self.todo, user=self.user, message='댓글')
+
+        stale.title = '바뀐 할 일'
+        stale.save()
+        self.todo.refresh_from_db()
+        self.assertEqual(self.todo.title, '바뀐 할 일')
+        self.assertEqual((self.todo.comment_count, self.todo.last_commented_at), (1, comment.created_at))
+
+    def test_reconcile_repairs_drift(self):
+        comment = Comment.objects.create(todo=self.todo, user=self.user, message='댓글')
+        Todo.objects.filter(pk=self.todo.pk).update(comment_count=7, last_commented_at=None)
+
+        out = StringIO()
+        call_command('reconcile_comment_counters', '--dry-run', stdout=out)
+        self.assertIn('1개 중 1개', out.getvalue())
+        self.assertEqual(Todo.objects.get().comment_count, 7)
+
+        call_command('reconcile_comment_counters', stdout=StringIO())
+        self.todo.refresh_from_db()
+        self.assertEqual((self.todo.comment_count, self.todo.last_commented_at), (1, comment.created_at))
+
+
+class TodoBulkApiTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = self.create_user('other')
+        self.client.force_login(self.user)
+
+    def post(self, operations):
+        response = self.client.post(reverse('todo_bulk'), {'operations': operations}, content_type='application/json')
+        return response, json.loads(b''.join(response.streaming_content)) if response.streaming else response.json()
+
+    def test_create_update_delete_in_one_request(self):
+        kept = self.create_todo('수정할 일', '<p>내용</p>')
+        removed = self.create_todo('지울 일', '<p>내용</p>')
+        creates = [
+            {'op': 'create', 'data': {
+                'title': f'새 일 {i}', 'description': '<p onclick="x()">우유 <b>계란</b></p>',
+                'start_date': '2025-09-01', 'end_date': '2025-09-30',
+            }}
+            for i in range(20)
+        ]
+        # session + user + 대상 조회 + savepoint 2 + insert + update + 삭제 5 + 색인 4 (검색 색인 2개, 항목 수와 무관)
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(17):
+            response, body = self.post(creates + [
+                {'op': 'update', 'id': kept.pk, 'data': {'is_completed': True}},
+                {'op': 'delete', 'id': removed.pk},
+            ])
+        self.assertEqual(response.status_code, 200)
+        statuses = [result['status'] for result in body['results']]
+        self.assertEqual(statuses, ['created'] * 20 + ['updated', 'deleted'])
+
+        created = Todo.objects.get(pk=body['results'][0]['id'])
+        self.assertEqual((created.user, created.description_html), (self.user, '<p>우유 <b>계란</b></p>'))
+        kept.refresh_from_db()
+        self.assertEqual((kept.title, kept.is_completed), ('수정할 일', True))
+        self.assertFalse(Todo.objects.filter(pk=removed.pk).exists())
+        self.assertEqual(
+            list(search.search_todos(Todo.objects.all(), '계란').values_list('title', flat=True)).count('새 일 0'), 1,
+        )
+
+    def test_invalid_item_rejects_whole_batch(self):
+        todo = self.create_todo('그대로', '<p>내용</p>')
+        others = self.create_todo('남의 일', '<p>내용</p>', user=self.other)
+        response, body = self.post([
+            {'op': 'create', 'data': {'title': '제목만'}},
+            {'op': 'update', 'id': todo.pk, 'data': {'title': '바뀜'}},
+            {'op': 'delete', 'id': others.pk},
+            {'op': 'delete', 'id': todo.pk},
+        ])
+        self.assertEqual(response.status_code, 400)
+        results = body['results']
+        self.assertEqual([result['status'] for result in results], ['invalid', 'updated', 'not_found', 'invalid'])
+        self.assertIn('description', results[0]['errors'])
+        self.assertEqual(Todo.objects.get(pk=todo.pk).title, '그대로')
+        self.assertEqual(Todo.objects.count(), 2)
+
+    def test_malformed_id_is_invalid(self):
+        todo = self.create_todo('그대로', '<p>내용</p>')
+        response, body = self.post([
+            {'op': 'update', 'id': [todo.pk], 'data': {'title': '바뀜'}},
+            {'op': 'delete', 'id': {'pk': todo.pk}},
+            {'op': 'delete', 'id': True},
+            {'op': 'delete'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result['status'] for result in body['results']], ['invalid'] * 4)
+        self.assertIn('id', body['results'][0]['errors'])
+        self.assertEqual(Todo.objects.get(pk=todo.pk).title, '그대로')
+
+    def test_requires_login_and_json(self):
+        response = self.client.post(reverse('todo_bulk'), 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.client.logout()
+        response = self.client.post(reverse('todo_bulk'), {'operations': []}, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+
+class TodoExportTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = self.create_user('other')
+        self.client.force_login(self.user)
+        self.todos = [self.create_todo(f'할 일 {i}', '<p>내용</p>') for i in range(3)]
+        for todo in (self.todos[2], self.todos[0], self.todos[2]):
+            Comment.objects.create(todo=todo, user=self.other, message=f'{todo.title} 댓글')
+        self.create_todo('남의 일', user=self.other)
+
+    def export(self, **params):
+        response = self.client.get(reverse('todo_export'), params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_nests_comments_after_their_todo(self):
+        # session + user + todo + 댓글
+        with self.assertNumQueries(4):
+            lines = self.export(format='ndjson').splitlines()
+        records = [(row['type'], row.get('title') or row['message']) for row in map(json.loads, lines)]
+        self.assertEqual(records, [
+            ('todo', '할 일 0'), ('comment', '할 일 0 댓글'),
+            ('todo', '할 일 1'),
+            ('todo', '할 일 2'), ('comment', '할 일 2 댓글'), ('comment', '할 일 2 댓글'),
+        ])
+
+    def test_csv_export(self):
+        rows = list(csv.DictReader(self.export(format='csv').splitlines()))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual((rows[1]['type'], rows[1]['todo_id'], rows[1]['user_name']), ('comment', str(self.todos[0].pk), 'other'))
+
+    def test_only_staff_can_export_other_users(self):
+        self.assertNotIn('남의 일', self.export(format='ndjson', user=self.other.pk))
+        self.user.is_staff = True
+        self.user.save()
+        self.assertIn('남의 일', self.export(format='ndjson', user=self.other.pk))
+
+    def test_command_writes_gzip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f'{directory}/todos.ndjson.gz'
+            call_command('export_todos', path, '--user', 'user@example.com', '--chunk-size', '1', stdout=StringIO())
+            with gzip.open(path, 'rt', encoding='utf-8') as file:
+                self.assertEqual(len(file.read().splitlines()), 6)
+
+
+class ImportTodosTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write_jsonl(self, rows, name='todos.jsonl.gz'):
+        path = f'{self.directory}/{name}'
+        with gzip.open(path, 'wt', encoding='utf-8') as file:
+            for row in rows:
+                file.write((row if isinstance(row, str) else json.dumps(row, ensure_ascii=False)) + '\n')
+        return path
+
+    def row(self, i, **extra):
+        return {'title': f'가져온 일 {i}', 'description': f'<p>설명 {i}</p>', 'start_date': '2025-08-01', 'end_date': '2025-08-31', **extra}
+
+    def import_todos(self, path, *args):
+        out = StringIO()
+        call_command('import_todos', path, '--user', 'user@example.com', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_imports_in_batches_and_skips_invalid_rows(self):
+        path = self.write_jsonl([self.row(i) for i in range(5)] + ['{broken', {'title': '설명 없음'}, self.row(5, is_completed=True)])
+        output = self.import_todos(path, '--batch-size', '3')
+
+        self.assertIn('6개 가져옴, 2개 건너뜀', output)
+        self.assertIn('rows/s', output)
+        self.assertEqual(Todo.objects.filter(user=self.user).count(), 6)
+        todo = Todo.objects.get(title='가져온 일 5')
+        self.assertEqual((todo.is_completed, todo.description_text), (True, '설명 5'))
+        self.assertEqual(list(search.search_todos(Todo.objects.all(), '설명 3').values_list('title', flat=True)), ['가져온 일 3'])
+
+        with self.assertRaises(CommandError):
+            self.import_todos(path)
+
+    def test_resumes_after_last_committed_batch(self):
+        path = self.write_jsonl([self.row(i) for i in range(7)])
+        original = Todo.objects.bulk_create
+        calls = []
+
+        def fail_on_second_batch(objs, *args, **kwargs):
+            calls.append(len(objs))
+            if len(calls) == 2:
+                raise RuntimeError('중간 실패')
+            return original(objs, *args, **kwargs)
+
+        with mock.patch.object(Todo.objects, 'bulk_create', side_effect=fail_on_second_batch):
+            with self.assertRaises(RuntimeError):
+                self.import_todos(path, '--batch-size', '3')
+        self.assertEqual(Todo.objects.count(), 3)
+
+        output = self.import_todos(path, '--batch-size', '3')
+        self.assertIn('3번째 행 다음부터', output)
+        self.assertEqual(sorted(Todo.objects.values_list('title', flat=True)), [f'가져온 일 {i}' for i in range(7)])
+
+    def test_images_are_queued_for_thumbnails(self):
+        with override_settings(MEDIA_ROOT=self.directory):
+            with open(f'{self.directory}/photo.jpg', 'wb') as file:
+                file.write(make_image().read())
+            path = self.write_jsonl([self.row(0, completed_image='photo.jpg'), self.row(1, completed_image='missing.png')])
+            self.import_todos(path, '--image-dir', self.directory)
+
+        todo = Todo.objects.get()
+        self.assertEqual(todo.thumbnail_status, Todo.THUMBNAIL_PENDING)
+        self.assertEqual(ThumbnailJob.objects.get().todo, todo)
+        self.assertFalse(todo.thumbnail)
+
+
+class SqliteSettingsTest(TestCase):
+    # 테스트 DB 는 메모리 DB 라 WAL 을 쓸 수 없으므로, default 와 같은 설정으로 임시 파일을 열어 확인합니다.
+    ALIAS = 'sqlite_settings'
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = Path(directory) / 'db.sqlite3'
+
+    def open(self):
+        return sqlite.temporary_database(self.ALIAS, {**settings.DATABASES['default'], 'NAME': str(self.path), 'TEST': {}})
+
+    def test_connection_pragmas(self):
+        values = {}
+        with self.open() as connection, connection.cursor() as cursor:
+            for name in ('journal_mode', 'synchronous', 'busy_timeout'):
+                cursor.execute(f'PRAGMA {name}')
+                values[name] = cursor.fetchone()[0]
+        # synchronous: 1 = NORMAL
+        self.assertEqual(values, {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 5000})
+
+    def test_atomic_takes_write_lock_up_front(self):
+        # BEGIN IMMEDIATE 라서 아무것도 쓰기 전에 다른 연결의 쓰기 트랜잭션이 막힙니다.
+        with self.open(), transaction.atomic(using=self.ALIAS):
+            other = sqlite3.connect(self.path, timeout=0, isolation_level=None)
+            self.addCleanup(other.close)
+            with self.assertRaisesMessage(sqlite3.OperationalError, 'locked'):
+                other.execute('BEGIN IMMEDIATE')
+
+    def test_connection_outlives_request(self):
+        # 요청이 끝날 때(request_finished) 불리는 정리 함수가 CONN_MAX_AGE 동안은 연결을 닫지 않습니다.
+        with self.open() as connection:
+            connection.ensure_connection()
+            raw_connection = connection.connection
+            connection.close_if_unusable_or_obsolete()
+            self.assertIs(connection.connection, raw_connection)
+
+    def test_benchmark_uses_django_connections(self):
+        # tuned 모드가 raw sqlite3 가 아니라 Django 연결 설정(PRAGMA)으로 측정되는지 확인합니다.
+        out = StringIO()
+        call_command('benchmark_sqlite', readers=1, writers=1, duration=0.1, rows=100, stdout=out)
+        modes = {line.split()[0]: line.split()[1] for line in out.getvalue().splitlines()[2:]}
+        self.assertEqual(modes, {'default': 'delete', 'tuned': 'wal'})
+
+
+class QueryPlanTest(TodoFixtureMixin, TestCase):
+    # 자주 쓰는 조회가 전체 스캔이나 임시 정렬로 바뀌면 실패합니다.
+    def setUp(self):
+        super().setUp()
+        self.todo = self.create_todo()
+
+    def assert_uses_index(self, queryset, allow_temp_sort=False):
+        plan = explain_query_plan(queryset)
+        self.assertEqual(plan_problems(plan, allow_temp_sort), [], f'{queryset.query}\n' + '\n'.join(plan))
+
+    def test_todo_list_page(self):
+        self.assert_uses_index(
+            Todo.objects.select_related('user').only('title', 'created_at', 'user__name').order_by('-created_at')[:10]
+        )
+
+    def test_todo_list_cursor_page(self):
+        now = self.todo.created_at
+        self.assert_uses_index(
+            Todo.objects.filter(Q(created_at__lt=now) | Q(created_at=now, pk__lt=self.todo.pk))
+            .order_by('-created_at', '-pk')[:11]
+        )
+
+    def test_user_todo_list(self):
+        self.assert_uses_index(Todo.objects.filter(user=self.user).order_by('-created_at')[:10])
+
+    def test_comment_page(self):
+        self.assert_uses_index(Comment.objects.filter(todo=self.todo).order_by('-created_at')[:5])
+
+    def test_comment_cursor_page(self):
+        now = self.todo.created_at
+        self.assert_uses_index(
+            Comment.objects.filter(todo=self.todo).filter(Q(created_at__lt=now) | Q(created_at=now, pk__lt=1))
+            .order_by('-created_at', '-pk')[:6]
+        )
+
+    def test_admin_todo_list(self):
+        self.assert_uses_index(Todo.objects.order_by('-start_date')[:100])
+
+    def test_search(self):
+        # 검색 결과는 관련도 순으로 정렬하므로 일치한 행들에 대한 정렬은 허용합니다.
+        self.assert_uses_index(search.search_todos(Todo.objects.all(), '할일이')[:10], allow_temp_sort=True)
+
+    def test_short_search(self):
+        # trigram 으로 찾을 수 없는 1~2글자 검색어도 LIKE 전체 스캔 없이 2글자 색인으로 찾습니다.
+        for q in ('회의', '회', '회의 정리', '회의록 팀'):
+            with self.subTest(q=q):
+                self.assert_uses_index(search.search_todos(Todo.objects.all(), q)[:10], allow_temp_sort=True)
+
+
+class TodoSearchTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def search(self, q):
+        response = self.client.get(reverse('todo_list'), {'q': q})
+        return [todo.title for todo in response.context['page_obj'].object_list]
+
+    def test_index_follows_save_and_delete(self):
+        todo = self.create_todo('장보기', '<p>우유와 <b>계란</b></p>')
+        self.assertEqual(self.search('계란'), ['장보기'])
+
+        todo.description = '<p>두부</p>'
+        todo.save()
+        self.assertEqual(self.search('계란'), [])
+        self.assertEqual(self.search('두부'), ['장보기'])
+
+        todo.delete()
+        self.assertEqual(self.search('두부'), [])
+
+    def test_tags_are_not_indexed(self):
+        self.create_todo('운동', '<p class="strong">스쿼트</p>')
+        self.assertEqual(self.search('strong'), [])
+
+    def test_title_match_ranks_first(self):
+        self.create_todo('장보기 목록', '<p>우유</p>')
+        self.create_todo('독서', '<p>장보기 하고 책 읽기</p>')
+        self.assertEqual(self.search('장보기'), ['장보기 목록', '독서'])
+
+    def test_korean_substring(self):
+        self.create_todo('주간회의록정리', '<p>팀장님께보고</p>')
+        self.create_todo('운동', '<p>스쿼트</p>')
+        self.assertEqual(self.search('회의록'), ['주간회의록정리'])
+        self.assertEqual(self.search('회의'), ['주간회의록정리'])
+        self.assertEqual(self.search('께보고 회의'), ['주간회의록정리'])
+        self.assertEqual(self.search('회의록 스쿼트'), [])
+
+    def test_short_terms(self):
+        self.create_todo('주간회의록정리', '<p>팀장님께 보고</p>')
+        self.create_todo('Gym', '<p>스쿼트 5세트</p>')
+        self.assertEqual(self.search('간회'), ['주간회의록정리'])
+        self.assertEqual(self.search('주'), ['주간회의록정리'])
+        self.assertEqual(self.search('리'), ['주간회의록정리'])
+        self.assertEqual(self.search('께'), ['주간회의록정리'])
+        self.assertEqual(self.search('gy'), ['Gym'])
+        self.assertEqual(self.search('M'), ['Gym'])
+        self.assertEqual(self.search('5'), ['Gym'])
+        self.assertEqual(self.search('세트 스쿼'), ['Gym'])
+        # 단어 경계를 넘는 조각은 색인하지 않습니다.
+        self.assertEqual(self.search('님께'), ['주간회의록정리'])
+        self.assertEqual(self.search('께보'), [])
+        self.assertEqual(self.search('록회'), [])
+
+    def test_short_index_follows_save_and_delete(self):
+        todo = self.create_todo('장보기', '<p>우유</p>')
+        self.assertEqual(self.search('우유'), ['장보기'])
+
+        todo.description = '<p>두부</p>'
+        todo.save()
+        self.assertEqual(self.search('우유'), [])
+        self.assertEqual(self.search('두'), ['장보기'])
+
+        todo.delete()
+        self.assertEqual(self.search('두'), [])
+
+    def test_rebuild_index_includes_short_terms(self):
+        todo = self.create_todo('장보기', '<p>우유</p>')
+        search.remove_todo(todo.pk)
+        self.assertEqual(self.search('우유'), [])
+        search.rebuild_index(Todo.objects.all())
+        cache.clear()
+        self.assertEqual(self.search('우유'), ['장보기'])
+
+    def test_short_symbol_term_uses_contains(self):
+        self.create_todo('C++ 공부', '')
+        self.assertEqual(self.search('++'), ['C++ 공부'])
+
+    @override_settings(PAGINATION_MODE='cursor')
+    def test_search_keeps_rank_order_in_cursor_mode(self):
+        self.create_todo('장보기 목록', '<p>우유</p>')
+        self.create_todo('독서', '<p>장보기 하고 책 읽기</p>')
+        response = self.client.get(reverse('todo_list'), {'q': '장보기'})
+        self.assertEqual(response.context['pagination_mode'], 'offset')
+        self.assertEqual([todo.title for todo in response.context['page_obj'].object_list], ['장보기 목록', '독서'])
+
+
+class DescriptionRenderTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_description_is_sanitized_once_on_save(self):
+        todo = self.create_todo(description=(
+            '<p onclick="steal()">우유<script>alert(1)</script></p><p><a href="javascript:steal()">링크</a>'
+            '<img src="/media/a.png" onerror="steal()"></p>'
+        ))
+        self.assertNotIn('onclick', todo.description_html)
+        self.assertNotIn('<script', todo.description_html)
+        self.assertNotIn('javascript:', todo.description_html)
+        self.assertNotIn('onerror', todo.description_html)
+        self.assertIn('<img src="/media/a.png">', todo.description_html)
+
+        with mock.patch('homework.models.render_description') as render:
+            response = self.client.get(reverse('todo_info', kwargs={'pk': todo.pk}))
+        render.assert_not_called()
+        self.assertContains(response, todo.description_html, html=False)
+
+    def test_plain_text_projection(self):
+        todo = self.create_todo(description='<h3>제목</h3><p>우유&amp;<b>계란</b></p><ul><li>하나</li><li>둘</li></ul>')
+        self.assertEqual(todo.description_text, '제목 우유&계란 하나 둘')
+
+    def test_update_fields_refreshes_projection(self):
+        todo = self.create_todo(description='<p>전</p>')
+        todo.description = '<p>후</p>'
+        todo.save(update_fields=['description'])
+        todo.refresh_from_db()
+        self.assertEqual((todo.description_html, todo.description_text), ('<p>후</p>', '후'))
+
+    def test_only_whitelisted_iframes_are_kept(self):
+        todo = self.create_todo(description=(
+            '<iframe src="https://www.youtube.com/embed/abc"></iframe><iframe src="https://evil.example/"></iframe>'
+        ))
+        self.assertEqual(todo.description_html, '<iframe src="https://www.youtube.com/embed/abc"></iframe><iframe></iframe>')
+
+
+@override_settings(PAGINATION_MODE='cursor')
+class CursorPaginationTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        Todo.objects.bulk_create([
+            Todo(title=f'todo {i}', description='', user=self.user, start_date=date(2025, 8, 1), end_date=date(2025, 8, 31))
+            for i in range(25)
+        ])
+        caching.bump(caching.ALL_SCOPE)
+        self.expected = list(Todo.objects.order_by('-created_at', '-pk').values_list('pk', flat=True))
+
+    def page_pks(self, response):
+        return [todo.pk for todo in response.context['page_obj']]
+
+    def test_walk_forward_and_back(self):
+        url = reverse('todo_list')
+        first = self.client.get(url)
+        self.assertEqual(self.page_pks(first), self.expected[:10])
+        self.assertFalse(first.context['page_obj'].has_previous())
+
+        second = self.client.get(url, {'cursor': first.context['page_obj'].next_cursor})
+        self.assertEqual(self.page_pks(second), self.expected[10:20])
+
+        third = self.client.get(url, {'cursor': second.context['page_obj'].next_cursor})
+        self.assertEqual(self.page_pks(third), self.expected[20:])
+        self.assertFalse(third.context['page_obj'].has_next())
+
+        back = self.client.get(url, {'cursor': third.context['page_obj'].previous_cursor})
+        self.assertEqual(self.page_pks(back), self.expected[10:20])
+
+        back = self.client.get(url, {'cursor': back.context['page_obj'].previous_cursor})
+        self.assertEqual(self.page_pks(back), self.expected[:10])
+        self.assertFalse(back.context['page_obj'].has_previous())
+
+    def test_cached_cursor_page(self):
+        first = self.client.get(reverse('todo_list'))
+        with self.assertNumQueries(2):
+            second = self.client.get(reverse('todo_list'))
+        self.assertEqual(self.page_pks(second), self.page_pks(first))
+        self.assertEqual(second.context['page_obj'].next_cursor, first.context['page_obj'].next_cursor)
+
+    def test_deep_page_skips_count(self):
+        first = self.client.get(reverse('todo_list'))
+        # session + user + todo 목록, COUNT 없음
+        with self.assertNumQueries(3):
+            self.client.get(reverse('todo_list'), {'cursor': first.context['page_obj'].next_cursor})
+
+    def test_tampered_cursor_falls_back_to_first_page(self):
+        response = self.client.get(reverse('todo_list'), {'cursor': 'garbage'})
+        self.assertEqual(self.page_pks(response), self.expected[:10])
+
+
+def make_image(name='photo.jpg', size=(1200, 900), file_type='JPEG', orientation=None):
+    data = BytesIO()
+    image = Image.new('RGB', size, 'orange')
+    if orientation is None:
+        image.save(data, file_type)
+    else:
+        exif = Image.Exif()
+        exif[ExifTags.Base.Orientation] = orientation
+        image.save(data, file_type, exif=exif)
+    return SimpleUploadedFile(name, data.getvalue(), content_type=f'image/{file_type.lower()}')
+
+
+class MediaTestCase(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        super().setUp()
+
+    def create_image_todo(self, image):
+        return self.create_todo('완료', completed_image=image)
+
+
+class ThumbnailJobTest(MediaTestCase):
+    def test_upload_is_queued_and_falls_back_to_original(self):
+        todo = self.create_image_todo(make_image())
+        self.assertEqual(todo.thumbnail_status, Todo.THUMBNAIL_PENDING)
+        self.assertFalse(todo.thumbnail)
+        self.assertEqual(todo.get_thumbnail_image_url(), todo.completed_image.url)
+        self.assertEqual(ThumbnailJob.objects.filter(todo=todo, status=ThumbnailJob.PENDING).count(), 1)
+
+    def test_worker_generates_thumbnail(self):
+        todo = self.create_image_todo(make_image())
+        call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+
+        todo.refresh_from_db()
+        self.assertEqual(todo.thumbnail_status, Todo.THUMBNAIL_READY)
+        self.assertEqual(todo.get_thumbnail_image_url(), todo.thumbnail.url)
+        with Image.open(todo.thumbnail) as thumbnail:
+            self.assertEqual(thumbnail.size, (300, 225))
+        self.assertEqual(ThumbnailJob.objects.get(todo=todo).status, ThumbnailJob.DONE)
+
+        self.assertEqual(todo.renditions['widths'], [100, 300, 800])
+        self.assertEqual(todo.renditions['fallback'], 'jpeg')
+        for names in todo.renditions['sources'].values():
+            self.assertEqual(len(names), 3)
+
+    def test_small_image_is_not_upscaled(self):
+        todo = self.create_image_todo(make_image('small.png', size=(80, 60), file_type='PNG'))
+        call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+
+        todo.refresh_from_db()
+        self.assertEqual(todo.renditions['widths'], [80])
+        with Image.open(todo.thumbnail) as thumbnail:
+            self.assertEqual(thumbnail.size, (80, 60))
+
+    def test_list_renders_srcset(self):
+        self.create_image_todo(make_image())
+        call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('todo_list'))
+        self.assertContains(response, '<picture><source type="image/avif"')
+        self.assertContains(response, 'sizes="100px"')
+        self.assertContains(response, '.jpg 100w')
+
+    def test_list_does_not_download_original_before_thumbnail(self):
+        todo = self.create_image_todo(make_image())
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('todo_list'))
+        self.assertNotContains(response, todo.completed_image.url)
+        self.assertContains(response, 'src="data:image/svg+xml')
+
+        # 상세 화면은 큰 칸이라 원본을 그대로 보여줍니다.
+        response = self.client.get(reverse('todo_info', kwargs={'pk': todo.pk}))
+        self.assertContains(response, todo.completed_image.url)
+
+    def test_list_keeps_legacy_thumbnail(self):
+        # renditions 가 생기기 전에 만든 300px 썸네일은 준비된 상태이므로 그대로 씁니다.
+        todo = self.create_image_todo(make_image())
+        call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+        Todo.objects.filter(pk=todo.pk).update(renditions={})
+        todo.refresh_from_db()
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('todo_list'))
+        self.assertContains(response, f'<img src="{todo.thumbnail.url}"')
+        self.assertNotContains(response, todo.completed_image.url)
+
+    def test_detail_renders_full_width_sizes(self):
+        todo = self.create_image_todo(make_image())
+        call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('todo_info', kwargs={'pk': todo.pk}))
+        self.assertContains(response, 'sizes="(min-width: 800px) 800px, 100vw"')
+        self.assertNotContains(response, 'sizes="100px"')
+
+    def test_broken_image_fails_after_retries(self):
+        todo = self.create_image_todo(SimpleUploadedFile('broken.png', b'not an image'))
+        for _ in range(3):
+            call_command('process_thumbnails', once=True, workers=0, stdout=StringIO(), stderr=StringIO())
+
+        todo.refresh_from_db()
+        self.assertEqual(todo.thumbnail_status, Todo.THUMBNAIL_FAILED)
+        self.assertEqual(todo.get_thumbnail_image_url(), todo.completed_image.url)
+
+    def test_expired_lease_is_requeued_then_failed(self):
+        # 워커가 처리 중에 죽어서 PROCESSING 으로 남은 job
+        todo = self.create_image_todo(make_image())
+        job = ThumbnailJob.objects.get(todo=todo)
+        expired = timezone.now() - thumbnails.LEASE_TIMEOUT - timedelta(seconds=1)
+        ThumbnailJob.objects.filter(pk=job.pk).update(status=ThumbnailJob.PROCESSING, attempts=1, claimed_at=expired)
+
+        call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+        job.refresh_from_db()
+        todo.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (ThumbnailJob.DONE, 2))
+        self.assertEqual(todo.thumbnail_status, Todo.THUMBNAIL_READY)
+
+        other = self.create_image_todo(make_image('other.jpg', size=(640, 480)))
+        job = ThumbnailJob.objects.get(todo=other)
+        ThumbnailJob.objects.filter(pk=job.pk).update(status=ThumbnailJob.PROCESSING, attempts=thumbnails.MAX_ATTEMPTS, claimed_at=expired)
+        thumbnails.claim_jobs(10)
+        job.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(job.status, ThumbnailJob.FAILED)
+        self.assertEqual(other.thumbnail_status, Todo.THUMBNAIL_FAILED)
+
+    def test_worker_pool_generates_thumbnail(self):
+        todo = self.create_image_todo(make_image())
+        call_command('process_thumbnails', once=True, workers=1, stdout=StringIO())
+
+        todo.refresh_from_db()
+        self.assertEqual(todo.thumbnail_status, Todo.THUMBNAIL_READY)
+
+    def test_exif_orientation_is_applied(self):
+        todo = self.create_image_todo(make_image(orientation=6))
+        call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+
+        todo.refresh_from_db()
+        self.assertEqual(todo.renditions['size'], [900, 1200])
+        with Image.open(todo.thumbnail) as thumbnail:
+            self.assertEqual(thumbnail.size, (300, 400))
+
+
+class ContentAddressedStorageTest(MediaTestCase):
+    def test_same_content_is_stored_once(self):
+        first = self.create_image_todo(make_image('a.jpg'))
+        second = self.create_image_todo(make_image('b.jpg'))
+        self.assertEqual(first.completed_image.name, second.completed_image.name)
+        self.assertTrue(first.completed_image.name.startswith('images/sha256/'))
+        self.assertEqual(MediaBlob.objects.get(name=first.completed_image.name).refcount, 2)
+
+    def test_thumbnails_are_reused(self):
+        first = self.create_image_todo(make_image('a.jpg'))
+        call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+        second = self.create_image_todo(make_image('b.jpg'))
+        with mock.patch.object(thumbnails, 'render_renditions') as render:
+            call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+        render.assert_not_called()
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(second.thumbnail_status, Todo.THUMBNAIL_READY)
+        self.assertEqual(first.renditions, second.renditions)
+        self.assertEqual(first.thumbnail.name, second.thumbnail.name)
+
+    def test_shared_files_survive_until_last_reference(self):
+        first = self.create_image_todo(make_image('a.jpg'))
+        call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+        second = self.create_image_todo(make_image('b.jpg'))
+        call_command('process_thumbnails', once=True, workers=0, stdout=StringIO())
+        first.refresh_from_db()
+        names = [first.completed_image.name, *thumbnails.manifest_names(first.renditions)]
+        storage = first.completed_image.storage
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(all(storage.exists(name) for name in names))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Todo.objects.get(pk=second.pk).delete()
+        self.assertFalse(any(storage.exists(name) for name in names))
+        self.assertFalse(MediaBlob.objects.exists())
+
+    def test_reupload_of_same_content_keeps_one_reference(self):
+        todo = self.create_image_todo(make_image('a.jpg'))
+        name = todo.completed_image.name
+        todo.completed_image = make_image('again.jpg')
+        with self.captureOnCommitCallbacks(execute=True):
+            todo.save()
+        self.assertEqual(todo.completed_image.name, name)
+        self.assertEqual(MediaBlob.objects.get(name=name).refcount, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            todo.delete()
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(todo.completed_image.storage.exists(name))
+
+    def test_reconcile_removes_rolled_back_upload(self):
+        kept = self.create_image_todo(make_image('a.jpg', size=(640, 480)))
+        MediaBlob.objects.filter(name=kept.completed_image.name).update(refcount=5, created_at=timezone.now() - timedelta(days=1))
+        try:
+            with transaction.atomic():
+                rolled_back = self.create_image_todo(make_image('b.jpg'))
+                raise ValueError
+        except ValueError:
+            pass
+        storage = kept.completed_image.storage
+        name = rolled_back.completed_image.name
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+        self.assertTrue(storage.exists(name))
+
+        out = StringIO()
+        call_command('reconcile_media', grace_hours=0, stdout=out)
+        self.assertIn('참조 수가 어긋난 파일 1개를 고치고, 참조 없는 파일 1개를 지웠습니다.', out.getvalue())
+        self.assertFalse(storage.exists(name))
+        self.assertTrue(storage.exists(kept.completed_image.name))
+        self.assertEqual(MediaBlob.objects.get(name=kept.completed_image.name).refcount, 1)
+
+
+class PrepareImageTest(TestCase):
+    def test_jpeg_is_decoded_at_reduced_scale(self):
+        with Image.open(make_image(size=(4000, 3000))) as image:
+            image, size = thumbnails.prepare_image(image)
+            self.assertEqual(size, [4000, 3000])
+            self.assertEqual(image.size, (1000, 750))
+
+    def test_decoded_pixel_cap(self):
+        with Image.open(make_image('large.png', size=(2000, 2000), file_type='PNG')) as image:
+            with mock.patch.object(thumbnails, 'MAX_DECODED_PIXELS', 1_000_000):
+                with self.assertRaises(ValueError):
+                    thumbnails.prepare_image(image)
+
+
+class BenchmarkSuiteTest(MediaTestCase):
+    def test_seed_is_reproducible_and_skewed(self):
+        result = seeding.seed(users=2, todos_per_user=5, max_comments=20, images=1, seed=7)
+        self.assertEqual((result['users'], result['todos'], result['images']), (2, 10, 1))
+        hot = Todo.objects.get(pk=result['hot_todo'])
+        self.assertEqual(hot.comment_count, 20)
+        self.assertEqual(Comment.objects.count(), result['comments'])
+        self.assertEqual(ThumbnailJob.objects.count(), 1)
+
+        titles = list(Todo.objects.order_by('pk').values_list('title', flat=True))
+        seeding.clear()
+        seeding.seed(users=2, todos_per_user=5, max_comments=20, images=1, seed=7)
+        self.assertEqual(list(Todo.objects.order_by('pk').values_list('title', flat=True)), titles)
+
+    def test_suite_reports_every_scenario(self):
+        result = seeding.seed(users=1, todos_per_user=3, max_comments=12, seed=1)
+        self.client.login(email=seeding.seed_email(0), password=seeding.PASSWORD)
+        results = benchmarks.run_suite(self.client, result['hot_todo'], iterations=2)
+        self.assertEqual(set(results), set(benchmarks.scenarios(result['hot_todo'])))
+        for name, scenario in results.items():
+            self.assertTrue(all(status < 400 for status in scenario['statuses']), name)
+            self.assertGreater(scenario['queries'], 0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {'scenarios': {'todo_list': {'p50_ms': 10, 'p99_ms': 20, 'queries': 4, 'peak_kb': 100}}}
+        report = {'scenarios': {'todo_list': {'p50_ms': 11, 'p99_ms': 30, 'queries': 5, 'peak_kb': 100}}}
+        regressed = {row['metric'] for row in benchmarks.compare(report, baseline, threshold=1.2) if row['regressed']}
+        self.assertEqual(regressed, {'p99_ms', 'queries'})
+
+
+class AsgiBenchmarkTest(TransactionTestCase):
+    # 핸들러가 다른 스레드의 연결로 조회하므로 데이터가 커밋되어 있어야 합니다.
+    def test_wsgi_run_bypasses_page_cache(self):
+        # async 목록 뷰는 캐시를 쓰지 않으므로 WSGI 쪽도 요청마다 목록을 새로 조회해야 같은 일을 비교하게 됩니다.
+        seeding.seed(users=1, todos_per_user=3, max_comments=2, seed=1)
+        out = StringIO()
+        with mock.patch.object(caching, 'set_page', wraps=caching.set_page) as set_page:
+            call_command(
+                'benchmark_asgi', clients=1, requests=3, client_delay=0, wsgi_workers=1, host='testserver', stdout=out,
+            )
+        self.assertEqual(set_page.call_count, 3)
+        errors = {line.split()[0]: int(line.split()[-1]) for line in out.getvalue().splitlines()[2:]}
+        self.assertEqual(errors, {'wsgi': 0, 'asgi': 0})
+
+
+@override_settings(PERF_SERVER_TIMING=True)
+class PerformanceMiddlewareTest(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        perf.clear_slow_requests()
+        self.addCleanup(perf.clear_slow_requests)
+
+    def timing(self, response):
+        return dict(
+            (part.split(';')[0], part) for part in response['Server-Timing'].split(', ')
+        )
+
+    def test_server_timing_and_log_line(self):
+        with self.assertLogs('utils.perf', 'INFO') as logs:
+            first = self.client.get(reverse('todo_list'))
+            second = self.client.get(reverse('todo_list'))
+        self.assertIn('desc="0 hit 1 miss"', self.timing(first)['cache'])
+        self.assertIn('desc="1 hit 0 miss"', self.timing(second)['cache'])
+        self.assertIn('tpl;dur=', self.timing(first)['tpl'])
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record['view'], record['status'], record['cache_misses']), ('todo_list', 200, 1))
+        self.assertGreater(record['db_count'], 0)
+        self.assertIn(f'desc="{record["db_count"]} queries"', self.timing(first)['db'])
+
+    def test_image_upload_time_is_reported(self):
+        response = self.client.post(reverse('todo_create'), {
+            'title': '사진', 'description': '<p>내용</p>', 'start_date': '2025-08-01', 'end_date': '2025-08-31',
+            'completed_image': make_image(),
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('img', self.timing(response))
+
+    @override_settings(PERF_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_visible_to_staff(self):
+        with self.assertLogs('utils.perf', 'WARNING'):
+            self.client.get(reverse('todo_list'), {'q': '느림', '_profile': 'token'})
+            # 검색어나 토큰 값은 남기지 않고 파라미터 이름만 남깁니다.
+            self.assertEqual(perf.slow_requests()[0]['params'], ['_profile', 'q'])
+            self.assertNotIn('느림', str(perf.slow_requests()))
+
+            response = self.client.get(reverse('perf_slow_requests'))
+            self.assertEqual(response.status_code, 302)
+
+            self.user.is_staff = True
+            self.user.save()
+            response = self.client.get(reverse('perf_slow_requests'))
+        self.assertContains(response, 'GET /?_profile&amp;q')
+        self.assertNotContains(response, 'token')
+
+
+class ProfilingTest(TodoFixtureMixin, TestCase):
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir, ignore_errors=True)
+        override = override_settings(PROFILING_DIR=self.profile_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def names(self):
+        return [path.name for path in profiling.artifacts()]
+
+    def test_signed_token_profiles_request(self):
+        self.client.get(reverse('todo_list'), {'_profile': 'forged'})
+        self.assertEqual(self.names(), [])
+
+        response = self.client.get(reverse('todo_list'), {'_profile': profiling.make_token()})
+        self.assertEqual(response.status_code, 200)
+        [name] = self.names()
+        self.assertRegex(name, r'-todo_list-\d+ms\.prof$')
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0, PROFILING_PROFILER='sample', PROFILING_MAX_FILES=2)
+    def test_sampling_keeps_latest_artifacts(self):
+        for _ in range(3):
+            self.client.get(reverse('todo_list'))
+        names = self.names()
+        self.assertEqual(len(names), 2)
+        self.assertTrue(all(name.endswith('.collapsed') for name in names))
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0)
+    def test_staff_can_list_and_download(self):
+        self.client.get(reverse('todo_list'))
+        [name] = self.names()
+        list_url = reverse('perf_profiles')
+        self.assertEqual(self.client.get(list_url).status_code, 302)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.assertContains(self.client.get(list_url), name)
+        response = self.client.get(reverse('perf_profile_download', kwargs={'name': name}))
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="{name}"')
+        self.assertGreater(len(b''.join(response.streaming_content)), 0)
+        response = self.client.get(reverse('perf_profile_download', kwargs={'name': '..settings.py'}))
+        self.assertEqual(response.status_code, 404)
+
+
+class ProfileImportsTest(TestCase):
+    def test_parse_importtime(self):
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |     PIL._version\n'
+            'import time:       175 |        295 |   PIL\n'
+        )
+        self.assertEqual(profile_imports.parse_importtime(output), [('PIL._version', 120, 120, 2), ('PIL', 175, 295, 1)])
+
+    def test_worker_boot_does_not_import_bleach(self):
+        out = StringIO()
+        call_command('profile_imports', '--urls', '--repeat', '1', '--prefix', 'bleach', '--prefix', 'pygments', stdout=out)
+        self.assertIn('config.wsgi + urls:', out.getvalue())
+        self.assertNotIn('bleach', out.getvalue())
+        self.assertNotIn('pygments', out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command('profile_imports', '--repeat', '1', '--budget-ms', '0.001', stdout=StringIO())
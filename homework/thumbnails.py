@@ -0,0 +1,311 @@
+import math
+import os
+import tempfile
+from io import BytesIO
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.files import File
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from homework import caching
+
+# 썸네일 생성은 요청 안에서 하지 않고 ThumbnailJob 큐에 넣어 두었다가
+# `manage.py process_thumbnails` 워커가 프로세스 풀에서 처리합니다.
+# 너비별(RENDITION_WIDTHS) 로 AVIF/WebP 와 원본 계열 포맷(JPEG/PNG) 을 만들고
+# Todo.renditions 에 manifest 로 저장합니다.
+# 이 모듈은 models 에서 불리므로 PIL 은 실제로 이미지를 다루는 함수 안에서 import 합니다. (웹 워커 시작 시간)
+
+RENDITION_WIDTHS = (100, 300, 800)
+THUMBNAIL_WIDTH = 300
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.gif', '.png', '.webp', '.bmp', '.tif', '.tiff')
+MODERN_FORMATS = (
+    # (manifest key, PIL 포맷, 확장자, 저장 옵션)
+    ('avif', 'AVIF', '.avif', {'quality': 60, 'speed': 8}),
+    ('webp', 'WEBP', '.webp', {'quality': 80, 'method': 4}),
+)
+FALLBACK_FORMATS = {
+    'jpeg': ('JPEG', '.jpg', {'quality': 85, 'optimize': True, 'progressive': True}),
+    'png': ('PNG', '.png', {'optimize': True}),
+}
+CONTENT_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+}
+# 헤더 기준 원본 픽셀 수 / 실제로 디코딩할 픽셀 수 상한
+MAX_SOURCE_PIXELS = 100_000_000
+MAX_DECODED_PIXELS = 40_000_000
+MAX_ATTEMPTS = 3
+# 워커가 job 을 가져간 뒤 이 시간 안에 끝내지 못하면 죽은 것으로 보고 다시 대기열에 넣습니다.
+LEASE_TIMEOUT = timedelta(minutes=10)
+
+
+def is_supported(image_name):
+    return Path(image_name).suffix.lower() in SOURCE_EXTENSIONS
+
+
+def rendition_filename(image_name, width, extension):
+    return f'{Path(image_name).stem}_{width}w{extension}'
+
+
+def has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def rendition_widths(source_width):
+    # 원본보다 큰 너비는 만들지 않되, 원본이 아주 작으면 원본 너비 하나는 남깁니다.
+    widths = [width for width in RENDITION_WIDTHS if width <= source_width]
+    return widths or [source_width]
+
+
+def encode(image, file_type, options):
+    # 메모리에 결과를 모아두지 않고 임시 파일로 바로 인코딩합니다.
+    with tempfile.NamedTemporaryFile(prefix='rendition_', delete=False) as output:
+        image.save(output, file_type, **options)
+    return output.name
+
+
+def open_source(source):
+    # 로컬 저장소면 파일 경로, 아니면 원본 bytes 를 받습니다.
+    from PIL import Image
+
+    return Image.open(source if isinstance(source, str) else BytesIO(source))
+
+
+def prepare_image(image):
+    # EXIF 회전을 반영한 표시 크기를 기준으로 필요한 만큼만 디코딩합니다.
+    from PIL import ExifTags, ImageOps
+
+    if image.width * image.height > MAX_SOURCE_PIXELS:
+        raise ValueError(f'이미지가 너무 큽니다. ({image.width}x{image.height})')
+
+    orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+    display_width, display_height = (image.height, image.width) if orientation in (5, 6, 7, 8) else image.size
+    scale = min(max(RENDITION_WIDTHS), display_width) / display_width
+    if image.format == 'JPEG':
+        # JPEG 는 DCT 스케일링(1/2, 1/4, 1/8)으로 가장 큰 rendition 이상 크기까지만 디코딩
+        image.draft(image.mode, (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+
+    if image.width * image.height > MAX_DECODED_PIXELS:
+        raise ValueError(f'디코딩할 픽셀 수가 너무 많습니다. ({image.width}x{image.height})')
+
+    ImageOps.exif_transpose(image, in_place=True)
+    return image, [display_width, display_height]
+
+
+def render_renditions(source, image_name):
+    # 프로세스 풀에서 실행되므로 Django 모델에 의존하지 않습니다.
+    # 결과 파일은 임시 경로로 돌려주고, 저장소로 옮기는 일은 save_renditions 가 합니다.
+    from PIL import Image, features
+
+    with open_source(source) as image:
+        image, source_size = prepare_image(image)
+        alpha = has_alpha(image)
+        fallback = 'png' if alpha else 'jpeg'
+        mode = 'RGBA' if alpha else 'RGB'
+        if image.mode != mode:
+            image = image.convert(mode)
+
+        formats = [(key, file_type, extension, options)
+                   for key, file_type, extension, options in MODERN_FORMATS if features.check(key)]
+        formats.append((fallback, *FALLBACK_FORMATS[fallback]))
+
+        renditions = []
+        try:
+            for width in sorted(rendition_widths(source_size[0]), reverse=True):
+                height = max(1, round(source_size[1] * width / source_size[0]))
+                # 큰 너비부터 줄여 나가며 이전 결과를 다음 리사이즈의 원본으로 씁니다.
+                image = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+                for key, file_type, extension, options in formats:
+                    renditions.append((width, key, extension, encode(image, file_type, options)))
+        except Exception:
+            discard_renditions({'renditions': renditions})
+            raise
+
+    return {
+        'size': source_size,
+        'fallback': fallback,
+        'renditions': renditions,
+    }
+
+
+def discard_renditions(result):
+    for *_, path in result['renditions']:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def save_renditions(todo, image_name, result):
+    storage = todo.thumbnail.storage
+    sources = {}
+    widths = []
+    try:
+        for width, key, extension, path in sorted(result['renditions']):
+            name = todo.thumbnail.field.generate_filename(todo, rendition_filename(image_name, width, extension))
+            with open(path, 'rb') as rendition:
+                sources.setdefault(key, []).append(storage.save(name, File(rendition)))
+            if width not in widths:
+                widths.append(width)
+    finally:
+        discard_renditions(result)
+
+    manifest = {
+        'size': result['size'],
+        'widths': widths,
+        'fallback': result['fallback'],
+        'sources': sources,
+    }
+    return manifest
+
+
+def thumbnail_name(manifest):
+    # 기존 thumbnail 필드에는 THUMBNAIL_WIDTH 에 가장 가까운 fallback 이미지를 둡니다.
+    widths = manifest['widths']
+    index = min(range(len(widths)), key=lambda i: abs(widths[i] - THUMBNAIL_WIDTH))
+    return manifest['sources'][manifest['fallback']][index]
+
+
+def manifest_names(manifest):
+    return [name for names in (manifest or {}).get('sources', {}).values() for name in names]
+
+
+def delete_renditions(manifest, storage):
+    for name in manifest_names(manifest):
+        storage.delete(name)
+
+
+def requeue_expired_jobs():
+    # 처리 중에 워커가 죽은 job 은 PROCESSING 으로 남으므로, 임대가 끝난 job 을 다시 대기시킵니다.
+    # 가져갈 때 attempts 를 올렸으므로 MAX_ATTEMPTS 번 만료되면 실패로 끝냅니다.
+    from homework.models import ThumbnailJob
+
+    expired = ThumbnailJob.objects.filter(status=ThumbnailJob.PROCESSING, claimed_at__lt=timezone.now() - LEASE_TIMEOUT)
+    requeued = expired.filter(attempts__lt=MAX_ATTEMPTS).update(status=ThumbnailJob.PENDING, error='작업 시간 초과')
+    for job in expired.filter(attempts__gte=MAX_ATTEMPTS).select_related('todo'):
+        fail_job(job, '작업 시간 초과')
+    return requeued
+
+
+def claim_jobs(batch_size):
+    from homework.models import ThumbnailJob
+
+    requeue_expired_jobs()
+    pending_ids = ThumbnailJob.objects.filter(
+        status=ThumbnailJob.PENDING
+    ).order_by('created_at').values_list('pk', flat=True)[:batch_size]
+
+    claimed = []
+    for pk in pending_ids:
+        # 다른 워커가 먼저 가져간 job 은 update 결과가 0 이므로 건너뜁니다.
+        updated = ThumbnailJob.objects.filter(pk=pk, status=ThumbnailJob.PENDING).update(
+            status=ThumbnailJob.PROCESSING, attempts=F('attempts') + 1, claimed_at=timezone.now(),
+        )
+        if updated:
+            claimed.append(pk)
+    return list(ThumbnailJob.objects.filter(pk__in=claimed).select_related('todo'))
+
+
+def read_source(job):
+    # 로컬 파일이면 경로만 넘겨 워커 프로세스가 필요한 부분만 읽게 합니다.
+    todo = job.todo
+    if todo.completed_image.name != job.image_name:
+        return None
+    try:
+        return todo.completed_image.path
+    except NotImplementedError:
+        with todo.completed_image.open('rb') as image_file:
+            return image_file.read()
+
+
+def is_current(job):
+    from homework.models import Todo
+
+    return Todo.objects.filter(pk=job.todo_id, completed_image=job.image_name).exists()
+
+
+def retain(storage, name):
+    # 참조 수를 세는 저장소(ContentAddressedStorage)에서만 의미가 있습니다.
+    if hasattr(storage, 'retain'):
+        storage.retain(name)
+
+
+def attach_manifest(job, manifest):
+    from homework.models import ThumbnailJob, Todo
+
+    storage = job.todo.thumbnail.storage
+    thumbnail = thumbnail_name(manifest)
+    # thumbnail 필드도 rendition 파일 하나를 참조하므로 참조 수를 하나 더 올립니다.
+    retain(storage, thumbnail)
+    with transaction.atomic():
+        updated = Todo.objects.filter(pk=job.todo_id, completed_image=job.image_name).update(
+            renditions=manifest, thumbnail=thumbnail, thumbnail_status=Todo.THUMBNAIL_READY,
+            # update() 는 auto_now 를 채우지 않으므로 상세 화면의 ETag 가 바뀌도록 직접 넣습니다.
+            updated_at=timezone.now(),
+        )
+        ThumbnailJob.objects.filter(pk=job.pk).update(status=ThumbnailJob.DONE, error='')
+    if not updated:
+        delete_renditions(manifest, storage)
+        storage.delete(thumbnail)
+        return
+    # update() 는 signal 을 보내지 않으므로 목록 캐시를 직접 무효화합니다.
+    caching.invalidate_todo_owner(job.todo.user_id)
+
+
+def find_reusable_manifest(job):
+    # 같은 내용의 이미지(=같은 이름)로 이미 만들어 둔 rendition 이 있으면 찾습니다.
+    from homework.models import Todo
+
+    if not hasattr(job.todo.thumbnail.storage, 'retain'):
+        return None
+    return Todo.objects.filter(
+        completed_image=job.image_name, thumbnail_status=Todo.THUMBNAIL_READY,
+    ).exclude(pk=job.todo_id).exclude(renditions={}).values_list('renditions', flat=True).first()
+
+
+def reuse_renditions(job, manifest):
+    storage = job.todo.thumbnail.storage
+    names = manifest_names(manifest)
+    for name in names:
+        storage.retain(name)
+    if not all(storage.exists(name) for name in names):
+        # 그 사이 원래 todo 가 지워졌다면 새로 생성합니다.
+        delete_renditions(manifest, storage)
+        return False
+    if not is_current(job):
+        delete_renditions(manifest, storage)
+        complete_job(job, None)
+        return True
+    attach_manifest(job, manifest)
+    return True
+
+
+def complete_job(job, result):
+    from homework.models import ThumbnailJob
+
+    # 처리 중에 이미지가 바뀌었다면 새 job 이 따로 있으므로 결과를 버립니다.
+    if result is None or not is_current(job):
+        if result is not None:
+            discard_renditions(result)
+        ThumbnailJob.objects.filter(pk=job.pk).update(status=ThumbnailJob.DONE)
+        return
+
+    attach_manifest(job, save_renditions(job.todo, job.image_name, result))
+
+
+def fail_job(job, error):
+    from homework.models import ThumbnailJob, Todo
+
+    if job.attempts < MAX_ATTEMPTS:
+        ThumbnailJob.objects.filter(pk=job.pk).update(status=ThumbnailJob.PENDING, error=str(error))
+        return
+    ThumbnailJob.objects.filter(pk=job.pk).update(status=ThumbnailJob.FAILED, error=str(error))
+    if Todo.objects.filter(pk=job.todo_id, completed_image=job.image_name).update(
+        thumbnail_status=Todo.THUMBNAIL_FAILED, updated_at=timezone.now(),
+    ):
+        caching.invalidate_todo_owner(job.todo.user_id)
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from homework import cb_views
+from homework import api, async_views, cb_views
 from homework.cb_views import CommentCreateView, CommentDeleteView, CommentUpdateView
 
 urlpatterns = [
@@ -11,5 +11,12 @@ urlpatterns = [
     path('<int:pk>/delete/',cb_views.TodoDeleteView.as_view(), name='todo_delete'),
     path('comment/<int:pk>/create/', CommentCreateView.as_view(), name='comment_create'),
     path('comment/<int:pk>/delete/', CommentDeleteView.as_view(), name='comment_delete'),
-    path('comment/<int:pk>/update/', CommentUpdateView.as_view(), name='comment_update')
+    path('comment/<int:pk>/update/', CommentUpdateView.as_view(), name='comment_update'),
+    path('<int:pk>/comments/stream/', async_views.comment_stream, name='comment_stream'),
+    path('api/todos/bulk/', api.todo_bulk, name='todo_bulk'),
+    path('api/todos/export/', api.todo_export, name='todo_export'),
+    # ASGI 배포용 async 뷰
+    path('async/', async_views.todo_list, name='async_todo_list'),
+    path('async/<int:pk>/', async_views.todo_info, name='async_todo_info'),
+    path('async/comment/<int:pk>/create/', async_views.comment_create, name='async_comment_create'),
 ]
\ No newline at end of file
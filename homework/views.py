@@ -2,29 +2,37 @@ from datetime import timezone
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
-from django.core.paginator import Paginator
-from django.db.models import Q
+from django.core.paginator import Page, Paginator
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import Http404
 from django.views.decorators.http import require_http_methods
-from pygments.lexers import q
 
+from homework import caching
 from homework.forms import TodoForm, TodoUpdateForm
 from homework.models import Todo
+from homework.search import search_todos
 from django.urls import reverse
 
 
 # Create your views here.
 def todo_list(request):
-    todo_list = Todo.objects.filter(user=request.user).order_by('-created_at')
+    todo_list = Todo.objects.filter(user=request.user).select_related('user').order_by('-created_at')
     q = request.GET.get('q')
 
     if q:		    # 만약 쿼리파라미터가 존재하면 todo_list에서 해당 쿼리파라미터로 filter를 걸어 조건에 맞는 Todo객체만 가져옵니다.
-        todo_list = todo_list.filter(Q(title__icontains=q) | Q(description__icontains=q))
+        todo_list = search_todos(todo_list, q)
 
     paginator = Paginator(todo_list, 10) # Paginator 객체를 인스턴스화 합니다.
     page_number = request.GET.get('page') # GET 요청으로부터 page에 담긴 쿼리 파라미터 값을 가져옴
-    page_object = paginator.get_page(page_number) # 가져온 페이지 숫자를 이용해서 페이지에 대한 오브젝트를 가져옵니다.
+    key = caching.page_key(caching.user_scope(request.user.pk), 'offset', page_number, q) # 사용자별 버전이 들어간 캐시 키
+    cached = caching.get_page(key)
+    if cached is not None:
+        paginator.count = cached['count']
+        page_object = Page(cached['object_list'], cached['number'], paginator)
+    else:
+        page_object = paginator.get_page(page_number) # 가져온 페이지 숫자를 이용해서 페이지에 대한 오브젝트를 가져옵니다.
+        page_object.object_list = list(page_object.object_list)
+        caching.set_page(key, {'number': page_object.number, 'count': paginator.count, 'object_list': page_object.object_list})
     context = {
         'object_list': page_object.object_list,
         'page_obj': page_object
@@ -1,3 +1,13 @@
 from django.contrib import admin
 
+from users.models import EmailOutbox
+
+
 # Register your models here.
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    ordering = ('-created_at',)
+    readonly_fields = ('attempts', 'sent_at', 'last_error')
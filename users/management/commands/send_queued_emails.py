@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users import outbox
+
+
+class Command(BaseCommand):
+    help = '메일 발송 대기열(EmailOutbox)을 배치 단위로 발송합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--sleep', type=float, default=5.0, help='보낼 메일이 없을 때 쉬는 시간(초)')
+        parser.add_argument('--once', action='store_true', help='지금 보낼 수 있는 메일을 모두 보내면 종료')
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                claimed, sent = outbox.send_batch(options['batch_size'])
+                if claimed:
+                    self.stdout.write(f'{claimed}건 중 {sent}건 발송')
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
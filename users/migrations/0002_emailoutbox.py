@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:21
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('subject', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('from_email', models.CharField(blank=True, max_length=255)),
+                ('to_email', models.JSONField(default=list)),
+                ('status', models.CharField(choices=[('pending', '대기'), ('sending', '전송중'), ('sent', '전송완료'), ('failed', '전송실패')], default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name': '메일 발송 대기열',
+                'verbose_name_plural': '메일 발송 대기열',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='users_outbox_status_next_idx')],
+            },
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.contrib.auth.base_user import BaseUserManager, AbstractBaseUser
 from django.contrib.auth.models import  PermissionsMixin
 from django.db import models
+from django.utils import timezone
+
+from utils.models import TimestampModel
 
 
 class UserManager(BaseUserManager):
@@ -40,3 +43,36 @@ class User(AbstractBaseUser,PermissionsMixin):
     def username(self):
         return self.name
 
+
+class EmailOutbox(TimestampModel):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, '대기'),
+        (SENDING, '전송중'),
+        (SENT, '전송완료'),
+        (FAILED, '전송실패'),
+    )
+
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    from_email = models.CharField(max_length=255, blank=True)
+    to_email = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)  # 워커가 가져간 시각 (임대 만료 판단)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f'{self.subject} -> {", ".join(self.to_email)} ({self.status})'
+
+    class Meta:
+        verbose_name = '메일 발송 대기열'
+        verbose_name_plural = '메일 발송 대기열'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='users_outbox_status_next_idx'),
+        ]
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMessage
+from django.db.models import F
+from django.utils import timezone
+
+from users.models import EmailOutbox
+from utils.email import send_bulk_email
+
+# EmailOutbox 에 쌓인 메일을 배치 단위로 하나의 SMTP 연결로 보냅니다.
+# 실패한 메일은 지수 백오프(RETRY_BASE_SECONDS * 2^(시도횟수-1))로 다시 시도합니다.
+# 보내는 도중 워커가 죽으면 SENDING 으로 남으므로, LEASE_TIMEOUT 이 지난 메일은 다시 대기시킵니다.
+# (SMTP 서버가 받은 뒤 mark_sent 전에 죽었다면 한 번 더 갈 수 있습니다)
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 60 * 60
+LEASE_TIMEOUT = timedelta(minutes=10)
+
+
+def requeue_expired():
+    expired = EmailOutbox.objects.filter(status=EmailOutbox.SENDING, claimed_at__lt=timezone.now() - LEASE_TIMEOUT)
+    expired.filter(attempts__gte=MAX_ATTEMPTS).update(status=EmailOutbox.FAILED, last_error='전송 시간 초과')
+    return expired.update(status=EmailOutbox.PENDING, next_attempt_at=timezone.now(), last_error='전송 시간 초과')
+
+
+def claim_batch(batch_size):
+    requeue_expired()
+    pending_ids = EmailOutbox.objects.filter(
+        status=EmailOutbox.PENDING, next_attempt_at__lte=timezone.now(),
+    ).order_by('next_attempt_at').values_list('pk', flat=True)[:batch_size]
+
+    claimed = []
+    for pk in pending_ids:
+        updated = EmailOutbox.objects.filter(pk=pk, status=EmailOutbox.PENDING).update(
+            status=EmailOutbox.SENDING, attempts=F('attempts') + 1, claimed_at=timezone.now(),
+        )
+        if updated:
+            claimed.append(pk)
+    return list(EmailOutbox.objects.filter(pk__in=claimed).order_by('next_attempt_at'))
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def retry_window():
+    # 처음 대기열에 들어간 뒤 마지막 시도까지 걸릴 수 있는 최대 시간 (메일 안 링크의 유효 시간은 이보다 길어야 합니다)
+    return sum((retry_delay(attempts) + LEASE_TIMEOUT for attempts in range(1, MAX_ATTEMPTS)), LEASE_TIMEOUT)
+
+
+def mark_sent(item):
+    EmailOutbox.objects.filter(pk=item.pk).update(status=EmailOutbox.SENT, sent_at=timezone.now(), last_error='')
+
+
+def mark_failed(item, error):
+    if item.attempts >= MAX_ATTEMPTS:
+        EmailOutbox.objects.filter(pk=item.pk).update(status=EmailOutbox.FAILED, last_error=str(error))
+        return
+    EmailOutbox.objects.filter(pk=item.pk).update(
+        status=EmailOutbox.PENDING,
+        next_attempt_at=timezone.now() + retry_delay(item.attempts),
+        last_error=str(error),
+    )
+
+
+def send_batch(batch_size=100):
+    items = claim_batch(batch_size)
+    if not items:
+        return 0, 0
+
+    messages = (
+        EmailMessage(item.subject, item.message, item.from_email or None, item.to_email)
+        for item in items
+    )
+    try:
+        result = send_bulk_email(messages, chunk_size=batch_size)
+    except Exception as e:
+        # 연결 자체를 열지 못한 경우
+        for item in items:
+            mark_failed(item, e)
+        return len(items), 0
+
+    failures = {index: error for index, _, error in result.failures}
+    for index, item in enumerate(items):
+        if index in failures:
+            mark_failed(item, failures[index])
+        else:
+            mark_sent(item)
+    return len(items), result.sent
@@ -1,3 +1,115 @@
+import unittest
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.conf import settings
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from users import outbox
+from users.models import EmailOutbox
+from utils import perf
+from utils.email import send_bulk_email
+
+User = get_user_model()
+
+
+def setUpModule():
+    # 요청마다 남는 성능 로그가 테스트 출력에 섞이지 않게 합니다.
+    unittest.enterModuleContext(perf.request_log_silenced())
+
+
+class SignupOutboxTest(TestCase):
+    def signup(self, email='new@example.com'):
+        return self.client.post(reverse('signup'), {
+            'name': '신규',
+            'email': email,
+            'password1': 'a-very-long-password-1234',
+            'password2': 'a-very-long-password-1234',
+        }, HTTP_HOST='testserver')
+
+    def test_signup_queues_mail_without_sending(self):
+        response = self.signup()
+        self.assertTemplateUsed(response, 'registration/signup_done.html')
+        self.assertEqual(len(mail.outbox), 0)
+
+        item = EmailOutbox.objects.get()
+        self.assertEqual(item.to_email, ['new@example.com'])
+        self.assertIn('/verify/?code=', item.message)
+
+    def test_worker_sends_queued_mail(self):
+        self.signup('a@example.com')
+        self.signup('b@example.com')
+        call_command('send_queued_emails', once=True, stdout=StringIO())
+
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['a@example.com', 'b@example.com'])
+        self.assertFalse(EmailOutbox.objects.exclude(status=EmailOutbox.SENT).exists())
+
+    def test_failed_mail_is_retried_with_backoff(self):
+        self.signup()
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('smtp down')):
+            call_command('send_queued_emails', once=True, stdout=StringIO())
+
+        item = EmailOutbox.objects.get()
+        self.assertEqual(item.status, EmailOutbox.PENDING)
+        self.assertEqual(item.attempts, 1)
+        self.assertGreater(item.next_attempt_at, timezone.now())
+        self.assertEqual(item.last_error, 'smtp down')
+
+        # 재시도 시각 전에는 다시 보내지 않습니다.
+        call_command('send_queued_emails', once=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+
+        EmailOutbox.objects.update(next_attempt_at=timezone.now())
+        call_command('send_queued_emails', once=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(EmailOutbox.objects.get().status, EmailOutbox.SENT)
+
+    def test_expired_sending_mail_is_reclaimed(self):
+        # 워커가 보내는 도중 죽어서 SENDING 으로 남은 메일
+        self.signup()
+        expired = timezone.now() - outbox.LEASE_TIMEOUT - timedelta(seconds=1)
+        EmailOutbox.objects.update(status=EmailOutbox.SENDING, attempts=1, claimed_at=expired)
+
+        call_command('send_queued_emails', once=True, stdout=StringIO())
+        item = EmailOutbox.objects.get()
+        self.assertEqual((item.status, item.attempts), (EmailOutbox.SENT, 2))
+        self.assertEqual(len(mail.outbox), 1)
+
+        EmailOutbox.objects.update(status=EmailOutbox.SENDING, attempts=outbox.MAX_ATTEMPTS, claimed_at=expired)
+        outbox.claim_batch(10)
+        self.assertEqual(EmailOutbox.objects.get().status, EmailOutbox.FAILED)
+
+    def test_verification_link_outlives_retries(self):
+        self.assertGreater(timedelta(seconds=settings.EMAIL_VERIFICATION_MAX_AGE), outbox.retry_window())
+
+
+class BulkEmailTest(TestCase):
+    def test_generator_is_sent_in_chunks_over_one_connection(self):
+        messages = (('알림', f'{i}번째 알림', None, f'user{i}@example.com') for i in range(25))
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open') as open_connection:
+            result = send_bulk_email(messages, chunk_size=10)
+
+        open_connection.assert_called_once()
+        self.assertEqual(result.sent, 25)
+        self.assertEqual(result.chunks, 3)
+        self.assertEqual(len(mail.outbox), 25)
+        self.assertGreater(result.messages_per_second, 0)
+
+    def test_failures_do_not_abort_batch(self):
+        messages = [
+            EmailMessage('알림', '본문', None, ['a@example.com']),
+            EmailMessage('알림', '본문', None, []),
+            EmailMessage('알림', '본문', None, ['c@example.com']),
+        ]
+        result = send_bulk_email(messages)
 
-# Create your tests here.
+        self.assertEqual(result.sent, 2)
+        self.assertEqual([index for index, _, _ in result.failures], [1])
+        self.assertEqual([message.to for message in mail.outbox], [['a@example.com'], ['c@example.com']])
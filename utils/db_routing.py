@@ -0,0 +1,108 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http.request import HttpRequest
+
+# 읽기 전용 복제본(replica) 라우팅
+# 목록/상세/검색처럼 ReplicaReadMixin 을 붙인 뷰의 GET 조회만 settings.DATABASE_REPLICAS 로 보내고,
+# 쓰기와 그 외의 조회는 모두 default(primary) 로 보냅니다.
+# 사용자가 쓰기 요청을 하면 REPLICA_PIN_SECONDS 동안 쿠키로 primary 에 고정해서
+# 복제 지연이 있어도 자기가 쓴 내용은 바로 보이게 합니다.
+
+PRIMARY = 'default'
+PIN_COOKIE = 'db_pin'
+PIN_SALT = 'utils.db_routing.pin'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads():
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def reading_from_replica():
+    return bool(replica_aliases()) and _replica_reads.get()
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if replicas and _replica_reads.get():
+            return random.choice(replicas)
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # 복제본의 스키마는 primary 에서 복제되어 오므로 직접 마이그레이션하지 않습니다.
+        if db in replica_aliases():
+            return False
+        return None
+
+
+def is_pinned(request: HttpRequest):
+    return request.get_signed_cookie(
+        PIN_COOKIE, default=None, salt=PIN_SALT, max_age=settings.REPLICA_PIN_SECONDS,
+    ) is not None
+
+
+class ReplicaPinMiddleware:
+    # ASGI 에서 async 뷰 앞에 동기 미들웨어가 있으면 요청마다 스레드를 쓰게 되므로 양쪽 모두 지원합니다.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.process_request(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        self.process_request(request)
+        return self.process_response(request, await self.get_response(request))
+
+    def process_request(self, request):
+        request.db_pinned = request.method not in ('GET', 'HEAD', 'OPTIONS') or is_pinned(request)
+
+    def process_response(self, request, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            response.set_signed_cookie(
+                PIN_COOKIE, '1', salt=PIN_SALT, max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class ReplicaReadMixin:
+    # 템플릿 렌더링 중의 지연 조회(페이지 객체 등)도 replica 로 가도록 응답을 여기서 렌더링합니다.
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or getattr(request, 'db_pinned', False) or not replica_aliases():
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        return response
@@ -1,6 +1,91 @@
-from django.core.mail import send_mail
+import time
+from itertools import islice
+from smtplib import SMTPServerDisconnected
+
+from django.apps import apps
+from django.core.mail import EmailMessage, get_connection, send_mail
 
 
 def send_email(subject, message, from_email, to_email):
     to_email = to_email if isinstance(to_email, list) else [to_email,]
-    send_mail(subject, message, from_email, to_email)
\ No newline at end of file
+    send_mail(subject, message, from_email, to_email)
+
+
+def queue_email(subject, message, from_email, to_email):
+    # 바로 보내지 않고 EmailOutbox 에 저장합니다. 호출하는 쪽의 트랜잭션에 함께 묶이며,
+    # 실제 발송은 `manage.py send_queued_emails` 워커가 합니다.
+    to_email = to_email if isinstance(to_email, list) else [to_email,]
+    EmailOutbox = apps.get_model('users', 'EmailOutbox')
+    return EmailOutbox.objects.create(subject=subject, message=message, from_email=from_email or '', to_email=to_email)
+
+
+class BulkEmailResult:
+    def __init__(self):
+        self.sent = 0
+        self.failures = []  # (순번, 메시지, 예외)
+        self.chunks = 0
+        self.reconnects = 0
+        self.started_at = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def failed(self):
+        return len(self.failures)
+
+    @property
+    def total(self):
+        return self.sent + self.failed
+
+    @property
+    def messages_per_second(self):
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return (f'<BulkEmailResult sent={self.sent} failed={self.failed} chunks={self.chunks} '
+                f'elapsed={self.elapsed:.2f}s rate={self.messages_per_second:.1f}/s>')
+
+
+def to_email_message(message, connection):
+    # EmailMessage 또는 send_email 과 같은 (subject, message, from_email, to_email) 튜플을 받습니다.
+    if isinstance(message, EmailMessage):
+        message.connection = connection
+        return message
+    subject, body, from_email, to_email = message
+    to_email = to_email if isinstance(to_email, list) else [to_email,]
+    return EmailMessage(subject, body, from_email, to_email, connection=connection)
+
+
+def send_bulk_email(messages, chunk_size=100, connection=None):
+    # 많은 메일을 하나의 연결로 chunk_size 개씩 나눠 보냅니다.
+    # 개별 메일이 실패해도 나머지는 계속 보내고, 실패 목록과 처리량을 BulkEmailResult 로 돌려줍니다.
+    result = BulkEmailResult()
+    connection = connection or get_connection()
+    messages = iter(messages)
+    index = 0
+
+    connection.open()
+    try:
+        while chunk := list(islice(messages, chunk_size)):
+            result.chunks += 1
+            for message in chunk:
+                try:
+                    message = to_email_message(message, connection)
+                    if not message.recipients():
+                        raise ValueError('보낼 수신자가 없습니다.')
+                    try:
+                        connection.send_messages([message])
+                    except SMTPServerDisconnected:
+                        # 서버가 연결을 끊었으면 한 번 다시 연결해서 보냅니다.
+                        connection.close()
+                        connection.open()
+                        result.reconnects += 1
+                        connection.send_messages([message])
+                except Exception as e:
+                    result.failures.append((index, message, e))
+                else:
+                    result.sent += 1
+                index += 1
+    finally:
+        connection.close()
+        result.elapsed = time.perf_counter() - result.started_at
+    return result
@@ -0,0 +1,39 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+# async 뷰에서 블로킹 작업(템플릿 렌더링, 동기 ORM, 이미지 처리, SMTP 등)을 돌리는 스레드 풀
+# asgiref 의 sync_to_async(thread_sensitive=True) 는 모든 호출을 한 스레드로 모으기 때문에
+# 오래 걸리는 작업은 크기가 정해진 별도 풀로 보내서 이벤트 루프와 다른 요청이 막히지 않게 합니다.
+# 풀 크기는 settings.ASYNC_BLOCKING_WORKERS 로 정하고, 풀이 가득 차면 작업은 큐에서 기다립니다.
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'ASYNC_BLOCKING_WORKERS', 8), thread_name_prefix='blocking',
+        )
+    return _executor
+
+
+def _call(func, *args, **kwargs):
+    # 풀 스레드는 요청 단위로 정리되지 않으므로, 요청 처리와 같이 앞뒤로 오래된 연결을 정리합니다.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_blocking(func, *args, **kwargs):
+    # contextvars(예: replica_reads) 를 그대로 넘겨서 풀 스레드에서도 같은 라우팅을 쓰게 합니다.
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, _call, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), call)
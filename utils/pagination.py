@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from django.core import signing
+from django.db.models import Q
+
+# offset Paginator 는 COUNT(*) + OFFSET N 이라 뒤 페이지로 갈수록 느려지므로,
+# (created_at, id) 를 키로 다음/이전 행을 바로 찾아가는 커서 방식 페이지네이션을 제공합니다.
+
+CURSOR_SALT = 'utils.pagination.cursor'
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    # 최신순(-created_at, -id) 정렬만 지원합니다.
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+
+    def encode_cursor(self, obj, direction):
+        return signing.dumps([obj.created_at.isoformat(), obj.pk, direction], salt=CURSOR_SALT, compress=True)
+
+    def decode_cursor(self, cursor):
+        try:
+            created_at, pk, direction = signing.loads(cursor, salt=CURSOR_SALT)
+            return datetime.fromisoformat(created_at), int(pk), direction
+        except (signing.BadSignature, TypeError, ValueError):
+            return None
+
+    def get_page(self, cursor=None):
+        position = self.decode_cursor(cursor) if cursor else None
+        if position is None:
+            return self._forward_page(self.queryset, has_previous=False)
+
+        created_at, pk, direction = position
+        if direction == PREVIOUS:
+            return self._backward_page(created_at, pk)
+
+        queryset = self.queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+        return self._forward_page(queryset, has_previous=True)
+
+    def _forward_page(self, queryset, has_previous):
+        rows = list(queryset.order_by('-created_at', '-pk')[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return self._build_page(rows, has_next, has_previous)
+
+    def _backward_page(self, created_at, pk):
+        queryset = self.queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+        rows = list(queryset.order_by('created_at', 'pk')[:self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+        return self._build_page(rows, has_next=True, has_previous=has_previous)
+
+    def _build_page(self, rows, has_next, has_previous):
+        if not rows:
+            return CursorPage(rows)
+        return CursorPage(
+            rows,
+            next_cursor=self.encode_cursor(rows[-1], NEXT) if has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], PREVIOUS) if has_previous else None,
+        )
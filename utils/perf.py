@@ -0,0 +1,202 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.shortcuts import render
+from django.utils import timezone
+
+# 요청 단위 성능 계측
+# PerformanceMiddleware 가 요청마다 RequestMetrics 를 ContextVar 에 넣어 두면, 각 코드 경로가 여기에 기록합니다.
+#   db       : 모든 DB 연결에 붙인 execute_wrapper (apps.py 에서 connection_created 로 연결)
+#   template : TemplateResponse 렌더링 (process_template_response ~ post_render 콜백), async 뷰의 span('template')
+#   cache    : homework.caching.get_page 의 적중/실패
+#   image    : 업로드 이미지 저장(해시 계산, 파일 쓰기) span('image')
+# 결과는 Server-Timing 헤더와 구조화된 로그(JSON 한 줄)로 내보내고,
+# PERF_SLOW_REQUEST_MS 보다 느린 요청은 프로세스마다 있는 링 버퍼에 남겨 관리자 화면에서 볼 수 있게 합니다.
+
+logger = logging.getLogger(__name__)
+
+_metrics = ContextVar('request_metrics', default=None)
+_slow_requests = deque(maxlen=getattr(settings, 'PERF_SLOW_REQUEST_BUFFER', 100))
+_slow_requests_lock = threading.Lock()
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_count = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.image_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._template_started = None
+
+    def as_dict(self):
+        return {
+            'db_count': self.db_count,
+            'db_ms': round(self.db_ms, 2),
+            'template_ms': round(self.template_ms, 2),
+            'image_ms': round(self.image_ms, 2),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+
+@contextmanager
+def request_log_silenced():
+    # 테스트나 벤치마크처럼 요청을 많이 보내는 곳에서 요청 로그가 출력에 섞이지 않게 합니다.
+    # 핸들러만 바꾸므로 assertLogs 로 로그를 확인하는 것은 그대로 됩니다.
+    handlers = logger.handlers
+    logger.handlers = [logging.NullHandler()]
+    try:
+        yield
+    finally:
+        logger.handlers = handlers
+
+
+def current():
+    return _metrics.get()
+
+
+def count_cache(hit):
+    metrics = current()
+    if metrics is not None:
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+
+@contextmanager
+def span(name):
+    # name 은 'template' 또는 'image'
+    metrics = current()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            attribute = f'{name}_ms'
+            setattr(metrics, attribute, getattr(metrics, attribute) + (time.perf_counter() - started) * 1000)
+
+
+def db_wrapper(execute, sql, params, many, context):
+    metrics = current()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_count += 1
+        metrics.db_ms += (time.perf_counter() - started) * 1000
+
+
+def instrument_connection(sender, connection, **kwargs):
+    # 연결이 다시 만들어질 때마다 불리므로 한 번만 붙입니다.
+    if db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_wrapper)
+
+
+def server_timing(metrics, total_ms):
+    parts = [
+        f'db;dur={metrics.db_ms:.1f};desc="{metrics.db_count} queries"',
+        f'tpl;dur={metrics.template_ms:.1f}',
+        f'cache;desc="{metrics.cache_hits} hit {metrics.cache_misses} miss"',
+    ]
+    if metrics.image_ms:
+        parts.append(f'img;dur={metrics.image_ms:.1f}')
+    parts.append(f'total;dur={total_ms:.1f}')
+    return ', '.join(parts)
+
+
+def slow_requests():
+    with _slow_requests_lock:
+        return list(reversed(_slow_requests))
+
+
+def clear_slow_requests():
+    with _slow_requests_lock:
+        _slow_requests.clear()
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _metrics.set(RequestMetrics())
+        try:
+            response = self.get_response(request)
+            return self.finish(request, response)
+        finally:
+            _metrics.reset(token)
+
+    async def __acall__(self, request):
+        token = _metrics.set(RequestMetrics())
+        try:
+            response = await self.get_response(request)
+            return self.finish(request, response)
+        finally:
+            _metrics.reset(token)
+
+    def process_template_response(self, request, response):
+        metrics = current()
+        if metrics is not None and not response.is_rendered:
+            metrics._template_started = time.perf_counter()
+            response.add_post_render_callback(self.template_rendered)
+        return response
+
+    def template_rendered(self, response):
+        metrics = current()
+        if metrics is not None and metrics._template_started is not None:
+            metrics.template_ms += (time.perf_counter() - metrics._template_started) * 1000
+            metrics._template_started = None
+
+    def finish(self, request, response):
+        metrics = current()
+        total_ms = (time.perf_counter() - metrics.started) * 1000
+        if getattr(settings, 'PERF_SERVER_TIMING', False):
+            response['Server-Timing'] = server_timing(metrics, total_ms)
+
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            **metrics.as_dict(),
+        }
+        slow = total_ms >= getattr(settings, 'PERF_SLOW_REQUEST_MS', 500)
+        logger.log(logging.WARNING if slow else logging.INFO, json.dumps(record, ensure_ascii=False))
+        if slow and random.random() < getattr(settings, 'PERF_SLOW_REQUEST_SAMPLE_RATE', 1.0):
+            with _slow_requests_lock:
+                # 쿼리 문자열에는 프로파일링 토큰(_profile)이나 사용자가 입력한 검색어가 들어 있으므로 이름만 남깁니다.
+                _slow_requests.append({'at': timezone.now(), 'params': sorted(request.GET), **record})
+        return response
+
+
+@staff_member_required
+def slow_requests_view(request):
+    return render(request, 'admin/slow_requests.html', {
+        'title': '느린 요청',
+        'requests': slow_requests(),
+        'threshold_ms': getattr(settings, 'PERF_SLOW_REQUEST_MS', 500),
+    })
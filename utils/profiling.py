@@ -0,0 +1,207 @@
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core import signing
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from django.utils import timezone
+
+# 요청 단위 프로파일링 (운영 중에 특정 화면이 느려졌을 때 재배포 없이 원인 찾기)
+# 다음 중 하나일 때만 요청을 프로파일러 아래에서 실행하고 결과 파일을 PROFILING_DIR 에 남깁니다.
+#   - ?_profile=<토큰> : 관리자 화면(/admin/perf/profiles/)에서 만든 서명된 토큰, PROFILING_TOKEN_MAX_AGE 초 동안 유효
+#   - PROFILING_SAMPLE_RATE 확률로 뽑힌 요청 (기본 0 이라 꺼져 있음)
+# 프로파일러
+#   cprofile : 동기 요청을 cProfile 로 실행하고 pstats 파일(.prof)로 저장 (snakeviz, python -m pstats 로 열기)
+#   sample   : 별도 스레드가 PROFILING_SAMPLE_INTERVAL 마다 스택을 찍어 collapsed stack(.collapsed)으로 저장
+#              (flamegraph.pl, speedscope 로 열기). 오버헤드가 작아 운영에서 쓰기 좋습니다.
+# async(ASGI) 요청은 뷰가 어느 스레드에서 돌지 알 수 없어 항상 sample 로, 모든 스레드의 스택을 찍습니다.
+# 프로세스마다 한 번에 한 요청만 프로파일링하고, 파일은 최신 PROFILING_MAX_FILES 개만 남깁니다.
+
+QUERY_PARAMETER = '_profile'
+TOKEN_SALT = 'utils.profiling'
+ARTIFACT_SUFFIXES = ('.prof', '.collapsed')
+ARTIFACT_NAME = re.compile(r'^[\w.-]+$')
+
+_running = threading.Lock()
+
+
+def profile_dir():
+    return Path(getattr(settings, 'PROFILING_DIR', settings.BASE_DIR / 'profiles'))
+
+
+def make_token():
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def valid_token(token):
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 600))
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def should_profile(request):
+    token = request.GET.get(QUERY_PARAMETER)
+    if token is not None:
+        return valid_token(token)
+    return random.random() < getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+
+
+class Sampler:
+    # thread_ids 가 None 이면 자기 자신을 뺀 모든 스레드의 스택을 찍습니다.
+    def __init__(self, thread_ids=None, interval=None):
+        self.thread_ids = thread_ids
+        self.interval = interval or getattr(settings, 'PROFILING_SAMPLE_INTERVAL', 0.005)
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self.run, name='profiling-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                self.stacks[self.collapse(frame)] += 1
+
+    def collapse(self, frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f'{stack} {count}\n')
+
+
+def artifact_path(request, elapsed_ms, suffix):
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    match = getattr(request, 'resolver_match', None)
+    label = match.view_name if match and match.view_name else request.path
+    label = re.sub(r'[^\w-]+', '-', label).strip('-') or 'root'
+    stamp = timezone.now().strftime('%Y%m%d-%H%M%S-%f')
+    return directory / f'{stamp}-{label}-{elapsed_ms:.0f}ms{suffix}'
+
+
+def artifacts():
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    files = [path for path in directory.iterdir() if path.is_file() and path.suffix in ARTIFACT_SUFFIXES]
+    return sorted(files, key=lambda path: path.stat().st_mtime, reverse=True)
+
+
+def prune():
+    for path in artifacts()[getattr(settings, 'PROFILING_MAX_FILES', 50):]:
+        path.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not should_profile(request) or not _running.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return self.profile(request)
+        finally:
+            _running.release()
+
+    async def __acall__(self, request):
+        if not should_profile(request) or not _running.acquire(blocking=False):
+            return await self.get_response(request)
+        try:
+            sampler = Sampler()
+            started = time.perf_counter()
+            sampler.start()
+            try:
+                response = await self.get_response(request)
+            finally:
+                sampler.stop()
+            self.save(request, started, sampler.dump, '.collapsed')
+            return response
+        finally:
+            _running.release()
+
+    def profile(self, request):
+        started = time.perf_counter()
+        if getattr(settings, 'PROFILING_PROFILER', 'cprofile') == 'sample':
+            profiler = Sampler(thread_ids={threading.get_ident()})
+            profiler.start()
+            try:
+                response = self.render(request)
+            finally:
+                profiler.stop()
+            self.save(request, started, profiler.dump, '.collapsed')
+        else:
+            profiler = cProfile.Profile()
+            response = profiler.runcall(self.render, request)
+            self.save(request, started, profiler.dump_stats, '.prof')
+        return response
+
+    def render(self, request):
+        # TemplateResponse 렌더링까지 프로파일에 들어가도록 여기서 렌더링합니다.
+        response = self.get_response(request)
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+        return response
+
+    def save(self, request, started, dump, suffix):
+        dump(str(artifact_path(request, (time.perf_counter() - started) * 1000, suffix)))
+        prune()
+
+
+@staff_member_required
+def profile_list_view(request):
+    return render(request, 'admin/profiles.html', {
+        'title': '프로파일',
+        'artifacts': [
+            {'name': path.name, 'size': path.stat().st_size, 'modified': datetime.fromtimestamp(path.stat().st_mtime)}
+            for path in artifacts()
+        ],
+        'parameter': QUERY_PARAMETER,
+        'token': make_token(),
+        'token_max_age': getattr(settings, 'PROFILING_TOKEN_MAX_AGE', 600),
+        'max_files': getattr(settings, 'PROFILING_MAX_FILES', 50),
+    })
+
+
+@staff_member_required
+def profile_download_view(request, name):
+    # 디렉터리 밖의 파일을 읽지 못하도록 이름만 받습니다.
+    path = profile_dir() / name
+    if not ARTIFACT_NAME.match(name) or path.suffix not in ARTIFACT_SUFFIXES or not path.is_file():
+        raise Http404
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
@@ -0,0 +1,23 @@
+from django.db import connections
+
+# SQLite EXPLAIN QUERY PLAN 으로 queryset 이 인덱스를 타는지 확인합니다.
+# 테이블 전체 스캔(SCAN <table>)이나 정렬용 임시 B-tree 가 보이면 문제로 봅니다.
+
+
+def explain_query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(plan, allow_temp_sort=False):
+    # allow_temp_sort: 관련도 순 검색처럼 결과 집합만 정렬하는 경우에 사용합니다.
+    problems = []
+    for detail in plan:
+        if detail.startswith('SCAN ') and ' USING ' not in detail and ' VIRTUAL TABLE ' not in detail:
+            problems.append(detail)
+        elif 'USE TEMP B-TREE' in detail and not allow_temp_sort:
+            problems.append(detail)
+    return problems
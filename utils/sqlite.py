@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.db.utils import load_backend
+
+# SQLite 운영 설정
+# 연결이 만들어질 때(connection_created) settings.SQLITE_PRAGMAS 를 적용합니다.
+# journal_mode=WAL 은 DB 파일에 기록되어 유지되고, 나머지는 연결마다 다시 설정해야 합니다.
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, getattr(settings, 'SQLITE_PRAGMAS', {}))
+
+
+@contextmanager
+def temporary_database(alias, settings_dict):
+    # settings.DATABASES 에 없는 DB 파일을 이 스레드의 django.db.connections[alias] 로 잠시 엽니다. (벤치마크/테스트용)
+    # 운영 DB 와 같은 경로(connection_created 의 PRAGMA, OPTIONS, transaction.atomic)로 연결되므로 설정을 그대로 확인할 수 있습니다.
+    # 연결은 스레드마다 따로라서, 여러 스레드에서 쓰려면 스레드마다 열어야 합니다.
+    settings_dict = connections.configure_settings({**connections.settings, alias: settings_dict})[alias]
+    connection = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, alias)
+    connections[alias] = connection
+    try:
+        yield connection
+    finally:
+        connection.close()
+        del connections[alias]